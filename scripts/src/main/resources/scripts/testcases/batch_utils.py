@@ -0,0 +1,170 @@
+"""
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     October 2026
+@author:    LITP Misc Testware
+@summary:   Runs a list of commands on a node in a single remote session
+            and splits the output back into per-command results.
+"""
+
+import base64
+
+BASH_PATH = "/bin/bash"
+BASE64_PATH = "/usr/bin/base64"
+MKTEMP_PATH = "/bin/mktemp"
+
+OUT_MARKER = "@@LITP_BATCH_OUT {0}@@"
+ERR_MARKER = "@@LITP_BATCH_ERR {0}@@"
+RC_MARKER = "@@LITP_BATCH_RC {0} "
+RC_MARKER_END = "@@"
+
+
+class BatchUtils(object):
+    """
+    Ships several commands to a node in one run_command call.
+
+    Every command is run in its own bash process so that a failing or
+    malformed command does not affect the ones after it. The stdout,
+    stderr and return code of each command are framed with markers on
+    the remote side and split back into (stdout, stderr, rc) tuples, the
+    same shape as GenericTest.run_command returns.
+    """
+
+    def __init__(self, test):
+        """
+        Args:
+            test (GenericTest): The test instance used to reach the nodes.
+        """
+        self.test = test
+
+    @staticmethod
+    def _encode(text):
+        """
+        Description:
+            Base64 encode text so that it survives any level of shell
+            quoting (ssh, su -c) unchanged.
+        """
+        return base64.b64encode(text.encode("utf-8")).decode("ascii")
+
+    @staticmethod
+    def _get_cat_framed_cmd(path):
+        """
+        Description:
+            Returns shell lines that print a file and make sure the
+            output ends with a newline so the next marker starts a line.
+        """
+        return ['/bin/cat "{0}"'.format(path),
+                '[ -n "$(/usr/bin/tail -c1 "{0}")" ] && echo'.format(path)]
+
+    def get_batch_script(self, cmds):
+        """
+        Description:
+            Builds the bash script that runs the given commands in order
+            and frames their output.
+        Args:
+            cmds (list): Commands to run.
+        Returns:
+            str. The script.
+        """
+        script = ['__o=$({0})'.format(MKTEMP_PATH),
+                  '__e=$({0})'.format(MKTEMP_PATH)]
+        for index, cmd in enumerate(cmds):
+            script.append('__c=$(echo {0} | {1} -d)'.format(
+                self._encode(cmd), BASE64_PATH))
+            script.append('{0} -c "$__c" >"$__o" 2>"$__e" </dev/null'.format(
+                BASH_PATH))
+            script.append('__rc=$?')
+            script.append('echo "{0}"'.format(OUT_MARKER.format(index)))
+            script.extend(self._get_cat_framed_cmd("$__o"))
+            script.append('echo "{0}"'.format(ERR_MARKER.format(index)))
+            script.extend(self._get_cat_framed_cmd("$__e"))
+            script.append('echo "{0}$__rc{1}"'.format(
+                RC_MARKER.format(index), RC_MARKER_END))
+        script.append('/bin/rm -f "$__o" "$__e"')
+        return "\n".join(script) + "\n"
+
+    def get_batch_cmd(self, cmds):
+        """
+        Description:
+            Returns the single command line that runs the whole batch.
+        Args:
+            cmds (list): Commands to run.
+        Returns:
+            str. The command to pass to run_command.
+        """
+        return "echo {0} | {1} -d | {2}".format(
+            self._encode(self.get_batch_script(cmds)), BASE64_PATH, BASH_PATH)
+
+    @staticmethod
+    def parse_batch_output(stdout):
+        """
+        Description:
+            Splits the framed output of a batch back into per-command
+            results.
+        Args:
+            stdout (list): Lines printed by the batch command.
+        Returns:
+            list. One (stdout, stderr, rc) tuple per command that completed,
+            in the order the commands were given.
+        """
+        results = []
+        out, err = [], []
+        current = None
+        index = 0
+        for line in stdout:
+            if line == OUT_MARKER.format(index):
+                out, err = [], []
+                current = out
+            elif line == ERR_MARKER.format(index):
+                current = err
+            elif line.startswith(RC_MARKER.format(index)) and \
+                    line.endswith(RC_MARKER_END):
+                rc = line[len(RC_MARKER.format(index)):-len(RC_MARKER_END)]
+                results.append((out, err, int(rc)))
+                current = None
+                index += 1
+            elif current is not None:
+                current.append(line)
+        return results
+
+    def run_commands(self, node, cmds, default_asserts=False, **kwargs):
+        """
+        Description:
+            Runs a list of commands on a node in a single remote session.
+        Args:
+            node (str): Filename of the node to run the commands on.
+            cmds (list): Commands to run, in order.
+        Kwargs:
+            default_asserts (bool): If True, asserts that every command
+                returned 0 and wrote nothing to stderr. Default is False.
+            Any other keyword (su_root, su_timeout_secs, ...) is passed
+            on to run_command.
+        Returns:
+            list. One (stdout, stderr, rc) tuple per command.
+        """
+        if not cmds:
+            return []
+
+        stdout, stderr, _ = self.test.run_command(
+            node, self.get_batch_cmd(cmds), **kwargs)
+        results = self.parse_batch_output(stdout)
+
+        self.test.assertEqual(len(cmds), len(results),
+                              "Batch on {0} completed {1} of {2} commands: "
+                              "{3}".format(node, len(results), len(cmds),
+                                           stderr))
+
+        if default_asserts:
+            for cmd, (out, err, rc) in zip(cmds, results):
+                self.test.assertEqual(0, rc,
+                                      '"{0}" on {1} returned {2}: {3}'
+                                      .format(cmd, node, rc, err))
+                self.test.assertEqual([], err,
+                                      '"{0}" on {1} wrote to stderr: {2}'
+                                      .format(cmd, node, err))
+        return results
@@ -0,0 +1,52 @@
+"""
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     October 2026
+@author:    LITP Misc Testware
+@summary:   Invalidation of the caches of what is on the nodes, e.g. the
+            installed packages or configuration files, from the code
+            changing the nodes without it knowing which caches exist.
+
+            A cache registers the function dropping its entries:
+                register_node_cache(invalidate_config_snapshots)
+            and code changing a node calls:
+                invalidate_node_caches(node, paths)
+"""
+
+# Functions dropping cached entries, called with (node, paths)
+_INVALIDATORS = []
+
+
+def register_node_cache(invalidate):
+    """
+    Description:
+        Registers the function dropping the entries of a cache.
+    Args:
+        invalidate (callable): Called with the filename of the node, or
+                               None for every node, and the paths changed,
+                               or None for any change to the node.
+    Returns:
+        callable. invalidate, so that it can be used as a decorator.
+    """
+    if invalidate not in _INVALIDATORS:
+        _INVALIDATORS.append(invalidate)
+    return invalidate
+
+
+def invalidate_node_caches(node=None, paths=None):
+    """
+    Description:
+        Drops the cached entries of every registered cache that a change
+        to a node may have made stale.
+    Kwargs:
+        node (str): Filename of the node. Default is None, every node.
+        paths (list): Paths of the files changed. Default is None, any
+                      change to the node.
+    """
+    for invalidate in list(_INVALIDATORS):
+        invalidate(node, paths)
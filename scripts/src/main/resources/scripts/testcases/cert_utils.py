@@ -0,0 +1,131 @@
+"""
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     October 2026
+@author:    LITP Misc Testware
+@summary:   Collects the details of the certificates on a node in a single
+            remote run.
+"""
+
+from collections import namedtuple
+import datetime
+
+OPENSSL_PATH = "/usr/bin/openssl"
+
+# Certificates signed by the puppet CA, one per node
+PUPPET_SIGNED_CERTS = "/var/lib/puppet/ssl/ca/signed/*.pem"
+
+CERT_MARKER = "@@LITP_CERT@@ "
+CERT_ERROR_MARKER = "@@LITP_CERT_ERROR@@"
+
+CertRecord = namedtuple("CertRecord", "path subject issuer not_before "
+                                      "not_after fingerprint error")
+
+# Keys openssl x509 prints each field with, in lower case as the case of
+# the fingerprint key differs between openssl versions
+_FIELDS = {"subject": "subject",
+           "issuer": "issuer",
+           "notbefore": "not_before",
+           "notafter": "not_after",
+           "sha256 fingerprint": "fingerprint"}
+
+
+def parse_cert_date(value):
+    """
+    Description:
+        Converts a date printed by openssl, e.g. "Jan  1 00:00:00 2069 GMT",
+        to a datetime in UTC.
+    """
+    fields = value.split()
+    if fields and fields[-1] == "GMT":
+        fields = fields[:-1]
+    return datetime.datetime.strptime(" ".join(fields), "%b %d %H:%M:%S %Y")
+
+
+class CertInventory(object):
+    """
+    Reads the subject, issuer, validity and fingerprint of any number of
+    certificates on a node with a single command.
+    """
+
+    def __init__(self, test, node):
+        """
+        Args:
+            test (GenericTest): The test instance used to reach the node.
+            node (str): Filename of the node holding the certificates.
+        """
+        self.test = test
+        self.node = node
+
+    @staticmethod
+    def get_collect_cmd(paths):
+        """
+        Description:
+            Returns the command printing the details of every certificate,
+            each preceded by a line holding its path. Paths may be shell
+            patterns, e.g. to read every signed node certificate.
+        """
+        return ('for __f in {0}; do [ -e "$__f" ] || continue; '
+                'echo "{1}$__f"; '
+                '{2} x509 -noout -subject -issuer -startdate -enddate '
+                '-fingerprint -sha256 -in "$__f" 2>&1 || echo "{3}"; '
+                'done'.format(" ".join(paths), CERT_MARKER, OPENSSL_PATH,
+                              CERT_ERROR_MARKER))
+
+    @staticmethod
+    def parse_collect_output(stdout):
+        """
+        Description:
+            Parses the output of the collect command.
+        Returns:
+            list. A CertRecord per certificate. Dates are datetimes and
+            error holds the openssl output if the certificate could not be
+            read.
+        """
+        outputs = []
+        for line in stdout:
+            if line.startswith(CERT_MARKER):
+                outputs.append((line[len(CERT_MARKER):], []))
+            elif outputs:
+                outputs[-1][1].append(line)
+
+        records = []
+        for path, lines in outputs:
+            record = dict((field, None) for field in CertRecord._fields)
+            record["path"] = path
+            if CERT_ERROR_MARKER in lines:
+                record["error"] = "\n".join(
+                    lines[:lines.index(CERT_ERROR_MARKER)])
+            else:
+                for line in lines:
+                    key, _, value = line.partition("=")
+                    field = _FIELDS.get(key.strip().lower())
+                    if field in ("not_before", "not_after"):
+                        record[field] = parse_cert_date(value)
+                    elif field:
+                        record[field] = value.strip()
+            records.append(CertRecord(**record))
+        return records
+
+    def collect(self, paths):
+        """
+        Description:
+            Collects the details of the certificates in one remote run.
+        Args:
+            paths (list): Paths, or shell patterns, of the certificates.
+                          Paths that do not exist are skipped.
+        Returns:
+            list. A CertRecord per certificate found.
+        """
+        stdout, _, _ = self.test.run_command(
+            self.node, self.get_collect_cmd(paths), su_root=True,
+            default_asserts=True)
+        records = self.parse_collect_output(stdout)
+        self.test.log("info", "Collected {0} certificates on {1}".format(
+            len(records), self.node))
+        return records
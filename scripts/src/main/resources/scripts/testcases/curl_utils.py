@@ -0,0 +1,156 @@
+"""
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     October 2026
+@author:    LITP Misc Testware
+@summary:   Several HTTP requests sent from a node by a single curl
+            process, with the status of each request read back from its
+            output.
+"""
+
+import pipes
+
+CURL_PATH = "/usr/bin/curl"
+STATUS_MARKER = "@@LITP_HTTP_STATUS "
+STATUS_MARKER_END = "@@"
+# Longest command sending requests with a single curl process. The command
+# is passed on as a single argument, which Linux limits to 131072 bytes
+# (MAX_ARG_STRLEN), and some room is left for the quoting added by ssh.
+MAX_CURL_CMD_LENGTH = 120 * 1024
+
+
+def quote_config(value):
+    """
+    Description:
+        Returns a value quoted for a curl config file.
+    """
+    return '"{0}"'.format(value.replace("\\", "\\\\").replace('"', '\\"'))
+
+
+class CurlBatch(object):
+    """
+    Sends requests from a node with as few curl processes as possible,
+    each reusing its connections.
+
+    The requests are passed to curl as a config file on its standard
+    input, printed by a shell builtin, so that their bodies and any
+    credentials are not shown by ps. Requests are split over several
+    curl processes to keep each command under MAX_CURL_CMD_LENGTH.
+    """
+
+    def __init__(self, test, node, config_cmd=None):
+        """
+        Args:
+            test (GenericTest): The test instance used to reach the node.
+            node (str): Filename of the node sending the requests.
+        Kwargs:
+            config_cmd (str): Command printing curl config lines added to
+                              every request, e.g. credentials read from a
+                              file on the node. Default is None.
+        """
+        self.test = test
+        self.node = node
+        self.config_cmd = config_cmd
+
+    def _get_request_args(self, options):
+        """
+        Description:
+            Returns the shell quoted curl config lines of a request.
+        Args:
+            options (list): (name, value) per curl option of the request,
+                            value being None for flags, e.g.
+                            [("request", "POST"), ("url", url)].
+        """
+        lines = ["silent", "write-out = {0}".format(quote_config(
+            "\\n{0}%{{http_code}}{1}\\n".format(STATUS_MARKER,
+                                               STATUS_MARKER_END)))]
+        lines.extend(name if value is None else
+                     "{0} = {1}".format(name, quote_config(value))
+                     for name, value in options)
+        args = ['"$__c"'] if self.config_cmd else []
+        return " ".join(args + [pipes.quote(line) for line in lines])
+
+    def get_cmd(self, requests):
+        """
+        Description:
+            Returns the command sending requests with a single curl. The
+            status of each request is printed after its response, on a
+            line of its own.
+        Args:
+            requests (list): Options of each request.
+        """
+        cmd = "printf '%s\\n' {0} | {1} -K -".format(
+            " next ".join(self._get_request_args(options)
+                          for options in requests), CURL_PATH)
+        if self.config_cmd:
+            return "__c=$({0}) && {1}".format(self.config_cmd, cmd)
+        return cmd
+
+    def get_chunks(self, requests):
+        """
+        Description:
+            Splits requests into chunks whose command is at most
+            MAX_CURL_CMD_LENGTH long. A request longer than that on its
+            own is sent alone.
+        """
+        chunks = []
+        base_length = len(self.get_cmd([]))
+        length = base_length
+        for options in requests:
+            request_length = len(self._get_request_args(options)) + \
+                len(" next ")
+            if chunks and length + request_length <= MAX_CURL_CMD_LENGTH:
+                chunks[-1].append(options)
+                length += request_length
+            else:
+                chunks.append([options])
+                length = base_length + request_length
+        return chunks
+
+    @staticmethod
+    def parse_output(stdout):
+        """
+        Description:
+            Splits the output of the command into the status and body of
+            each request.
+        Returns:
+            list. (status, body) per request answered, in order.
+        """
+        results = []
+        body = []
+        for line in stdout:
+            if line.startswith(STATUS_MARKER) and \
+                    line.endswith(STATUS_MARKER_END):
+                status = line[len(STATUS_MARKER):-len(STATUS_MARKER_END)]
+                results.append((int(status) if status.isdigit() else 0,
+                                "\n".join(body).strip()))
+                body = []
+            else:
+                body.append(line)
+        return results
+
+    def run(self, requests):
+        """
+        Description:
+            Sends the requests.
+        Args:
+            requests (list): Options of each request, see
+                             _get_request_args.
+        Returns:
+            list. (status, body) per request, in order. The status of a
+            request not answered is 0 and its body the errors of curl.
+        """
+        results = []
+        for chunk in self.get_chunks(requests):
+            stdout, stderr, _ = self.test.run_command(self.node,
+                                                      self.get_cmd(chunk))
+            outcomes = self.parse_output(stdout)
+            missing = (0, "No response: {0}".format("\n".join(stderr)))
+            outcomes.extend([missing] * (len(chunk) - len(outcomes)))
+            results.extend(outcomes)
+        return results
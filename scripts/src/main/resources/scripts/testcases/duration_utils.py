@@ -0,0 +1,134 @@
+"""
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     October 2026
+@author:    LITP Misc Testware
+@summary:   Local store of how long each test took in previous runs.
+"""
+
+import json
+import os
+import re
+
+# Number of durations kept per test
+MAX_HISTORY = 20
+# A test is reported as slower once its last run takes this many times
+# its usual duration
+REGRESSION_FACTOR = 1.5
+# Runs needed before a test's usual duration is trusted
+MIN_RUNS = 3
+
+_TMS_ID_RE = re.compile(r"@tms_id:\s*(\S[^\n]*)")
+
+
+def get_tms_id(docstring):
+    """
+    Description:
+        Returns the @tms_id of a test from its docstring, or None.
+    """
+    match = _TMS_ID_RE.search(docstring or "")
+    return match.group(1).strip() if match else None
+
+
+def median(values):
+    """
+    Description:
+        Returns the median of a list of numbers, or None if it is empty.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    if len(ordered) % 2:
+        return ordered[middle]
+    return (ordered[middle - 1] + ordered[middle]) / 2.0
+
+
+class DurationStore(object):
+    """
+    Durations of the last runs of each test, keyed by tms_id, kept in a
+    json file.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Path of the json file. It is created on save if it
+                        does not exist.
+        """
+        self.path = path
+        self.durations = {}
+        if os.path.exists(path):
+            with open(path) as store:
+                self.durations = json.load(store)
+
+    def record(self, tms_id, duration_secs):
+        """
+        Description:
+            Adds the duration of a run of a test, dropping the oldest one
+            beyond MAX_HISTORY.
+        """
+        history = self.durations.setdefault(tms_id, [])
+        history.append(round(duration_secs, 1))
+        del history[:-MAX_HISTORY]
+
+    def save(self):
+        """
+        Description:
+            Writes the store back to its file.
+        """
+        with open(self.path, "w") as store:
+            json.dump(self.durations, store, indent=2, sort_keys=True)
+
+    def get_expected(self, tms_id):
+        """
+        Description:
+            Returns the usual duration of a test, the median of its
+            previous runs, or None if it never ran.
+        """
+        return median(self.durations.get(tms_id, []))
+
+    def get_regressions(self, factor=REGRESSION_FACTOR, min_runs=MIN_RUNS):
+        """
+        Description:
+            Returns the tests whose last run took much longer than the
+            runs before it.
+        Returns:
+            list. (tms_id, last_secs, usual_secs) of each slower test,
+            slowest relative to usual first.
+        """
+        regressions = []
+        for tms_id, history in self.durations.items():
+            if len(history) <= min_runs:
+                continue
+            usual = median(history[:-1])
+            if usual and history[-1] > usual * factor:
+                regressions.append((tms_id, history[-1], usual))
+        return sorted(regressions, key=lambda item: item[1] / item[2],
+                      reverse=True)
+
+    def get_trend_report(self):
+        """
+        Description:
+            Returns a report of the usual and last duration of every test
+            followed by the tests that became slower.
+        """
+        lines = ["{0:40s} {1:>5s} {2:>9s} {3:>9s}".format(
+            "tms_id", "runs", "usual(s)", "last(s)")]
+        for tms_id in sorted(self.durations):
+            history = self.durations[tms_id]
+            lines.append("{0:40s} {1:5d} {2:9.1f} {3:9.1f}".format(
+                tms_id, len(history), median(history), history[-1]))
+        regressions = self.get_regressions()
+        if regressions:
+            lines.append("Slower than usual:")
+            for tms_id, last, usual in regressions:
+                lines.append("    {0}: {1:.1f}s, usually {2:.1f}s "
+                             "({3:+.0%})".format(tms_id, last, usual,
+                                                 last / usual - 1))
+        return "\n".join(lines)
@@ -0,0 +1,260 @@
+"""
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     October 2026
+@author:    LITP Misc Testware
+@summary:   Creates whole trees of files and directories on a node in a
+            single transfer and compares files on a node without
+            transferring their contents.
+"""
+
+import base64
+import io
+import os
+import tarfile
+import time
+
+from batch_utils import BatchUtils
+from cache_utils import invalidate_node_caches
+
+TAR_PATH = "/bin/tar"
+BASE64_PATH = "/usr/bin/base64"
+SHA256SUM_PATH = "/usr/bin/sha256sum"
+DIFF_PATH = "/usr/bin/diff"
+
+# Suffix of files extracted next to their target before being renamed
+# over it, so that existing files are replaced atomically
+STAGING_SUFFIX = ".litp_new"
+NEW_PATH_MARKER = "@@LITP_NEW_PATH@@ "
+
+# Longest batch command sending the archive inline, larger archives are
+# uploaded as a file first. The command is passed on as a single argument,
+# which Linux limits to 131072 bytes (MAX_ARG_STRLEN), and some room is
+# left for the quoting added by su and ssh. As the archive is encoded
+# three times on the way, this allows just under 50 KiB of archive.
+MAX_INLINE_CMD_LENGTH = 120 * 1024
+
+
+def get_file_digests(test, node, paths, su_root=True):
+    """
+    Description:
+        Computes the SHA-256 digest of several files on a node with a
+        single command, so that files can be compared without fetching
+        their contents.
+    Args:
+        test (GenericTest): The test instance used to reach the node.
+        node (str): Filename of the node.
+        paths (list): Paths of the files.
+    Kwargs:
+        su_root (bool): Whether to read the files as root. Default is True.
+    Returns:
+        dict. The digest of each path, None for files that could not be
+        read.
+    """
+    stdout, _, _ = test.run_command(
+        node, "{0} {1} 2>/dev/null".format(SHA256SUM_PATH, " ".join(paths)),
+        su_root=su_root)
+    digests = dict((path, None) for path in paths)
+    for line in stdout:
+        fields = line.split(None, 1)
+        if len(fields) == 2 and fields[1] in digests:
+            digests[fields[1]] = fields[0]
+    return digests
+
+
+def assert_files_match(test, node, reference_path, paths, su_root=True):
+    """
+    Description:
+        Asserts that files on a node have the same contents as a reference
+        file on the same node. Only digests are compared, a diff is
+        fetched just for the files that differ.
+    Args:
+        test (GenericTest): The test instance used to reach the node.
+        node (str): Filename of the node.
+        reference_path (str): Path of the file with the expected contents.
+        paths (list): Paths of the files to compare with it.
+    Kwargs:
+        su_root (bool): Whether to read the files as root. Default is True.
+    """
+    digests = get_file_digests(test, node, [reference_path] + paths,
+                               su_root=su_root)
+    expected = digests[reference_path]
+    test.assertNotEqual(None, expected, "Failed to read {0} on {1}"
+                        .format(reference_path, node))
+
+    mismatched = [path for path in paths if digests[path] != expected]
+    differences = []
+    for path in mismatched:
+        stdout, stderr, _ = test.run_command(
+            node, "{0} {1} {2}".format(DIFF_PATH, reference_path, path),
+            su_root=su_root)
+        differences.append("{0}:\n{1}".format(path,
+                                              "\n".join(stdout + stderr)))
+    test.assertFalse(mismatched, "Contents of {0} on {1} do not match {2}\n"
+                     "{3}".format(mismatched, node, reference_path,
+                                  "\n".join(differences)))
+
+
+class FileTree(object):
+    """
+    Declarative description of directories and files to create on a node.
+
+    The tree is packed into a gzipped tar archive that is sent to the
+    node and extracted in one remote session. Files are extracted next to
+    their target and renamed over it, so a file that already exists is
+    replaced atomically.
+    """
+
+    def __init__(self):
+        self.dirs = {}
+        self.files = {}
+        self.new_paths = {}
+
+    def add_dir(self, path, mode=0o755):
+        """
+        Description:
+            Adds a directory to the tree. Parent directories of files and
+            directories are created anyway, this is only needed for empty
+            directories or to set the mode.
+        Args:
+            path (str): Absolute path of the directory.
+        Kwargs:
+            mode (int): Permissions of the directory. Default is 0755.
+        """
+        self.dirs[path.rstrip("/")] = mode
+
+    def add_file(self, path, file_contents_ls, mode=0o755):
+        """
+        Description:
+            Adds a file to the tree.
+        Args:
+            path (str): Absolute path of the file.
+            file_contents_ls (list): Lines of the file.
+        Kwargs:
+            mode (int): Permissions of the file. Default is 0755.
+        """
+        self.files[path] = ("\n".join(file_contents_ls) + "\n", mode)
+
+    @staticmethod
+    def _get_tarinfo(name, mode, size=0, is_dir=False):
+        """
+        Description:
+            Returns a root owned tar entry.
+        """
+        info = tarfile.TarInfo(name.lstrip("/"))
+        info.mode = mode
+        info.uid = info.gid = 0
+        info.uname = info.gname = "root"
+        info.mtime = int(time.time())
+        info.size = size
+        if is_dir:
+            info.type = tarfile.DIRTYPE
+        return info
+
+    def get_archive(self):
+        """
+        Description:
+            Packs the tree into a gzipped tar archive. File entries carry
+            the staging suffix.
+        Returns:
+            bytes. The archive.
+        """
+        buf = io.BytesIO()
+        archive = tarfile.open(fileobj=buf, mode="w:gz")
+        try:
+            for path in sorted(self.dirs):
+                archive.addfile(self._get_tarinfo(path, self.dirs[path],
+                                                  is_dir=True))
+            for path in sorted(self.files):
+                contents, mode = self.files[path]
+                data = contents.encode("utf-8")
+                archive.addfile(self._get_tarinfo(path + STAGING_SUFFIX,
+                                                  mode, size=len(data)),
+                                io.BytesIO(data))
+        finally:
+            archive.close()
+        return buf.getvalue()
+
+    @staticmethod
+    def get_extract_cmd(archive_path):
+        """
+        Description:
+            Returns the command that extracts an archive on the node and
+            renames every staged file over its target. Paths that did not
+            exist before, including parent directories tar creates, are
+            printed so they can be removed later.
+        """
+        return ('__a={0}; '
+                '{1} -tzf "$__a" | while read -r __f; do '
+                '__t="/${{__f%{2}}}"; __t="${{__t%/}}"; '
+                'while [ ! -e "$__t" ]; do echo "{3}$__t"; '
+                '__t=$(/usr/bin/dirname "$__t"); done; done; '
+                '{1} -xzpf "$__a" -C / || exit 1; '
+                '{1} -tzf "$__a" | /bin/grep "{2}$" | while read -r __f; do '
+                '/bin/mv -f "/$__f" "/${{__f%{2}}}" || exit 1; done '
+                '|| exit 1; '
+                '/bin/rm -f "$__a"'.format(archive_path, TAR_PATH,
+                                           STAGING_SUFFIX, NEW_PATH_MARKER))
+
+    def provision(self, test, node):
+        """
+        Description:
+            Creates the tree on the node.
+        Args:
+            test (GenericTest): The test instance used to reach the node.
+            node (str): Filename of the node.
+        Returns:
+            list. Paths that did not exist on the node before.
+        """
+        encoded = base64.b64encode(self.get_archive()).decode("ascii")
+        archive_path = "/tmp/litp_tree_{0}.tgz".format(
+            int(time.time() * 1000))
+        batch = BatchUtils(test)
+
+        cmds = ["echo {0} | {1} -d > {2}".format(encoded, BASE64_PATH,
+                                                 archive_path),
+                self.get_extract_cmd(archive_path)]
+        if len(batch.get_batch_cmd(cmds)) > MAX_INLINE_CMD_LENGTH:
+            encoded_path = archive_path + ".b64"
+            lines = [encoded[i:i + 76] for i in range(0, len(encoded), 76)]
+            test.assertTrue(test.create_file_on_node(
+                                node, encoded_path, lines, su_root=True,
+                                add_to_cleanup=False),
+                            "Failed to upload {0} to {1}".format(encoded_path,
+                                                                 node))
+            cmds[0] = "{0} -d {1} > {2} && /bin/rm -f {1}".format(
+                BASE64_PATH, encoded_path, archive_path)
+
+        results = batch.run_commands(node, cmds, su_root=True,
+                                     default_asserts=True)
+        invalidate_node_caches(node, list(self.files))
+
+        new_paths = []
+        for line in results[1][0]:
+            path = line[len(NEW_PATH_MARKER):]
+            if line.startswith(NEW_PATH_MARKER) and path not in new_paths:
+                new_paths.append(path)
+        known = self.new_paths.setdefault(node, [])
+        known.extend(path for path in new_paths if path not in set(known))
+        return new_paths
+
+    def remove_new_paths(self, test, node):
+        """
+        Description:
+            Removes from the node every path provision created, in a
+            single command. Only the topmost new paths need removing.
+        Args:
+            test (GenericTest): The test instance used to reach the node.
+            node (str): Filename of the node.
+        """
+        new_paths = set(self.new_paths.pop(node, []))
+        paths = sorted(path for path in new_paths
+                       if os.path.dirname(path) not in new_paths)
+        if paths:
+            test.run_command(node, "/bin/rm -rf {0}".format(" ".join(paths)),
+                             su_root=True, default_asserts=True)
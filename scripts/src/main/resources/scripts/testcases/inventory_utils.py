@@ -0,0 +1,180 @@
+"""
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     October 2026
+@author:    LITP Misc Testware
+@summary:   Inventory of the nodes and model paths of a deployment, looked
+            up once per test run and shared by every testset.
+"""
+
+from model_utils import ModelIndex
+
+# Inventories of the test run, keyed by the connection data filename of
+# the management node of the deployment
+_INVENTORIES = {}
+
+
+def get_inventory(test):
+    """
+    Description:
+        Returns the inventory of the deployment the test runs against,
+        creating it on first use. Lookups made through it are cached for
+        the rest of the test run.
+    Args:
+        test (GenericTest): The test instance used for lookups not cached
+                            yet.
+    Returns:
+        NodeInventory. The inventory of the deployment.
+    """
+    ms_node = test.get_management_node_filename()
+    inventory = _INVENTORIES.get(ms_node)
+    if inventory is None:
+        inventory = _INVENTORIES.setdefault(ms_node, NodeInventory(ms_node))
+    inventory.test = test
+    return inventory
+
+
+def invalidate_inventories():
+    """
+    Description:
+        Drops every cached inventory, e.g. after nodes were added to or
+        removed from the deployment.
+    """
+    _INVENTORIES.clear()
+
+
+class NodeInventory(object):
+    """
+    Node filenames, node attributes and LITP model lookups of a deployment.
+
+    Everything is looked up lazily on first use and then served from
+    memory. Node filenames and attributes come from the connection data
+    and never change during a run. Model lookups are answered from an
+    index of a single dump of the model, which must be invalidated with
+    invalidate_model after a test changes the model.
+    """
+
+    def __init__(self, ms_node):
+        """
+        Args:
+            ms_node (str): Filename of the management node.
+        """
+        self.ms_node = ms_node
+        self.test = None
+        self._managed_nodes = None
+        self._node_atts = {}
+        self._model = {}
+        self._model_index = None
+
+    @property
+    def managed_nodes(self):
+        """
+        Description:
+            Filenames of the managed nodes.
+        """
+        if self._managed_nodes is None:
+            self._managed_nodes = self.test.get_managed_node_filenames()
+        return list(self._managed_nodes)
+
+    @property
+    def all_nodes(self):
+        """
+        Description:
+            Filenames of the management node followed by the managed nodes.
+        """
+        return [self.ms_node] + self.managed_nodes
+
+    def get_node_att(self, node, attribute):
+        """
+        Description:
+            Returns an attribute of a node from its connection data.
+        Args:
+            node (str): Filename of the node.
+            attribute (str): Attribute, e.g. 'ipv4'.
+        """
+        key = (node, attribute)
+        if key not in self._node_atts:
+            self._node_atts[key] = self.test.get_node_att(node, attribute)
+        return self._node_atts[key]
+
+    @property
+    def model_index(self):
+        """
+        Description:
+            Index of the model, dumped on first use.
+        """
+        if self._model_index is None:
+            self._model_index = ModelIndex.load(self.test, self.ms_node)
+        return self._model_index
+
+    def _get_model(self, key, lookup):
+        """
+        Description:
+            Returns a cached model lookup, running it on first use.
+        """
+        if key not in self._model:
+            self._model[key] = lookup()
+        value = self._model[key]
+        return list(value) if isinstance(value, list) else value
+
+    def find(self, path, resource, *args, **kwargs):
+        """
+        Description:
+            Version of GenericTest.find answered from the model index.
+            Searches with any other argument are passed on to find and
+            cached.
+        Args:
+            path (str): Model path to search under.
+            resource (str): Item type to search for.
+            Any other argument is passed on to find.
+        Kwargs:
+            assert_not_empty (bool): Whether to assert that at least one
+                                     item was found, as find does.
+                                     Default is True.
+        Returns:
+            list. The paths found.
+        """
+        if not args and set(kwargs) <= set(["assert_not_empty"]):
+            found = self.model_index.find(path, resource)
+            if kwargs.get("assert_not_empty", True):
+                self.test.assertNotEqual([], found,
+                                         "No {0} found under {1}".format(
+                                             resource, path))
+            return found
+        key = ("find", path, resource, args, tuple(sorted(kwargs.items())))
+        return self._get_model(key, lambda: self.test.find(
+            self.ms_node, path, resource, *args, **kwargs))
+
+    def get_node_url(self, node):
+        """
+        Description:
+            Returns the model path of a managed node.
+        Args:
+            node (str): Filename of the node.
+        """
+        return self._get_model(("url", node), lambda: (
+            self.test.get_node_url_from_filename(self.ms_node, node)))
+
+    def get_props(self, url, prop):
+        """
+        Description:
+            Returns a property of a model item from the model index.
+        Args:
+            url (str): Model path of the item.
+            prop (str): Name of the property.
+        """
+        return self.model_index.get_props(url, prop)
+
+    def invalidate_model(self):
+        """
+        Description:
+            Drops the cached model lookups so the next ones go to the
+            model again. To be called after a test changes the model.
+        """
+        self._model.clear()
+        self._model_index = None
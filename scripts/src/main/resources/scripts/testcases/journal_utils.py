@@ -0,0 +1,348 @@
+"""
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     October 2026
+@author:    LITP Misc Testware
+@summary:   Journal of the changes a test makes to the nodes and the model,
+            undone together after the test with one command per node.
+
+            Used from the setUp and tearDown of a testset:
+                self.journal = ChangeJournal(self)
+                self.journal.start()
+                ...
+                self.journal.revert()
+"""
+
+from collections import namedtuple
+import re
+import threading
+
+from batch_utils import BatchUtils
+from parallel_utils import for_each_node
+from cache_utils import invalidate_node_caches
+from package_utils import RPM_PATH
+from inventory_utils import get_inventory
+from model_utils import LITP_PATH, ModelBuilder
+import test_constants as const
+
+SYSTEMCTL_PATH = "/usr/bin/systemctl"
+SORT_PATH = "/usr/bin/sort"
+GREP_PATH = "/bin/grep"
+COMM_PATH = "/usr/bin/comm"
+
+# Suffix of the copy kept of a file before it is overwritten
+BACKUP_SUFFIX = ".litp_journal"
+EXISTS_MARKER = "@@LITP_JOURNAL_EXISTS@@"
+# Packages installed on a node before the first package the test
+# installed on it, one "name.arch" per line
+RPM_BASELINE_PATH = "/var/tmp/litp_journal_rpms"
+PLAN_TIMEOUT_MINS = 30
+# Error of create_plan when there is nothing to do
+DO_NOTHING_PLAN_ERROR = "DoNothingPlanError"
+
+_SYSTEMCTL_RE = re.compile(r"\bsystemctl\s+(enable|disable)\s+([\w@.-]+)")
+
+# Command undoing a change, run as root on the node
+Inverse = namedtuple("Inverse", "node cmd")
+
+
+class ChangeJournal(object):
+    """
+    Records the changes made through the mutating helpers of a test and
+    the command undoing each of them.
+
+    While started, create_file_on_node, create_dir_on_node,
+    execute_cli_create_cmd, install_rpm_on_node and the systemctl enable
+    and disable commands given to run_command are journaled. The state
+    they change is read first where the inverse depends on it, e.g. a
+    file about to be overwritten is copied aside.
+
+    Before the first package is installed on a node, the packages already
+    installed are listed, so that the dependencies yum pulls in are
+    removed along with the packages the test asked for.
+
+    revert runs the inverses newest first, in a single batch per node
+    with the nodes in parallel, removes every package installed since
+    the listing with one rpm command per node, then removes the created
+    model items in one request session and runs a plan only if that left
+    tasks to do.
+    """
+
+    def __init__(self, test):
+        """
+        Args:
+            test (GenericTest): The test instance whose changes are
+                                journaled.
+        """
+        self.test = test
+        self.inverses = []
+        self.packages = {}
+        self.model_items = []
+        self.originals = {}
+        self.overridden = set()
+        self.journaling = False
+        self.lock = threading.Lock()
+
+    def start(self):
+        """
+        Description:
+            Starts journaling the changes made by the test.
+        """
+        for method in ("create_file_on_node", "create_dir_on_node",
+                       "execute_cli_create_cmd", "install_rpm_on_node",
+                       "run_command"):
+            if method in self.originals:
+                continue
+            if method in vars(self.test):
+                # Already replaced on the instance, e.g. by the ssh pool,
+                # and restored as is on stop
+                self.overridden.add(method)
+            self.originals[method] = getattr(self.test, method)
+            setattr(self.test, method, getattr(self, "_" + method))
+        self.journaling = True
+
+    def stop(self):
+        """
+        Description:
+            Stops journaling and restores the methods of the test that
+            were not wrapped again since, e.g. by profile_test. Those
+            keep calling the journal, which then only passes the calls
+            on.
+        """
+        self.journaling = False
+        for method, original in list(self.originals.items()):
+            if vars(self.test).get(method) != getattr(self, "_" + method):
+                continue
+            if method in self.overridden:
+                setattr(self.test, method, original)
+            else:
+                delattr(self.test, method)
+            del self.originals[method]
+        self.overridden &= set(self.originals)
+
+    def _add(self, node, cmd):
+        """
+        Description:
+            Adds the inverse of a change to the journal.
+        """
+        with self.lock:
+            self.inverses.append(Inverse(node, cmd))
+
+    def _run_check(self, node, cmd):
+        """
+        Description:
+            Runs a command reading the state about to change, as root and
+            outside the journal.
+        """
+        stdout, _, _ = self.originals["run_command"](node, cmd,
+                                                     su_root=True)
+        return stdout
+
+    def _create_file_on_node(self, node, filepath, *args, **kwargs):
+        """ Journals create_file_on_node """
+        if not self.journaling:
+            return self.originals["create_file_on_node"](node, filepath,
+                                                         *args, **kwargs)
+        stdout = self._run_check(
+            node, '[ -e "{0}" ] && /bin/cp -a "{0}" "{0}{1}" && echo {2}'
+            .format(filepath, BACKUP_SUFFIX, EXISTS_MARKER))
+        if EXISTS_MARKER in stdout:
+            self._add(node, '/bin/mv -f "{0}{1}" "{0}"'.format(
+                filepath, BACKUP_SUFFIX))
+        else:
+            self._add(node, '/bin/rm -f "{0}"'.format(filepath))
+        kwargs.setdefault("add_to_cleanup", False)
+        try:
+            return self.originals["create_file_on_node"](node, filepath,
+                                                         *args, **kwargs)
+        finally:
+            invalidate_node_caches(node, [filepath])
+
+    def _create_dir_on_node(self, node, path, *args, **kwargs):
+        """ Journals create_dir_on_node """
+        if not self.journaling:
+            return self.originals["create_dir_on_node"](node, path, *args,
+                                                        **kwargs)
+        # The topmost directory that does not exist yet is removed with
+        # everything created under it
+        stdout = self._run_check(
+            node, '__t="{0}"; __n=; while [ ! -e "$__t" ]; do __n=$__t; '
+            '__t=$(/usr/bin/dirname "$__t"); done; echo "$__n"'.format(
+                path.rstrip("/")))
+        if stdout and stdout[-1]:
+            self._add(node, '/bin/rm -rf "{0}"'.format(stdout[-1]))
+        kwargs.setdefault("add_to_cleanup", False)
+        return self.originals["create_dir_on_node"](node, path, *args,
+                                                    **kwargs)
+
+    def _execute_cli_create_cmd(self, node, url, *args, **kwargs):
+        """ Journals execute_cli_create_cmd """
+        if not self.journaling:
+            return self.originals["execute_cli_create_cmd"](node, url, *args,
+                                                            **kwargs)
+        kwargs.setdefault("add_to_cleanup", False)
+        result = self.originals["execute_cli_create_cmd"](node, url, *args,
+                                                          **kwargs)
+        if kwargs.get("expect_positive", True):
+            self.add_model_item(node, url)
+        return result
+
+    def add_model_item(self, ms_node, url):
+        """
+        Description:
+            Journals the creation of a model item made without
+            execute_cli_create_cmd, e.g. by a ModelBuilder.
+        """
+        with self.lock:
+            self.model_items.append((ms_node, url))
+
+    def _install_rpm_on_node(self, node, package, *args, **kwargs):
+        """ Journals install_rpm_on_node """
+        if not self.journaling:
+            return self.originals["install_rpm_on_node"](node, package,
+                                                         *args, **kwargs)
+        with self.lock:
+            first = node not in self.packages
+            self.packages.setdefault(node, []).append(package)
+        if first:
+            _, stderr, rc = self.originals["run_command"](
+                node, "{0} > {1}".format(self._get_rpm_list_cmd(),
+                                         RPM_BASELINE_PATH), su_root=True)
+            if rc != 0:
+                with self.lock:
+                    del self.packages[node]
+            self.test.assertEqual(0, rc, "Failed to list the packages on "
+                                  "{0}: {1}".format(node, stderr))
+        return self.originals["install_rpm_on_node"](node, package, *args,
+                                                     **kwargs)
+
+    @staticmethod
+    def _get_rpm_list_cmd():
+        """
+        Description:
+            Returns the command listing the installed packages as sorted
+            "name.arch" lines. Versions are left out so that a package
+            upgraded as a dependency is not taken for a new one. The
+            gpg-pubkey entries of imported keys are not packages.
+        """
+        return ("{0} -qa --qf '%{{NAME}}.%{{ARCH}}\\n' | "
+                "{1} -v '^gpg-pubkey\\.' | LC_ALL=C {2} -u".format(
+                    RPM_PATH, GREP_PATH, SORT_PATH))
+
+    def _run_command(self, node, cmd, *args, **kwargs):
+        """ Journals the systemctl enable and disable commands """
+        if not self.journaling:
+            return self.originals["run_command"](node, cmd, *args, **kwargs)
+        for action, service in _SYSTEMCTL_RE.findall(cmd):
+            stdout = self._run_check(node, "{0} is-enabled {1}".format(
+                SYSTEMCTL_PATH, service))
+            state = stdout[0].strip() if stdout else ""
+            if state in ("enabled", "disabled") and \
+                    state != action + "d":
+                self._add(node, "{0} {1} {2}".format(
+                    SYSTEMCTL_PATH, state[:-1], service))
+        return self.originals["run_command"](node, cmd, *args, **kwargs)
+
+    def get_node_cmds(self):
+        """
+        Description:
+            Returns the commands undoing the journaled changes on each
+            node, newest change first.
+        Returns:
+            dict. The commands of each node, packages removed last.
+        """
+        cmds = {}
+        for inverse in reversed(self.inverses):
+            cmds.setdefault(inverse.node, []).append(inverse.cmd)
+        for node in self.packages:
+            cmds.setdefault(node, []).append(
+                '__n=$({0} | LC_ALL=C {1} -13 {2} -) && '
+                '{{ [ -z "$__n" ] || {3} -e --allmatches $__n; }} && '
+                '/bin/rm -f {2}'
+                .format(self._get_rpm_list_cmd(), COMM_PATH,
+                        RPM_BASELINE_PATH, RPM_PATH))
+        return cmds
+
+    def _revert_node(self, node, cmds):
+        """
+        Description:
+            Runs the commands undoing the changes on one node. Every
+            command is run even if another one fails.
+        """
+        results = BatchUtils(self.test).run_commands(node, cmds,
+                                                     su_root=True)
+        failed = ['"{0}" returned {1}: {2}'.format(cmd, rc, err)
+                  for cmd, (_, err, rc) in zip(cmds, results) if rc != 0]
+        self.test.assertEqual([], failed, "Failed to revert on {0}:\n{1}"
+                              .format(node, "\n".join(failed)))
+
+    def _revert_model(self):
+        """
+        Description:
+            Removes the created model items, newest first, and runs a plan
+            unless create_plan finds nothing to do, as when none of them
+            had been applied to the deployment.
+        Returns:
+            list. The removals that failed.
+        """
+        ms_node = self.model_items[0][0]
+        builder = ModelBuilder(self.test, ms_node)
+        for _, url in reversed(self.model_items):
+            builder.remove(url)
+        failed = [result for result in builder.apply(assert_success=False)
+                  if not 200 <= result.status < 300]
+        get_inventory(self.test).invalidate_model()
+        _, stderr, rc = self.test.run_command(
+            ms_node, "{0} create_plan".format(LITP_PATH))
+        if rc != 0:
+            self.test.assertTrue(
+                self.test.is_text_in_list(DO_NOTHING_PLAN_ERROR, stderr),
+                "create_plan removing {0} failed: {1}".format(
+                    [url for _, url in self.model_items], stderr))
+            return failed
+        self.test.execute_cli_runplan_cmd(ms_node)
+        self.test.assertTrue(self.test.wait_for_plan_state(
+            ms_node, const.PLAN_COMPLETE, PLAN_TIMEOUT_MINS),
+            "The plan removing {0} did not complete".format(
+                [url for _, url in self.model_items]))
+        return failed
+
+    def revert(self):
+        """
+        Description:
+            Stops journaling and undoes every journaled change. A failure
+            does not stop the other changes from being undone: every node
+            and the model are reverted, the errors are raised together at
+            the end and the journal is emptied either way.
+        """
+        self.stop()
+        node_cmds = self.get_node_cmds()
+        errors = []
+        try:
+            try:
+                for_each_node(sorted(node_cmds),
+                              lambda node: self._revert_node(node,
+                                                             node_cmds[node]))
+            except Exception as err:  # pylint: disable=broad-except
+                errors.append(str(err))
+            if self.model_items:
+                try:
+                    failed = self._revert_model()
+                    if failed:
+                        errors.append("Model removals failed: {0}".format(
+                            failed))
+                except Exception as err:  # pylint: disable=broad-except
+                    errors.append(str(err))
+        finally:
+            for node in node_cmds:
+                invalidate_node_caches(node)
+            self.inverses = []
+            self.packages = {}
+            self.model_items = []
+        self.test.assertEqual([], errors, "Failed to revert the changes of "
+                              "the test:\n{0}".format("\n".join(errors)))
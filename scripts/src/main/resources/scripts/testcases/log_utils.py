@@ -0,0 +1,394 @@
+"""
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     October 2026
+@author:    LITP Misc Testware
+@summary:   Incremental reading and matching of remote log files.
+"""
+
+from collections import namedtuple
+import pipes
+import re
+import time
+
+from batch_utils import BatchUtils
+
+STAT_PATH = "/usr/bin/stat"
+TAIL_PATH = "/usr/bin/tail"
+HEAD_PATH = "/usr/bin/head"
+TIMEOUT_PATH = "/usr/bin/timeout"
+MKFIFO_PATH = "/usr/bin/mkfifo"
+MKTEMP_PATH = "/bin/mktemp"
+AWK_PATH = "/usr/bin/awk"
+
+CURSOR_MARKER = "@@LITP_LOG_CURSOR "
+CURSOR_MARKER_END = "@@"
+MATCH_MARKER = "@@LITP_LOG_MATCH@@"
+STOP_MARKER = "@@LITP_LOG_STOP@@"
+
+PUPPET_RUN_FINISHED = "Finished catalog run in"
+
+# Prints the lines ending with a newline, then the cursor line with the
+# offset after them. The input gets a newline appended, so its last line
+# is the part of a line still being written, possibly empty, and is held
+# back.
+_COMPLETE_LINES_AWK = ('NR > 1 { print p; o += length(p) + 1 } { p = $0 } '
+                       'END { print m s " " o e }')
+
+FollowResult = namedtuple("FollowResult", "line stop_lines elapsed_secs")
+
+
+class LogCursor(object):
+    """
+    Remembers a byte offset in a remote log file and only fetches what
+    has been written after it.
+
+    Lines fetched are kept in memory so any number of messages can be
+    matched against them without going back to the node. If the file
+    shrinks, e.g. because it was rotated, the cursor starts again from
+    the beginning of the new file.
+    """
+
+    def __init__(self, test, node, log_path, offset=None, su_root=True):
+        """
+        Args:
+            test (GenericTest): The test instance used to reach the node.
+            node (str): Filename of the node holding the log.
+            log_path (str): Path of the log file on the node.
+        Kwargs:
+            offset (int): Byte offset to start from. Default is None,
+                          which starts at the current end of the file.
+            su_root (bool): Whether to read the log as root.
+                            Default is True.
+        """
+        self.test = test
+        self.node = node
+        self.log_path = log_path
+        self.su_root = su_root
+        self.batch = BatchUtils(test)
+        self.lines = []
+        self.offset = offset if offset is not None else self._get_size()
+
+    @staticmethod
+    def get_size_cmd(log_path):
+        """
+        Description:
+            Returns the command printing the size in bytes of a file,
+            or 0 if it does not exist yet.
+        """
+        return "{0} -c %s {1} 2>/dev/null || echo 0".format(STAT_PATH,
+                                                          log_path)
+
+    @classmethod
+    def open_many(cls, test, node, log_paths, su_root=True):
+        """
+        Description:
+            Creates a cursor at the end of each of several log files on
+            the same node using a single remote session.
+        Args:
+            test (GenericTest): The test instance used to reach the node.
+            node (str): Filename of the node holding the logs.
+            log_paths (list): Paths of the log files on the node.
+        Kwargs:
+            su_root (bool): Whether to read the logs as root.
+                            Default is True.
+        Returns:
+            list. A LogCursor per log path, in the order given.
+        """
+        results = BatchUtils(test).run_commands(
+            node, [cls.get_size_cmd(path) for path in log_paths],
+            su_root=su_root, default_asserts=True)
+        return [cls(test, node, path, offset=int(out[0]), su_root=su_root)
+                for path, (out, _, _) in zip(log_paths, results)]
+
+    def _get_size(self):
+        """
+        Description:
+            Returns the current size in bytes of the log file.
+        """
+        out, _, _ = self.batch.run_commands(
+            self.node, [self.get_size_cmd(self.log_path)],
+            su_root=self.su_root, default_asserts=True)[0]
+        return int(out[0])
+
+    def get_fetch_cmd(self):
+        """
+        Description:
+            Returns the command printing the complete lines written after
+            the current offset, followed by a line holding the offset the
+            read started from and the offset after the last complete line.
+            A line still being written is left for the next read.
+        """
+        return ('__s=$({0}); __o={1}; [ "$__s" -lt "$__o" ] && __o=0; '
+                '{{ {2} -c +$((__o + 1)) {3} | {4} -c $((__s - __o)); '
+                'echo; }} | LC_ALL=C {5} -v s="$__o" -v o="$__o" -v m={6} '
+                '-v e={7} {8}'.format(
+                    self.get_size_cmd(self.log_path), self.offset,
+                    TAIL_PATH, self.log_path, HEAD_PATH, AWK_PATH,
+                    pipes.quote(CURSOR_MARKER),
+                    pipes.quote(CURSOR_MARKER_END),
+                    pipes.quote(_COMPLETE_LINES_AWK)))
+
+    def _parse_cursor(self, line):
+        """
+        Description:
+            Returns the start and end offsets held by a cursor line.
+        """
+        start, end = line[len(CURSOR_MARKER):-len(CURSOR_MARKER_END)]\
+            .split()
+        if int(start) < self.offset:
+            self.test.log("info", "{0} on {1} was rotated, reading it from "
+                          "the start".format(self.log_path, self.node))
+        return int(start), int(end)
+
+    def poll(self):
+        """
+        Description:
+            Fetches the lines completed since the last poll.
+        Returns:
+            list. The new lines.
+        """
+        out, _, _ = self.batch.run_commands(self.node,
+                                            [self.get_fetch_cmd()],
+                                            su_root=self.su_root,
+                                            default_asserts=True)[0]
+        _, self.offset = self._parse_cursor(out[-1])
+        new_lines = out[:-1]
+        self.lines.extend(new_lines)
+        return new_lines
+
+    @staticmethod
+    def _compile(messages, regex):
+        """
+        Description:
+            Returns a compiled pattern per message.
+        """
+        if isinstance(messages, basestring):
+            messages = [messages]
+        return dict((msg, re.compile(msg if regex else re.escape(msg)))
+                    for msg in messages)
+
+    @staticmethod
+    def _scan(lines, patterns, found):
+        """
+        Description:
+            Matches every line once against the patterns not yet found.
+            Patterns are removed as they match.
+        """
+        for line in lines:
+            if not patterns:
+                break
+            for msg, pattern in list(patterns.items()):
+                if pattern.search(line):
+                    found[msg] = line
+                    del patterns[msg]
+
+    def find(self, messages, regex=False, poll=True):
+        """
+        Description:
+            Looks for messages in everything read since the cursor was
+            created.
+        Args:
+            messages (list/str): Messages to look for. A str is taken as
+                                 a single message.
+        Kwargs:
+            regex (bool): Whether the messages are regular expressions.
+                          Default is False, plain substrings.
+            poll (bool): Whether to fetch new lines first. Default is True.
+        Returns:
+            dict. The first matching line for each message found.
+        """
+        if poll:
+            self.poll()
+        found = {}
+        self._scan(self.lines, self._compile(messages, regex), found)
+        return found
+
+    def wait_for(self, messages, regex=False, timeout_secs=300,
+                 interval_secs=5):
+        """
+        Description:
+            Polls the log until every message has been written or the
+            timeout expires. Each poll only fetches and scans new lines.
+        Args:
+            messages (list/str): Messages to wait for.
+        Kwargs:
+            regex (bool): Whether the messages are regular expressions.
+                          Default is False.
+            timeout_secs (int): How long to wait. Default is 300.
+            interval_secs (int): Time between polls. Default is 5.
+        Returns:
+            dict. The first matching line for each message found.
+        """
+        patterns = self._compile(messages, regex)
+        found = {}
+        self._scan(self.lines, patterns, found)
+        end_time = time.time() + timeout_secs
+        while patterns:
+            self._scan(self.poll(), patterns, found)
+            if not patterns or time.time() >= end_time:
+                break
+            time.sleep(interval_secs)
+        return found
+
+    def assert_found(self, messages, regex=False, wait=False, **kwargs):
+        """
+        Description:
+            Asserts that every message is in the log.
+        Args:
+            messages (list/str): Messages expected in the log.
+        Kwargs:
+            regex (bool): Whether the messages are regular expressions.
+                          Default is False.
+            wait (bool): If True, waits for the messages to appear, if
+                         False checks if they are currently there.
+                         Default is False.
+            Any other keyword is passed on to wait_for.
+        """
+        if wait:
+            found = self.wait_for(messages, regex=regex, **kwargs)
+        else:
+            found = self.find(messages, regex=regex)
+        missing = [msg for msg in self._compile(messages, regex)
+                   if msg not in found]
+        self.test.assertFalse(missing, '{0} not found in {1} as expected.'
+                              .format(missing, self.log_path))
+
+    def get_follow_cmd(self, message, stop_at=None, max_stops=1,
+                       timeout_secs=600):
+        """
+        Description:
+            Returns the command that follows the log from the current
+            offset with tail -F and exits as soon as the message, or
+            max_stops lines containing stop_at, have been written.
+            tail writes to a fifo and is killed when the read loop ends,
+            otherwise it would only notice on its next write.
+
+            Every complete line read is printed, the matching ones with a
+            marker, followed by a line holding the offset the read
+            started from and the offset after the last line read.
+        """
+        return ('__s=$({0}); __o={1}; [ "$__s" -lt "$__o" ] && __o=0; '
+                '__m={2}; __st={3}; __n=0; __b=$__o; LC_ALL=C; '
+                '__f=$({4} -u); {5} "$__f"; '
+                '{6} {7} {8} -F -c +$((__o + 1)) {9} >"$__f" 2>/dev/null & '
+                '__p=$!; '
+                'while IFS= read -r __l; do '
+                '__b=$((__b + ${{#__l}} + 1)); '
+                'case "$__l" in *"$__m"*) echo "{10}$__l"; break;; esac; '
+                'if [ -n "$__st" ]; then case "$__l" in *"$__st"*) '
+                'echo "{11}$__l"; __n=$((__n + 1)); '
+                '[ $__n -ge {12} ] && break; continue;; esac; fi; '
+                'echo "$__l"; '
+                'done <"$__f"; '
+                'kill $__p 2>/dev/null; /bin/rm -f "$__f"; '
+                'echo "{13}$__o $__b{14}"'.format(
+                    self.get_size_cmd(self.log_path), self.offset,
+                    pipes.quote(message), pipes.quote(stop_at or ""),
+                    MKTEMP_PATH, MKFIFO_PATH, TIMEOUT_PATH, timeout_secs,
+                    TAIL_PATH, self.log_path, MATCH_MARKER, STOP_MARKER,
+                    max_stops, CURSOR_MARKER, CURSOR_MARKER_END))
+
+    def follow(self, message, stop_at=None, max_stops=1, timeout_secs=600):
+        """
+        Description:
+            Streams the log from the cursor in a single remote session
+            and returns as soon as the message is written, instead of
+            polling the file at fixed intervals.
+
+            As with poll, the lines read are kept and the cursor is moved
+            past the last of them, so lines written after the match are
+            left for the next poll.
+        Args:
+            message (str): Message to wait for.
+        Kwargs:
+            stop_at (str): Stop waiting once max_stops lines containing
+                           this text have been written, e.g. the marker
+                           of a finished run. Default is None.
+            max_stops (int): Number of stop_at lines to wait for.
+                             Default is 1.
+            timeout_secs (int): Maximum time to follow the log.
+                                Default is 600.
+        Returns:
+            FollowResult. The matching line, or None if the message was
+            not written, the stop_at lines seen and the seconds waited.
+        """
+        start_time = time.time()
+        for line in self.lines:
+            if message in line:
+                return FollowResult(line, [], 0.0)
+
+        out, _, _ = self.batch.run_commands(
+            self.node, [self.get_follow_cmd(message, stop_at, max_stops,
+                                            timeout_secs)],
+            su_root=self.su_root)[0]
+        elapsed_secs = time.time() - start_time
+
+        line = None
+        stop_lines = []
+        for out_line in out[:-1]:
+            if out_line.startswith(MATCH_MARKER):
+                line = out_line[len(MATCH_MARKER):]
+                self.lines.append(line)
+            elif out_line.startswith(STOP_MARKER):
+                stop_lines.append(out_line[len(STOP_MARKER):])
+                self.lines.append(stop_lines[-1])
+            else:
+                self.lines.append(out_line)
+        _, self.offset = self._parse_cursor(out[-1])
+        return FollowResult(line, stop_lines, elapsed_secs)
+
+
+class PuppetRunWaiter(object):
+    """
+    Starts a puppet run and waits for it to converge by following the
+    node's syslog instead of polling it.
+    """
+
+    def __init__(self, test, node, syslog_cursor):
+        """
+        Args:
+            test (GenericTest): The test instance used to reach the node.
+            node (str): Filename of the node to run puppet on.
+            syslog_cursor (LogCursor): Cursor on the node's syslog,
+                                       created before the change that
+                                       puppet is expected to act on.
+        """
+        self.test = test
+        self.node = node
+        self.syslog_cursor = syslog_cursor
+
+    def start_and_wait(self, message, timeout_secs=600, max_runs=2):
+        """
+        Description:
+            Starts a new puppet run and waits until the message is logged
+            or max_runs catalog runs have finished without it. More than
+            one run is allowed by default because a run already in
+            progress may finish before the one started here.
+        Args:
+            message (str): Message expected from the puppet run.
+        Kwargs:
+            timeout_secs (int): Maximum time to wait. Default is 600.
+            max_runs (int): Catalog runs to wait for. Default is 2.
+        Returns:
+            FollowResult. elapsed_secs is the time puppet took to converge
+            from the start of the run.
+        """
+        start_time = time.time()
+        self.test.start_new_puppet_run(self.node)
+        result = self.syslog_cursor.follow(message,
+                                           stop_at=PUPPET_RUN_FINISHED,
+                                           max_stops=max_runs,
+                                           timeout_secs=timeout_secs)
+        result = result._replace(elapsed_secs=time.time() - start_time)
+        self.test.log("info", "Puppet run on {0} {1} after {2:.1f}s, "
+                      "{3} catalog run(s) finished".format(
+                          self.node,
+                          "converged" if result.line else "did not converge",
+                          result.elapsed_secs, len(result.stop_lines)))
+        return result
@@ -0,0 +1,310 @@
+"""
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     October 2026
+@author:    LITP Misc Testware
+@summary:   In memory index of the LITP model built from a single
+            recursive dump, and bulk changes to the model sent in a single
+            request session.
+"""
+
+from collections import namedtuple, OrderedDict
+import json
+import pipes
+
+from curl_utils import CurlBatch
+
+LITP_PATH = "/usr/bin/litp"
+AWK_PATH = "/usr/bin/awk"
+LITPRC_PATH = "~/.litprc"
+REST_URL = "https://localhost:9999/litp/rest/v1"
+# Prints the credentials of the litp CLI as a curl config "user" option,
+# so that the password never appears on a command line
+_CREDENTIALS_AWK = (r'/^username *=/ { sub(/^username *= */, ""); u = $0 } '
+                    r'/^password *=/ { sub(/^password *= */, ""); p = $0 } '
+                    r'END { s = u ":" p; gsub(/[\\"]/, "\\\\&", s); '
+                    r'print "user = \"" s "\"" }')
+
+ModelItem = namedtuple("ModelItem", "path item_type state properties")
+ChangeResult = namedtuple("ChangeResult", "method path status messages")
+
+
+class ModelIndex(object):
+    """
+    Index of every item in the LITP model by path and by item type.
+
+    The model is dumped once with a recursive "litp show" and lookups are
+    then answered from memory, in the order the items were dumped.
+    """
+
+    def __init__(self, items):
+        """
+        Args:
+            items (list): ModelItem of every item in the model.
+        """
+        self.items = OrderedDict((item.path, item) for item in items)
+        self.by_type = {}
+        for item in items:
+            self.by_type.setdefault(item.item_type, []).append(item.path)
+
+    @staticmethod
+    def get_dump_cmd(path="/"):
+        """
+        Description:
+            Returns the command dumping the model under path as json.
+        """
+        return "{0} show -p {1} -r -j".format(LITP_PATH, path)
+
+    @staticmethod
+    def _get_path(href):
+        """
+        Description:
+            Returns the model path of a REST self link.
+        """
+        path = href.split("/litp/rest/v1", 1)[-1]
+        return path.rstrip("/") or "/"
+
+    @classmethod
+    def _walk(cls, document, items):
+        """
+        Description:
+            Adds the item described by a json document, and the items
+            embedded in it, to items.
+        """
+        href = document.get("_links", {}).get("self", {}).get("href")
+        if href:
+            items.append(ModelItem(cls._get_path(href),
+                                   document.get("item-type-name"),
+                                   document.get("state"),
+                                   document.get("properties", {})))
+        for child in document.get("_embedded", {}).get("item", []):
+            cls._walk(child, items)
+
+    @classmethod
+    def parse_dump(cls, output):
+        """
+        Description:
+            Parses a recursive json dump of the model. The dump may be a
+            single document with children embedded or one document per
+            item.
+        Args:
+            output (str): The dump.
+        Returns:
+            ModelIndex. The index of the items in the dump.
+        """
+        decoder = json.JSONDecoder()
+        items = []
+        index = 0
+        output = output.strip()
+        while index < len(output):
+            document, index = decoder.raw_decode(output, index)
+            cls._walk(document, items)
+            while index < len(output) and output[index].isspace():
+                index += 1
+        return cls(items)
+
+    @classmethod
+    def load(cls, test, ms_node, path="/"):
+        """
+        Description:
+            Dumps the model on the management node and indexes it.
+        Args:
+            test (GenericTest): The test instance used to reach the node.
+            ms_node (str): Filename of the management node.
+        Kwargs:
+            path (str): Path of the part of the model to index.
+                        Default is "/".
+        Returns:
+            ModelIndex. The index of the model.
+        """
+        stdout, _, _ = test.run_command(ms_node, cls.get_dump_cmd(path),
+                                        default_asserts=True)
+        index = cls.parse_dump("\n".join(stdout))
+        test.log("info", "Indexed {0} model items under {1}".format(
+            len(index.items), path))
+        return index
+
+    @staticmethod
+    def _is_under(path, prefix):
+        """
+        Description:
+            Checks whether path is prefix or one of its descendants.
+        """
+        prefix = prefix.rstrip("/")
+        return path == prefix or path.startswith(prefix + "/")
+
+    def find(self, path, item_type):
+        """
+        Description:
+            Returns the paths of the items of a type under a path, like
+            GenericTest.find.
+        Args:
+            path (str): Model path to search under.
+            item_type (str): Item type, e.g. 'collection-of-firewall-rule'.
+        Returns:
+            list. The paths found.
+        """
+        return [found for found in self.by_type.get(item_type, [])
+                if self._is_under(found, path)]
+
+    def find_by_prefix(self, prefix):
+        """
+        Description:
+            Returns the paths of every item under a path.
+        """
+        return [path for path in self.items if self._is_under(path, prefix)]
+
+    def find_by_property(self, name, value, item_type=None):
+        """
+        Description:
+            Returns the paths of the items with a property set to a value,
+            optionally only those of an item type.
+        """
+        paths = self.by_type.get(item_type, []) if item_type else self.items
+        return [path for path in paths
+                if self.items[path].properties.get(name) == value]
+
+    def get_item(self, path):
+        """
+        Description:
+            Returns the ModelItem at a path, or None if there is none.
+        """
+        return self.items.get(path.rstrip("/") or "/")
+
+    def get_props(self, path, prop=None):
+        """
+        Description:
+            Returns the properties of the item at a path, or a single one
+            if prop is given, like GenericTest.get_props_from_url.
+        """
+        item = self.get_item(path)
+        if item is None:
+            return None
+        return item.properties.get(prop) if prop else dict(item.properties)
+
+
+class ModelBuilder(object):
+    """
+    Accumulates creations, updates and removals of model items and sends
+    them to the LITP REST API in order, from as few curl processes on the
+    MS as the length of their commands allows, see CurlBatch.
+
+    Each item costs one HTTP request instead of starting the litp CLI.
+    litp load is not used as it needs the XML of whole subtrees under a
+    single parent, while the items of a test are usually spread over many
+    collections, e.g. the firewall rules of every node.
+    """
+
+    def __init__(self, test, ms_node, journal=None):
+        """
+        Args:
+            test (GenericTest): The test instance used to reach the MS.
+            ms_node (str): Filename of the management node.
+        Kwargs:
+            journal (ChangeJournal): Journal recording the items created,
+                                     so that they are removed after the
+                                     test. Default is None.
+        """
+        self.test = test
+        self.ms_node = ms_node
+        self.journal = journal
+        self.requests = []
+
+    def create(self, path, item_type, props=None):
+        """
+        Description:
+            Adds the creation of an item.
+        Args:
+            path (str): Model path of the new item.
+            item_type (str): Item type, e.g. 'firewall-rule'.
+        Kwargs:
+            props (dict): Properties of the item. Default is None.
+        """
+        parent, item_id = path.rstrip("/").rsplit("/", 1)
+        self.requests.append(("POST", path, parent or "/", {
+            "id": item_id, "type": item_type, "properties": props or {}}))
+
+    def update(self, path, props):
+        """
+        Description:
+            Adds the update of properties of an item.
+        """
+        self.requests.append(("PUT", path, path, {"properties": props}))
+
+    def remove(self, path):
+        """
+        Description:
+            Adds the removal of an item.
+        """
+        self.requests.append(("DELETE", path, path, None))
+
+    def get_batch(self):
+        """
+        Description:
+            Returns the CurlBatch sending the requests from the MS with
+            the credentials of the litp CLI, read from ~/.litprc on the
+            MS so that the password never appears on a command line.
+        """
+        return CurlBatch(self.test, self.ms_node, config_cmd="{0} {1} {2}"
+                         .format(AWK_PATH, pipes.quote(_CREDENTIALS_AWK),
+                                 LITPRC_PATH))
+
+    @staticmethod
+    def get_request_options(request):
+        """
+        Description:
+            Returns the curl options of a request.
+        """
+        method, _, url_path, body = request
+        options = [("insecure", None), ("request", method),
+                   ("header", "Content-Type: application/json")]
+        if body is not None:
+            options.append(("data", json.dumps(body)))
+        options.append(("url", REST_URL + url_path))
+        return options
+
+    @staticmethod
+    def get_messages(body):
+        """
+        Description:
+            Returns the error messages of the response to a request.
+        """
+        try:
+            document = json.loads(body or "{}")
+        except ValueError:
+            return [body]
+        return [message.get("message") for message in
+                document.get("messages", []) if isinstance(message, dict)]
+
+    def apply(self, assert_success=True):
+        """
+        Description:
+            Sends every accumulated change and empties the builder.
+        Kwargs:
+            assert_success (bool): If True, asserts that every request
+                                   succeeded. Default is True.
+        Returns:
+            list. A ChangeResult per change, in the order they were added.
+        """
+        requests, self.requests = self.requests, []
+        outcomes = self.get_batch().run([self.get_request_options(request)
+                                         for request in requests])
+        results = [ChangeResult(method, path, status,
+                                self.get_messages(body))
+                   for (method, path, _, _), (status, body)
+                   in zip(requests, outcomes)]
+        if self.journal is not None:
+            for result in results:
+                if result.method == "POST" and 200 <= result.status < 300:
+                    self.journal.add_model_item(self.ms_node, result.path)
+        if assert_success:
+            failed = [result for result in results
+                      if not 200 <= result.status < 300]
+            self.test.assertEqual([], failed, "Model changes failed: {0}"
+                                  .format(failed))
+        return results
@@ -0,0 +1,286 @@
+"""
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     October 2026
+@author:    LITP Misc Testware
+@summary:   Helpers for exercising vmmonitord and its OCF resource agents.
+"""
+
+from collections import namedtuple
+import math
+
+from batch_utils import BatchUtils
+
+CURL_PATH = "/usr/bin/curl"
+DATE_PATH = "/bin/date"
+VMMONITORD_PORT = "12987"
+EXEC_SEQ_FILE = "/tmp/ocf_log/exec_sequence.txt"
+
+PROBE_MARKER = "@@LITP_PROBE {0}@@ "
+ELAPSED_MARKER = "@@LITP_LOAD_ELAPSED@@ "
+
+ProbeResult = namedtuple("ProbeResult", "req_type status latency_secs cmd")
+
+
+def get_executable_script_content(sleep_time=0, rc=0, log_to=EXEC_SEQ_FILE):
+    """
+    Description:
+        Create content of an executable script
+    Args:
+        sleep_time (int): Time to sleep in seconds
+        rc         (int): The code to be returned by the script
+        log_to     (str): The file where stdout is redirected
+    """
+    content = [
+        '#!/bin/bash',
+        'RC={0}'.format(rc),
+        'SLEEPTIME={0}'.format(sleep_time),
+        'LOGTO={0}'.format(log_to),
+        'echo "$(pwd)/$0 SLEEPTIME=$SLEEPTIME RC=$RC" 1>>$LOGTO',
+        'sleep $SLEEPTIME',
+        'exit $RC']
+    return content
+
+
+def percentile(values, pct):
+    """
+    Description:
+        Returns the nearest-rank percentile of a list of numbers.
+    Args:
+        values (list): The numbers.
+        pct (float): Percentile between 0 and 100.
+    Returns:
+        float. The percentile, or None if values is empty.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = int(math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[max(rank, 1) - 1]
+
+
+class LoadResult(object):
+    """
+    Statistics of a sustained load run against vmmonitord.
+    """
+
+    def __init__(self, concurrency, samples, elapsed_secs):
+        """
+        Args:
+            concurrency (int): Number of concurrent clients.
+            samples (list): (status, latency_secs) per request sent.
+                            status is None for requests that timed out.
+            elapsed_secs (float): Wall time of the run.
+        """
+        self.concurrency = concurrency
+        self.requests = len(samples)
+        self.elapsed_secs = elapsed_secs
+        self.statuses = {}
+        for status, _ in samples:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+        latencies = [latency for status, latency in samples
+                     if status is not None]
+        self.p50 = percentile(latencies, 50)
+        self.p95 = percentile(latencies, 95)
+        self.p99 = percentile(latencies, 99)
+        self.throughput = self.requests / elapsed_secs \
+            if elapsed_secs else 0.0
+        self.timeout_rate = float(self.statuses.get(None, 0)) / \
+            self.requests if self.requests else 0.0
+
+    def to_dict(self):
+        """
+        Description:
+            Returns the statistics as a dict.
+        """
+        return {"concurrency": self.concurrency,
+                "requests": self.requests,
+                "elapsed_secs": self.elapsed_secs,
+                "statuses": dict((str(status), count) for status, count
+                                 in self.statuses.items()),
+                "p50_secs": self.p50,
+                "p95_secs": self.p95,
+                "p99_secs": self.p99,
+                "throughput_rps": self.throughput,
+                "timeout_rate": self.timeout_rate}
+
+
+class VmmonitorProbe(object):
+    """
+    Sends HTTP requests to vmmonitord concurrently from one node and
+    collects the status and latency of each request together with the
+    sequence of OCF agents the requests caused to run.
+    """
+
+    def __init__(self, test, client_node, agent_node, port=VMMONITORD_PORT,
+                 exec_seq_file=EXEC_SEQ_FILE):
+        """
+        Args:
+            test (GenericTest): The test instance used to reach the nodes.
+            client_node (str): Filename of the node sending the requests.
+            agent_node (str): Filename of the node running vmmonitord.
+        Kwargs:
+            port (str): Port vmmonitord listens on. Default is 12987.
+            exec_seq_file (str): File the OCF agents log to when run.
+        """
+        self.test = test
+        self.client_node = client_node
+        self.agent_node = agent_node
+        self.port = port
+        self.exec_seq_file = exec_seq_file
+        self.batch = BatchUtils(test)
+
+    def get_curl_cmd(self, hostname, req_type='GET', proto='http',
+                     port=None, resource='', max_time=None):
+        """
+        Description:
+            Returns the curl command for one request. The last line it
+            prints is the http code followed by the total time taken in
+            seconds.
+        """
+        return ("{0} -X {1} -s -S -k -o /dev/null {2}"
+                "-w '\\n%{{http_code}} %{{time_total}}\\n' "
+                "{3}://{4}:{5}{6}".format(
+                    CURL_PATH, req_type,
+                    "--max-time {0} ".format(max_time) if max_time else "",
+                    proto, hostname, port or self.port, resource))
+
+    @staticmethod
+    def _parse_sample(fields):
+        """
+        Description:
+            Returns (status, latency_secs) from the "code time" fields
+            printed by curl. A status of 000 means no response.
+        """
+        if len(fields) != 2:
+            return None, None
+        status = None if fields[0] == '000' else fields[0]
+        return status, float(fields[1])
+
+    @staticmethod
+    def get_concurrent_cmd(cmds):
+        """
+        Description:
+            Returns a command running all the given commands at the same
+            time and printing the last line of output of each, prefixed
+            by its index, once they have all finished.
+        """
+        script = ['__d=$(/bin/mktemp -d)']
+        for index, cmd in enumerate(cmds):
+            script.append('( {0} ) >"$__d/{1}" 2>&1 &'.format(cmd, index))
+        script.append('wait')
+        for index in range(len(cmds)):
+            script.append('echo "{0}$(/usr/bin/tail -n1 "$__d/{1}")"'
+                          .format(PROBE_MARKER.format(index), index))
+        script.append('/bin/rm -rf "$__d"')
+        return "\n".join(script)
+
+    def reset_exec_sequence(self):
+        """
+        Description:
+            Removes the "execution sequence" file on the agent node.
+        """
+        self.test.assertTrue(
+            self.test.remove_item(self.agent_node, self.exec_seq_file,
+                                  su_root=True),
+            'Failed to remove file "{0}"'.format(self.exec_seq_file))
+
+    def get_exec_sequence(self):
+        """
+        Description:
+            Returns the OCF agents run since the sequence was reset.
+        """
+        stdout, _, _ = self.test.run_command(
+            self.agent_node, "/bin/cat {0} 2>/dev/null".format(
+                self.exec_seq_file), su_root=True)
+        # Removing forward slashes added (by ssh?) while transferring
+        # data from MS to gateway server
+        return [x.replace('///', '/') for x in stdout]
+
+    def send_requests(self, hostname, req_types, proto='http', port=None,
+                      resource=''):
+        """
+        Description:
+            Sends one request per request type concurrently.
+        Args:
+            hostname (str): The target server.
+            req_types (list): HTTP request types, e.g. ['PUT', 'POST'].
+        Kwargs:
+            proto (str): Protocol to use (ex. http/ https).
+            port (str): Port. Default is the vmmonitord port.
+            resource (str): OCF resource folder path.
+        Returns:
+            tuple. A ProbeResult per request type, in the order given,
+            and the list of scripts run. status is None if the request
+            timed out.
+        """
+        self.reset_exec_sequence()
+
+        cmds = [self.get_curl_cmd(hostname, req_type, proto, port, resource)
+                for req_type in req_types]
+        out, _, _ = self.batch.run_commands(
+            self.client_node, [self.get_concurrent_cmd(cmds)],
+            su_root=True)[0]
+
+        results = []
+        for index, (req_type, cmd) in enumerate(zip(req_types, cmds)):
+            marker = PROBE_MARKER.format(index)
+            fields = [line[len(marker):].split() for line in out
+                      if line.startswith(marker)]
+            status, latency = self._parse_sample(fields[0] if fields else [])
+            self.test.log('info', '{0} request returned {1} in {2}s'
+                          .format(req_type, status, latency))
+            results.append(ProbeResult(req_type, status, latency, cmd))
+
+        return results, self.get_exec_sequence()
+
+    def run_load(self, hostname, concurrency, duration_secs,
+                 max_time_secs=30):
+        """
+        Description:
+            Keeps concurrency clients sending GET requests back to back
+            for duration_secs and returns the latency statistics. The
+            execution sequence file is not touched.
+        Args:
+            hostname (str): The target server.
+            concurrency (int): Number of concurrent clients.
+            duration_secs (int): How long each client keeps sending.
+        Kwargs:
+            max_time_secs (int): Time after which a request counts as
+                                 timed out. Default is 30.
+        Returns:
+            LoadResult. The statistics of the run.
+        """
+        curl_cmd = self.get_curl_cmd(hostname, max_time=max_time_secs)
+        script = ['__d=$(/bin/mktemp -d)',
+                  '__t0=$({0} +%s.%N)'.format(DATE_PATH),
+                  '__end=$(( $({0} +%s) + {1} ))'.format(DATE_PATH,
+                                                         duration_secs)]
+        for worker in range(concurrency):
+            script.append('( while [ $({0} +%s) -lt $__end ]; do {1}; done '
+                          ') >"$__d/{2}" 2>/dev/null &'.format(
+                              DATE_PATH, curl_cmd, worker))
+        script.extend(['wait',
+                       'echo "{0}$__t0 $({1} +%s.%N)"'.format(
+                           ELAPSED_MARKER, DATE_PATH),
+                       '/bin/cat "$__d"/*',
+                       '/bin/rm -rf "$__d"'])
+
+        out, _, _ = self.batch.run_commands(
+            self.client_node, ["\n".join(script)], su_root=True,
+            default_asserts=True)[0]
+
+        elapsed_secs = 0.0
+        samples = []
+        for line in out:
+            if line.startswith(ELAPSED_MARKER):
+                start, end = line[len(ELAPSED_MARKER):].split()
+                elapsed_secs = float(end) - float(start)
+            elif line.strip():
+                samples.append(self._parse_sample(line.split()))
+        return LoadResult(concurrency, samples, elapsed_secs)
@@ -0,0 +1,241 @@
+"""
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     October 2026
+@author:    LITP Misc Testware
+@summary:   Inventory of the packages installed on each node, read with a
+            single rpm query per node and kept for the test run.
+"""
+
+from collections import namedtuple
+
+from cache_utils import register_node_cache
+from parallel_utils import for_each_node
+
+RPM_PATH = "/bin/rpm"
+RPM_QUERY_FORMAT = "%{NAME} %{EPOCH} %{VERSION} %{RELEASE} %{ARCH}\\n"
+
+Package = namedtuple("Package", "name epoch version release arch")
+PackageDiff = namedtuple("PackageDiff", "missing mismatched")
+
+# Inventories of the test run, keyed by node filename
+_INVENTORIES = {}
+
+
+def get_nvra(package):
+    """
+    Description:
+        Returns the name-version-release.arch of a package, the form
+        "rpm -q" prints.
+    """
+    return "{0}-{1}-{2}.{3}".format(package.name, package.version,
+                                    package.release, package.arch)
+
+
+class PackageInventory(object):
+    """
+    The packages installed on a node, answering package queries from
+    memory.
+
+    A package can be queried by name, name-version, name-version-release
+    or name-version-release.arch.
+    """
+
+    def __init__(self, node, packages):
+        """
+        Args:
+            node (str): Filename of the node.
+            packages (list): Package installed on the node.
+        """
+        self.node = node
+        self.packages = packages
+        self.by_name = {}
+        self.by_spec = {}
+        for package in packages:
+            self.by_name.setdefault(package.name, []).append(package)
+            for spec in self._get_specs(package):
+                self.by_spec.setdefault(spec, []).append(package)
+
+    @staticmethod
+    def _get_specs(package):
+        """
+        Description:
+            Returns every form a package can be queried by.
+        """
+        name_version = "{0}-{1}".format(package.name, package.version)
+        return [package.name, name_version,
+                "{0}-{1}".format(name_version, package.release),
+                get_nvra(package)]
+
+    @staticmethod
+    def get_query_cmd():
+        """
+        Description:
+            Returns the command listing every installed package.
+        """
+        return "{0} -qa --queryformat '{1}'".format(RPM_PATH,
+                                                    RPM_QUERY_FORMAT)
+
+    @classmethod
+    def parse_query_output(cls, node, stdout):
+        """
+        Description:
+            Parses the output of the query command.
+        Returns:
+            PackageInventory. The packages listed.
+        """
+        packages = []
+        for line in stdout:
+            fields = line.split()
+            if len(fields) == 5:
+                epoch = fields[1] if fields[1] != "(none)" else None
+                packages.append(Package(fields[0], epoch, *fields[2:]))
+        return cls(node, packages)
+
+    @classmethod
+    def load(cls, test, node):
+        """
+        Description:
+            Reads the packages installed on a node with a single query.
+        Args:
+            test (GenericTest): The test instance used to reach the node.
+            node (str): Filename of the node.
+        Returns:
+            PackageInventory. The packages installed on the node.
+        """
+        stdout, _, _ = test.run_command(node, cls.get_query_cmd(),
+                                        default_asserts=True)
+        return cls.parse_query_output(node, stdout)
+
+    def is_installed(self, spec):
+        """
+        Description:
+            Checks whether a package is installed.
+        Args:
+            spec (str): Name, or name with version, of the package.
+        """
+        return spec in self.by_spec
+
+    def get_versions(self, name):
+        """
+        Description:
+            Returns the version-release of every installed package with a
+            name.
+        """
+        return ["{0}-{1}".format(package.version, package.release)
+                for package in self.by_name.get(name, [])]
+
+    def get_installed(self, specs):
+        """
+        Description:
+            Returns the name-version-release.arch of the installed
+            packages matching any of the specs.
+        """
+        installed = []
+        for spec in specs:
+            for package in self.by_spec.get(spec, []):
+                nvra = get_nvra(package)
+                if nvra not in installed:
+                    installed.append(nvra)
+        return installed
+
+    def get_missing(self, specs):
+        """
+        Description:
+            Returns the specs that no installed package matches.
+        """
+        return [spec for spec in specs if not self.is_installed(spec)]
+
+    def diff(self, manifest):
+        """
+        Description:
+            Compares the installed packages with an expected manifest.
+        Args:
+            manifest (list): Specs of the packages expected.
+        Returns:
+            PackageDiff. missing lists the specs no package matches,
+            mismatched maps the specs for which another version of a
+            package with the same name is installed to the installed
+            name-version-release.arch.
+        """
+        missing = []
+        mismatched = {}
+        for spec in self.get_missing(manifest):
+            others = [get_nvra(package) for name, packages
+                      in self.by_name.items()
+                      if spec.startswith(name + "-") and
+                      spec[len(name) + 1:len(name) + 2].isdigit()
+                      for package in packages]
+            if others:
+                mismatched[spec] = others
+            else:
+                missing.append(spec)
+        return PackageDiff(missing, mismatched)
+
+    def assert_manifest(self, test, manifest):
+        """
+        Description:
+            Asserts that every package of a manifest is installed.
+        Args:
+            test (GenericTest): The test instance asserting.
+            manifest (list): Specs of the packages expected.
+        """
+        diff = self.diff(manifest)
+        test.assertFalse(diff.missing or diff.mismatched,
+                         "Packages on {0} do not match the manifest. "
+                         "Missing: {1}. Other versions installed: {2}"
+                         .format(self.node, diff.missing, diff.mismatched))
+
+
+def get_package_inventories(test, nodes):
+    """
+    Description:
+        Returns the package inventory of each node. Nodes not read yet
+        during the test run are queried concurrently, one rpm query per
+        node.
+    Args:
+        test (GenericTest): The test instance used to reach the nodes.
+        nodes (list): Filenames of the nodes.
+    Returns:
+        dict. The PackageInventory of each node.
+    """
+    pending = [node for node in nodes if node not in _INVENTORIES]
+    _INVENTORIES.update(for_each_node(
+        pending, lambda node: PackageInventory.load(test, node)))
+    return dict((node, _INVENTORIES[node]) for node in nodes)
+
+
+def get_package_inventory(test, node):
+    """
+    Description:
+        Returns the package inventory of a node, reading it on first use.
+    """
+    return get_package_inventories(test, [node])[node]
+
+
+def invalidate_package_inventory(node=None):
+    """
+    Description:
+        Drops the cached inventory of a node, or of every node, so that
+        it is read again after packages were installed or removed.
+    """
+    if node is None:
+        _INVENTORIES.clear()
+    else:
+        _INVENTORIES.pop(node, None)
+
+
+@register_node_cache
+def _invalidate_on_change(node, paths):
+    """
+    Description:
+        Drops the inventory of a node on any change to it other than to
+        some files.
+    """
+    if paths is None:
+        invalidate_package_inventory(node)
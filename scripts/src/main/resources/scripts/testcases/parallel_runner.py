@@ -0,0 +1,350 @@
+"""
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     October 2026
+@author:    LITP Misc Testware
+@summary:   Runs the test methods of the testsets concurrently in worker
+            processes, only serialising tests whose declared resource
+            footprints conflict.
+
+            A test declares what it uses with keyword arguments of attr:
+                @attr('all', 'revert', 'story11106', reads='ms')
+                @attr('all', 'revert', 'story7650', reads='ms',
+                      writes=('node1', 'node2'))
+            reads and writes take a resource name or a tuple of them:
+            'ms', a single peer node such as 'node1', or 'peers' for all
+            the peer nodes, which overlaps with each of them. A test
+            rebooting a node writes it. Tests reading the same resources
+            run together, a test writing a resource runs alone on it and a
+            test declaring neither runs alone.
+
+            Each test runs in its own nosetests process so that a test
+            cannot affect the state of another one, at the cost of the
+            caches shared by the tests of a process, e.g. the node
+            inventory and the package inventory, being rebuilt per test.
+
+            Each test runs under the xunit_stream nose plugin and the merged
+            report is rewritten whenever a test finishes, so it shows the
+            progress of the run and the duration of every step.
+
+            The duration of every test that passes is recorded by tms_id
+            in a local store. Tests start longest first according to that
+            history, and tests that became slower are reported.
+
+            Usage:
+                python parallel_runner.py [-a all] [-w 4] [-d testcases]
+                                          [--xunit-file nosetests.xml]
+                                          [--durations-file FILE]
+"""
+
+from collections import namedtuple
+import imp
+import inspect
+import optparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+import xml.etree.ElementTree as ET
+
+from duration_utils import DurationStore, get_tms_id
+
+# Resource name of tests that did not declare a footprint, which
+# conflicts with every other test
+ALL_RESOURCES = "*"
+MS_RESOURCE = "ms"
+# Resource name of all the peer nodes, each of which is named nodeN
+PEERS_RESOURCE = "peers"
+_PEER_RE = re.compile(r"^node\d+$")
+
+XUNIT_STREAM_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                 "xunit_stream.py")
+DEFAULT_WORKERS = 4
+POLL_INTERVAL_SECS = 1
+
+TestEntry = namedtuple("TestEntry", "name tms_id module_path reads writes")
+
+
+def _get_resources(method, cls, name):
+    """
+    Description:
+        Returns the resources a test declared with attr as a frozenset.
+        Declarations on the method take precedence over the class.
+    """
+    value = getattr(method, name, None)
+    if value is None:
+        value = getattr(cls, name, None)
+    if value is None:
+        return None
+    if isinstance(value, basestring):
+        value = [value]
+    unknown = [resource for resource in value
+               if resource not in (MS_RESOURCE, PEERS_RESOURCE) and
+               not _PEER_RE.match(resource)]
+    if unknown:
+        raise ValueError("{0} of {1}.{2} declares unknown resources {3}"
+                         .format(name, cls.__name__, method.__name__,
+                                 unknown))
+    return frozenset(value)
+
+
+def _matches(method, cls, tags):
+    """
+    Description:
+        Checks whether a test carries every tag, like "nosetests -a".
+    """
+    return all(getattr(method, tag, getattr(cls, tag, False))
+               for tag in tags)
+
+
+def collect_tests(testcases_dir, tags=None):
+    """
+    Description:
+        Imports every testset and returns its tests with their footprint.
+    Args:
+        testcases_dir (str): Directory holding the testset_*.py files.
+    Kwargs:
+        tags (list): Only tests carrying all these attr tags are
+                     returned. Default is None, every test.
+    Returns:
+        list. A TestEntry per test, in file and method order.
+    """
+    if testcases_dir not in sys.path:
+        sys.path.insert(0, testcases_dir)
+
+    tests = []
+    for filename in sorted(os.listdir(testcases_dir)):
+        if not (filename.startswith("testset_") and
+                filename.endswith(".py")):
+            continue
+        module_path = os.path.join(testcases_dir, filename)
+        module = imp.load_source(filename[:-3], module_path)
+        for cls_name, cls in sorted(inspect.getmembers(module,
+                                                       inspect.isclass)):
+            if not issubclass(cls, unittest.TestCase) or \
+                    cls.__module__ != module.__name__:
+                continue
+            for method_name, method in sorted(inspect.getmembers(cls)):
+                if not method_name.startswith("test") or \
+                        not callable(method) or \
+                        not _matches(method, cls, tags or []):
+                    continue
+                reads = _get_resources(method, cls, "reads")
+                writes = _get_resources(method, cls, "writes")
+                if reads is None and writes is None:
+                    writes = frozenset([ALL_RESOURCES])
+                name = "{0}:{1}.{2}".format(module.__name__, cls_name,
+                                            method_name)
+                tests.append(TestEntry(
+                    name, get_tms_id(method.__doc__) or name, module_path,
+                    reads or frozenset(), writes or frozenset()))
+    return tests
+
+
+def order_longest_first(tests, store):
+    """
+    Description:
+        Sorts tests by their usual duration, longest first, so that long
+        tests do not end up running alone at the end. Tests that never
+        ran go first as their duration is unknown.
+    """
+    def sort_key(test):
+        """ Unknown durations sort before any known one """
+        expected = store.get_expected(test.tms_id)
+        return (expected is not None, -(expected or 0))
+    return sorted(tests, key=sort_key)
+
+
+def _expand(resources):
+    """
+    Description:
+        Returns the resources with the peer nodes group added when a
+        single peer node is among them, so that a peer node and the group
+        overlap.
+    """
+    if any(_PEER_RE.match(resource) for resource in resources):
+        return resources | frozenset([PEERS_RESOURCE])
+    return resources
+
+
+def _overlap(first, second):
+    """
+    Description:
+        Checks whether two sets of resources share a resource, the peer
+        nodes group sharing each peer node.
+    """
+    return bool(_expand(first) & second or first & _expand(second))
+
+
+def conflicts(first, second):
+    """
+    Description:
+        Checks whether two tests may not run at the same time, that is
+        when either writes a resource the other one uses.
+    """
+    if ALL_RESOURCES in first.writes or ALL_RESOURCES in second.writes:
+        return True
+    return _overlap(first.writes, second.reads | second.writes) or \
+        _overlap(second.writes, first.reads)
+
+
+class ParallelRunner(object):
+    """
+    Runs tests in worker processes, starting each test as soon as a
+    worker is free and no running test conflicts with it.
+    """
+
+    def __init__(self, tests, workers=DEFAULT_WORKERS, nose_args=None,
+                 store=None, xunit_file=None):
+        """
+        Args:
+            tests (list): TestEntry of each test to run, in the order they
+                          should preferably start.
+        Kwargs:
+            workers (int): Maximum number of tests running at the same
+                           time. Default is 4.
+            nose_args (list): Extra arguments for every nosetests run.
+            store (DurationStore): Where the duration of each test that
+                                   passes is recorded. Default is None.
+            xunit_file (str): Path of the merged report, rewritten every
+                              time a test finishes. Default is None.
+        """
+        self.pending = list(tests)
+        self.store = store
+        self.xunit_file = xunit_file
+        self.workers = workers
+        self.nose_args = nose_args or []
+        self.report_dir = tempfile.mkdtemp(prefix="litp_parallel_")
+        self.running = {}
+        self.reports = []
+        self.failed = []
+
+    def _next_test(self):
+        """
+        Description:
+            Returns the first pending test that conflicts with no running
+            test, or None.
+        """
+        for test in self.pending:
+            if not any(conflicts(test, running)
+                       for running, _ in self.running.values()):
+                return test
+        return None
+
+    def _start(self, test):
+        """
+        Description:
+            Starts nosetests for one test in a new process.
+        """
+        report = os.path.join(self.report_dir,
+                              "{0}.xml".format(len(self.reports)))
+        self.reports.append(report)
+        cmd = [sys.executable, XUNIT_STREAM_PATH, "--with-stream-xunit",
+               "--stream-xunit-file={0}".format(report)] + self.nose_args + \
+            ["{0}:{1}".format(test.module_path, test.name.split(":")[1])]
+        print("Starting {0}".format(test.name))
+        self.pending.remove(test)
+        self.running[subprocess.Popen(cmd)] = (test, time.time())
+
+    def _reap(self):
+        """
+        Description:
+            Removes the tests that have finished from the running ones.
+        """
+        for process, (test, start_time) in list(self.running.items()):
+            if process.poll() is not None:
+                duration_secs = time.time() - start_time
+                print("Finished {0} with exit code {1} in {2:.0f}s".format(
+                    test.name, process.returncode, duration_secs))
+                if process.returncode:
+                    self.failed.append(test.name)
+                elif self.store is not None:
+                    self.store.record(test.tms_id, duration_secs)
+                del self.running[process]
+                if self.xunit_file:
+                    merge_xunit_reports(self.reports, self.xunit_file)
+
+    def run(self):
+        """
+        Description:
+            Runs every test and waits for all of them to finish.
+        Returns:
+            list. The xunit report of each test.
+        """
+        start_time = time.time()
+        while self.pending or self.running:
+            self._reap()
+            test = self._next_test()
+            while test and len(self.running) < self.workers:
+                self._start(test)
+                test = self._next_test()
+            time.sleep(POLL_INTERVAL_SECS)
+        print("Ran {0} tests in {1:.0f}s, {2} failed".format(
+            len(self.reports), time.time() - start_time, len(self.failed)))
+        return self.reports
+
+
+def merge_xunit_reports(reports, output_path):
+    """
+    Description:
+        Merges the xunit reports of single test runs into one report, in
+        the format nosetests writes, for the surefire report parser.
+        Reports of tests still running hold the tests completed so far.
+    """
+    totals = {"tests": 0, "errors": 0, "failures": 0, "skip": 0}
+    suite = ET.Element("testsuite", name="nosetests")
+    for report in reports:
+        if not os.path.exists(report):
+            continue
+        root = ET.parse(report).getroot()
+        for key in totals:
+            totals[key] += int(root.get(key, 0))
+        for case in root:
+            suite.append(case)
+    for key, value in totals.items():
+        suite.set(key, str(value))
+    ET.ElementTree(suite).write(output_path, encoding="UTF-8",
+                                xml_declaration=True)
+
+
+def main():
+    """
+    Description:
+        Collects the tests, runs them and writes the merged report.
+    """
+    parser = optparse.OptionParser(usage="%prog [options] [nose args]")
+    parser.add_option("-a", "--attr", action="append", default=[],
+                      help="Only run tests carrying this attr tag")
+    parser.add_option("-w", "--workers", type="int", default=DEFAULT_WORKERS,
+                      help="Maximum number of tests run at the same time")
+    parser.add_option("-d", "--testcases-dir",
+                      default=os.path.dirname(os.path.abspath(__file__)),
+                      help="Directory holding the testsets")
+    parser.add_option("--xunit-file", default="nosetests.xml",
+                      help="Path of the merged xunit report")
+    parser.add_option("--durations-file", default="test_durations.json",
+                      help="Path of the store of previous test durations")
+    options, nose_args = parser.parse_args()
+
+    store = DurationStore(options.durations_file)
+    tests = order_longest_first(
+        collect_tests(options.testcases_dir, options.attr), store)
+    runner = ParallelRunner(tests, workers=options.workers,
+                            nose_args=nose_args, store=store,
+                            xunit_file=options.xunit_file)
+    merge_xunit_reports(runner.run(), options.xunit_file)
+    store.save()
+    print(store.get_trend_report())
+    return 1 if runner.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     October 2026
+@author:    LITP Misc Testware
+@summary:   Runs independent per-node checks concurrently.
+"""
+
+from multiprocessing.pool import ThreadPool
+import sys
+import traceback
+
+DEFAULT_MAX_WORKERS = 8
+
+
+def _call(fn, node):
+    """
+    Description:
+        Runs fn for one node and captures the outcome instead of raising
+        so that one failing node does not hide the others.
+    Returns:
+        tuple. (node, result, exc_info) where exc_info is None on success.
+    """
+    try:
+        return node, fn(node), None
+    except Exception:  # pylint: disable=broad-except
+        return node, None, sys.exc_info()
+
+
+def for_each_node(nodes, fn, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Description:
+        Calls fn(node) for every node using a bounded pool of threads.
+        Every node is run to completion; if any of them fail, the
+        failures are reported together once all nodes have finished.
+    Args:
+        nodes (list): Node filenames to run fn against.
+        fn (callable): Function taking a node filename. It may use the
+                       usual test assertions.
+    Kwargs:
+        max_workers (int): Maximum number of nodes processed at the
+                           same time. Default is 8.
+    Returns:
+        dict. The value returned by fn, keyed by node.
+    Raises:
+        AssertionError if fn raised an AssertionError for any node, or
+        RuntimeError if any node raised another exception. The message
+        lists every failed node.
+    """
+    if not nodes:
+        return {}
+
+    pool = ThreadPool(min(max_workers, len(nodes)))
+    try:
+        outcomes = pool.map(lambda node: _call(fn, node), nodes)
+    finally:
+        pool.close()
+        pool.join()
+
+    results = {}
+    failures = []
+    only_assertions = True
+    for node, result, exc_info in outcomes:
+        if exc_info is None:
+            results[node] = result
+            continue
+        if not issubclass(exc_info[0], AssertionError):
+            only_assertions = False
+        failures.append("{0}:\n{1}".format(
+            node, "".join(traceback.format_exception(*exc_info))))
+
+    if failures:
+        msg = "{0} of {1} nodes failed:\n{2}".format(
+            len(failures), len(nodes), "\n".join(failures))
+        if only_assertions:
+            raise AssertionError(msg)
+        raise RuntimeError(msg)
+
+    return results
@@ -0,0 +1,323 @@
+"""
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     October 2026
+@author:    LITP Misc Testware
+@summary:   Snapshots of the PostgreSQL configuration files of a node,
+            fetched together, parsed into records and compared with the
+            expected settings.
+"""
+
+from collections import namedtuple, OrderedDict
+import difflib
+import re
+import weakref
+
+from batch_utils import BatchUtils
+from cache_utils import register_node_cache
+
+CAT_PATH = "/bin/cat"
+
+# A pg_hba.conf rule. address is None for local rules and options is a
+# tuple of the "name=value" options after the method.
+HbaRule = namedtuple("HbaRule", "conn_type database user address method "
+                                "options")
+# A pg_ident.conf mapping
+IdentMap = namedtuple("IdentMap", "map_name system_user pg_user")
+# A postgresql.conf setting. unit is the unit suffix of a numeric value,
+# e.g. "MB" for 8MB, or None.
+Guc = namedtuple("Guc", "name value unit")
+
+_GUC_RE = re.compile(r"^\s*([\w.]+)\s*=?\s*('(?:[^']|'')*'|[^\s#]*)")
+_UNIT_RE = re.compile(r"^(-?\d+(?:\.\d+)?)\s*(kB|MB|GB|TB|ms|s|min|h|d)$")
+_BOOLEANS = {"on": "on", "true": "on", "yes": "on", "1": "on",
+             "off": "off", "false": "off", "no": "off", "0": "off"}
+
+# Snapshots alive, so that code changing the files can invalidate them
+_SNAPSHOTS = weakref.WeakSet()
+
+
+def _strip_comment(line):
+    """
+    Description:
+        Returns a line without its "#" comment and surrounding blanks.
+    """
+    return line.split("#", 1)[0].strip()
+
+
+def parse_hba(lines):
+    """
+    Description:
+        Parses the rules of a pg_hba.conf file, ignoring blanks and
+        comments.
+    Args:
+        lines (list): Lines of the file.
+    Returns:
+        list. An HbaRule per rule, in file order.
+    """
+    rules = []
+    for line in lines:
+        fields = _strip_comment(line).split()
+        if not fields:
+            continue
+        if fields[0] == "local":
+            address, rest = None, fields[3:]
+        else:
+            address, rest = fields[3], fields[4:]
+            # An IP address may be followed by a separate netmask
+            if "/" not in address and len(rest) > 1 and \
+                    (re.match(r"^[\d.]+$", rest[0]) or ":" in rest[0]):
+                address = "{0}/{1}".format(address, rest[0])
+                rest = rest[1:]
+        rules.append(HbaRule(fields[0], fields[1], fields[2], address,
+                             rest[0] if rest else None, tuple(rest[1:])))
+    return rules
+
+
+def get_malformed_ident(lines):
+    """
+    Description:
+        Returns the lines of a pg_ident.conf file that are neither blank,
+        comments nor mappings of exactly three fields.
+    """
+    return [line for line in lines
+            if len(_strip_comment(line).split()) not in (0, 3)]
+
+
+def parse_ident(lines):
+    """
+    Description:
+        Parses the user name maps of a pg_ident.conf file. Malformed
+        lines are not mappings, see get_malformed_ident.
+    Returns:
+        list. An IdentMap per mapping, in file order.
+    """
+    return [IdentMap(*fields) for fields in
+            (_strip_comment(line).split() for line in lines)
+            if len(fields) == 3]
+
+
+def parse_guc_value(value):
+    """
+    Description:
+        Splits a setting value into the value and its unit, unquoting
+        quoted values.
+    Returns:
+        tuple. (value, unit) where unit is None for values without one.
+    """
+    if value.startswith("'") and value.endswith("'") and len(value) > 1:
+        return value[1:-1].replace("''", "'"), None
+    match = _UNIT_RE.match(value)
+    if match:
+        return match.group(1), match.group(2)
+    return value, None
+
+
+def parse_gucs(lines):
+    """
+    Description:
+        Parses the settings of a postgresql.conf file. A setting repeated
+        later in the file replaces the earlier one, as in PostgreSQL.
+    Returns:
+        OrderedDict. A Guc per setting, keyed by lower case name.
+    """
+    gucs = OrderedDict()
+    for line in lines:
+        if not line.strip() or line.strip().startswith("#"):
+            continue
+        match = _GUC_RE.match(line)
+        if match:
+            name = match.group(1).lower()
+            value, unit = parse_guc_value(match.group(2))
+            gucs.pop(name, None)
+            gucs[name] = Guc(name, value, unit)
+    return gucs
+
+
+def _normalise_guc(value, unit):
+    """
+    Description:
+        Returns a setting value in a form comparable across the spellings
+        PostgreSQL accepts, e.g. "true" and "on".
+    """
+    value = str(value)
+    if unit is None:
+        value, unit = parse_guc_value(value)
+    return _BOOLEANS.get(value.lower(), value), unit
+
+
+def diff_gucs(expected, gucs):
+    """
+    Description:
+        Compares settings with the expected values.
+    Args:
+        expected (dict): Expected value of each setting, keyed by name,
+                         with its unit if any, e.g. {"port": 5432,
+                         "shared_buffers": "128MB"}.
+        gucs (dict): Guc per setting, as returned by parse_gucs.
+    Returns:
+        list. A message per setting that differs.
+    """
+    mismatches = []
+    for name in sorted(expected):
+        guc = gucs.get(name.lower())
+        if guc is None:
+            mismatches.append("{0}: expected {1}, not set".format(
+                name, expected[name]))
+        elif _normalise_guc(expected[name], None) != \
+                _normalise_guc(guc.value, guc.unit):
+            mismatches.append("{0}: expected {1}, found {2}{3}".format(
+                name, expected[name], guc.value, guc.unit or ""))
+    return mismatches
+
+
+def diff_records(expected, actual):
+    """
+    Description:
+        Compares two ordered lists of records, e.g. hba rules, where the
+        order matters.
+    Returns:
+        list. A message per record missing, unexpected or out of place,
+        with its position in the actual records.
+    """
+    mismatches = []
+    matcher = difflib.SequenceMatcher(None, expected, actual,
+                                      autojunk=False)
+    for tag, exp_start, exp_end, act_start, act_end in \
+            matcher.get_opcodes():
+        if tag in ("delete", "replace"):
+            for record in expected[exp_start:exp_end]:
+                mismatches.append("missing at {0}: {1}".format(
+                    act_start + 1, record))
+        if tag in ("insert", "replace"):
+            for index in range(act_start, act_end):
+                mismatches.append("unexpected at {0}: {1}".format(
+                    index + 1, actual[index]))
+    return mismatches
+
+
+class ConfigSnapshot(object):
+    """
+    The configuration files of a node, fetched with a single command for
+    all the files not fetched yet by the snapshot.
+
+    Files are cached by the snapshot, which is usually created in setUp
+    and so lasts one test. Files written by the journal of the test or by
+    a FileTree are invalidated through invalidate_node_caches, which a
+    test changing a file otherwise must call too.
+    """
+
+    def __init__(self, test, node):
+        """
+        Args:
+            test (GenericTest): The test instance used to reach the node.
+            node (str): Filename of the node.
+        """
+        self.test = test
+        self.node = node
+        self.files = {}
+        _SNAPSHOTS.add(self)
+
+    def fetch(self, paths):
+        """
+        Description:
+            Fetches the files not fetched yet in one command.
+        Args:
+            paths (list): Paths of the files.
+        """
+        pending = [path for path in paths if path not in self.files]
+        results = BatchUtils(self.test).run_commands(
+            self.node, ['{0} "{1}"'.format(CAT_PATH, path)
+                        for path in pending], su_root=True)
+        for path, (stdout, _, rc) in zip(pending, results):
+            self.files[path] = stdout if rc == 0 else None
+
+    def get_lines(self, path):
+        """
+        Description:
+            Returns the lines of a file, fetching it if needed, and
+            asserts that it could be read.
+        """
+        self.fetch([path])
+        lines = self.files[path]
+        self.test.assertTrue(lines is not None, "Failed to read {0} on {1}"
+                             .format(path, self.node))
+        return lines
+
+    def get_hba_rules(self, path):
+        """
+        Description:
+            Returns the HbaRule of each rule of a pg_hba.conf file.
+        """
+        return parse_hba(self.get_lines(path))
+
+    def get_ident_maps(self, path):
+        """
+        Description:
+            Returns the IdentMap of each mapping of a pg_ident.conf file
+            and asserts that it has no malformed lines.
+        """
+        lines = self.get_lines(path)
+        malformed = get_malformed_ident(lines)
+        self.test.assertEqual([], malformed, "Malformed lines in {0} on {1}:"
+                              "\n{2}".format(path, self.node,
+                                             "\n".join(malformed)))
+        return parse_ident(lines)
+
+    def get_gucs(self, path):
+        """
+        Description:
+            Returns the Guc of each setting of a postgresql.conf file,
+            keyed by lower case name.
+        """
+        return parse_gucs(self.get_lines(path))
+
+    def assert_hba_rules(self, path, expected):
+        """
+        Description:
+            Asserts that a pg_hba.conf file holds exactly the expected
+            rules in the expected order, whatever the spacing.
+        Args:
+            path (str): Path of the file.
+            expected (list): HbaRule of each rule.
+        """
+        mismatches = diff_records(list(expected), self.get_hba_rules(path))
+        self.test.assertEqual([], mismatches, "{0} on {1} differs:\n{2}"
+                              .format(path, self.node,
+                                      "\n".join(mismatches)))
+
+    def assert_gucs(self, path, expected):
+        """
+        Description:
+            Asserts that a postgresql.conf file sets the expected values.
+            Other settings are not checked.
+        Args:
+            path (str): Path of the file.
+            expected (dict): Expected value of each setting.
+        """
+        mismatches = diff_gucs(expected, self.get_gucs(path))
+        self.test.assertEqual([], mismatches, "{0} on {1} differs:\n{2}"
+                              .format(path, self.node,
+                                      "\n".join(mismatches)))
+
+
+@register_node_cache
+def invalidate_config_snapshots(node=None, paths=None):
+    """
+    Description:
+        Drops the cached files of the snapshots of a node, or of every
+        node.
+    Kwargs:
+        node (str): Filename of the node. Default is None, every node.
+        paths (list): Paths of the files. Default is None, every file.
+    """
+    for snapshot in list(_SNAPSHOTS):
+        if node is None or snapshot.node == node:
+            for path in list(snapshot.files):
+                if paths is None or path in paths:
+                    del snapshot.files[path]
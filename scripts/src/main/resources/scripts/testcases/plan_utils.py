@@ -0,0 +1,421 @@
+"""
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     October 2026
+@author:    LITP Misc Testware
+@summary:   Runs a plan while following the state of each of its tasks,
+            and keeps the duration of each phase and task between runs to
+            report the ones that became slower.
+"""
+
+import math
+import os
+import re
+import time
+
+from duration_utils import DurationStore
+from model_utils import LITP_PATH
+
+TASK_STATES = ("Initial", "Running", "Success", "Failed", "Stopped")
+# Plan states after which no task changes state any more
+FINAL_PLAN_STATES = ("Successful", "Failed", "Stopped", "Invalid")
+
+POLL_INTERVAL_SECS = 2
+# Environment variable holding the path of the store of plan durations
+PLAN_DURATIONS_ENV = "LITP_PLAN_DURATIONS_FILE"
+
+_PHASE_RE = re.compile(r"^Phase (\d+)\s*$")
+_TASK_RE = re.compile(r"^({0})\s+(/\S*)\s*$".format("|".join(TASK_STATES)))
+_PLAN_STATE_RE = re.compile(r"^Plan Status:\s*(\w+)")
+_NODE_RE = re.compile(r'on node "([^"]+)"')
+_ITEM_NODE_RE = re.compile(r"/nodes/([^/]+)")
+
+
+def parse_show_plan(stdout):
+    """
+    Description:
+        Parses the output of "litp show_plan".
+    Args:
+        stdout (list): Lines printed by show_plan.
+    Returns:
+        tuple. (plan state, tasks) where tasks is a list of
+        (phase, state, item path, description) in plan order.
+    """
+    tasks = []
+    phase = None
+    plan_state = None
+    for line in stdout:
+        stripped = line.strip()
+        phase_match = _PHASE_RE.match(stripped)
+        task_match = _TASK_RE.match(stripped)
+        state_match = _PLAN_STATE_RE.match(stripped)
+        if phase_match:
+            phase = int(phase_match.group(1))
+        elif task_match:
+            tasks.append([phase, task_match.group(1), task_match.group(2),
+                          ""])
+        elif state_match:
+            plan_state = state_match.group(1)
+        elif tasks and stripped and line[:1].isspace() and \
+                not stripped.startswith("Tasks:"):
+            tasks[-1][3] = " ".join([tasks[-1][3], stripped]).strip()
+    return plan_state, [tuple(task) for task in tasks]
+
+
+def get_task_node(item_path, description):
+    """
+    Description:
+        Returns the node a task runs on, from its description or else its
+        model item.
+    """
+    match = _NODE_RE.search(description)
+    if match:
+        return match.group(1)
+    if item_path.startswith("/ms"):
+        return "ms"
+    match = _ITEM_NODE_RE.search(item_path)
+    return match.group(1) if match else None
+
+
+class TaskTiming(object):
+    """
+    When a plan task was first seen in each state.
+
+    Times are those of the show_plan polls, so they are late by up to one
+    poll interval.
+    """
+
+    def __init__(self, phase, item_path, description):
+        """
+        Args:
+            phase (int): Number of the phase of the task.
+            item_path (str): Model item of the task.
+            description (str): Description of the task.
+        """
+        self.phase = phase
+        self.item_path = item_path
+        self.description = description
+        self.node = get_task_node(item_path, description)
+        self.state = None
+        self.transitions = []
+
+    def update(self, state, seen_time):
+        """
+        Description:
+            Records the state of the task at a poll if it changed.
+        """
+        if state != self.state:
+            self.state = state
+            self.transitions.append((state, seen_time))
+
+    def get_time(self, states):
+        """
+        Description:
+            Returns when the task first reached one of the states, or None.
+        """
+        for state, seen_time in self.transitions:
+            if state in states:
+                return seen_time
+        return None
+
+    @property
+    def duration_secs(self):
+        """
+        Description:
+            Seconds from the task being seen running to it finishing, None
+            unless both were seen. A task running for less than a poll
+            interval may never be seen running.
+        """
+        start = self.get_time(("Running",))
+        end = self.end_secs
+        if start is None or end is None:
+            return None
+        return end - start
+
+    @property
+    def start_secs(self):
+        """
+        Description:
+            When the task was first seen out of Initial, or None.
+        """
+        return self.get_time(TASK_STATES[1:])
+
+    @property
+    def end_secs(self):
+        """
+        Description:
+            When the task was first seen finished, or None.
+        """
+        return self.get_time(TASK_STATES[2:])
+
+    @property
+    def within_poll(self):
+        """
+        Description:
+            Whether the task started and finished between two polls, so
+            that it ran for less than one poll cycle.
+        """
+        return self.end_secs is not None and \
+            self.get_time(("Running",)) is None
+
+
+class PlanTimeline(object):
+    """
+    The state transitions of every task of a plan run.
+    """
+
+    def __init__(self, start_time):
+        """
+        Args:
+            start_time (float): When the plan was started.
+        """
+        self.start_time = start_time
+        self.end_time = None
+        self.plan_state = None
+        self.tasks = []
+        self.poll_secs = []
+        self._keys = {}
+
+    def update(self, plan_state, tasks, seen_time):
+        """
+        Description:
+            Records the states shown by one show_plan poll.
+        """
+        self.plan_state = plan_state
+        self.poll_secs.append(seen_time - self.start_time)
+        for phase, state, item_path, description in tasks:
+            key = (phase, item_path, description)
+            if key not in self._keys:
+                self._keys[key] = TaskTiming(phase, item_path, description)
+                self.tasks.append(self._keys[key])
+            self._keys[key].update(state, seen_time - self.start_time)
+
+    @property
+    def duration_secs(self):
+        """
+        Description:
+            Seconds from the plan starting to it being seen finished.
+        """
+        return (self.end_time or time.time()) - self.start_time
+
+    @property
+    def poll_cycle_secs(self):
+        """
+        Description:
+            Longest time between two polls, and so the longest a task
+            finishing between them may have run.
+        """
+        return max([later - earlier for earlier, later in
+                    zip([0] + self.poll_secs, self.poll_secs)] or [0])
+
+    def _get_spans(self, key):
+        """
+        Description:
+            Returns the seconds from the first task of each group of tasks
+            being seen out of Initial to the last one being seen finished.
+            Tasks that ran for less than a poll cycle count too, as their
+            start is known to be before the poll that saw them finished.
+        """
+        bounds = {}
+        for task in self.tasks:
+            start, end = task.start_secs, task.end_secs
+            if start is None or end is None:
+                continue
+            first, last = bounds.get(key(task), (start, end))
+            bounds[key(task)] = (min(first, start), max(last, end))
+        return dict((group, last - first)
+                    for group, (first, last) in bounds.items())
+
+    def get_phase_durations(self):
+        """
+        Description:
+            Returns the duration of each phase, keyed by phase number.
+        """
+        return self._get_spans(lambda task: task.phase)
+
+    def get_node_durations(self):
+        """
+        Description:
+            Returns the time spent running tasks on each node, keyed by
+            node name.
+        """
+        durations = {}
+        for task in self.tasks:
+            if task.duration_secs is not None:
+                durations[task.node] = durations.get(task.node, 0) + \
+                    task.duration_secs
+        return durations
+
+    def get_failed_tasks(self):
+        """
+        Description:
+            Returns the tasks that failed.
+        """
+        return [task for task in self.tasks if task.state == "Failed"]
+
+    def _format_duration(self, task):
+        """
+        Description:
+            Returns the duration of a task for the report, as less than
+            a poll cycle if it ran between two polls.
+        """
+        if task.duration_secs is not None:
+            return "{0:.0f}s".format(task.duration_secs)
+        if task.within_poll:
+            return "<{0:.0f}s".format(math.ceil(self.poll_cycle_secs))
+        return "-"
+
+    def get_report(self):
+        """
+        Description:
+            Returns a report of the duration of the plan, its phases, its
+            tasks and the time spent on each node.
+        """
+        lines = ["Plan {0} in {1:.0f}s".format(self.plan_state,
+                                               self.duration_secs)]
+        phases = self.get_phase_durations()
+        for phase in sorted(phases):
+            duration = "{0:.0f}s".format(phases[phase])
+            if phases[phase] < self.poll_cycle_secs and any(
+                    task.within_poll for task in self.tasks
+                    if task.phase == phase):
+                duration = "<{0:.0f}s".format(
+                    math.ceil(self.poll_cycle_secs))
+            lines.append("Phase {0}: {1}".format(phase, duration))
+            for task in self.tasks:
+                if task.phase == phase:
+                    lines.append("    {0:8s} {1:>6s} {2}".format(
+                        task.state, self._format_duration(task),
+                        task.description or task.item_path))
+        nodes = self.get_node_durations()
+        lines.append("Task time per node: " + ", ".join(
+            "{0} {1:.0f}s".format(node, nodes[node])
+            for node in sorted(nodes, key=str)))
+        return "\n".join(lines)
+
+    def record(self, store, prefix):
+        """
+        Description:
+            Adds the duration of the plan, of each phase and of each task
+            seen running to a DurationStore, keyed by prefix and the phase
+            or task item path and description. Tasks that ran for less
+            than a poll cycle have no duration to record, but count in
+            the duration of their phase. Nothing is recorded unless
+            the plan was successful, as failed or stopped plans do not run
+            every task.
+        Returns:
+            list. The keys recorded.
+        """
+        if self.plan_state != "Successful":
+            return []
+        keys = ["{0} plan".format(prefix)]
+        store.record(keys[0], self.duration_secs)
+        for phase, duration_secs in self.get_phase_durations().items():
+            keys.append("{0} phase {1}".format(prefix, phase))
+            store.record(keys[-1], duration_secs)
+        for task in self.tasks:
+            if task.duration_secs is not None:
+                keys.append("{0} {1} {2}".format(prefix, task.item_path,
+                                                 task.description))
+                store.record(keys[-1], task.duration_secs)
+        return keys
+
+
+class PlanMonitor(object):
+    """
+    Creates and runs a plan and polls show_plan until it finishes,
+    recording when each task changes state.
+    """
+
+    def __init__(self, test, ms_node, poll_interval_secs=POLL_INTERVAL_SECS):
+        """
+        Args:
+            test (GenericTest): The test instance used to reach the MS.
+            ms_node (str): Filename of the MS.
+        Kwargs:
+            poll_interval_secs (int): Seconds between polls of show_plan.
+                                      Default is 2.
+        """
+        self.test = test
+        self.ms_node = ms_node
+        self.poll_interval_secs = poll_interval_secs
+
+    def poll(self):
+        """
+        Description:
+            Returns the plan state and tasks shown by show_plan.
+        """
+        stdout, _, _ = self.test.run_command(
+            self.ms_node, "{0} show_plan".format(LITP_PATH))
+        return parse_show_plan(stdout)
+
+    def run(self, timeout_mins):
+        """
+        Description:
+            Creates and runs a plan and follows it until it finishes or
+            the timeout expires.
+        Args:
+            timeout_mins (int): Minutes allowed for the plan.
+        Returns:
+            PlanTimeline. The state transitions of every task.
+        """
+        self.test.execute_cli_createplan_cmd(self.ms_node)
+        self.test.execute_cli_runplan_cmd(self.ms_node)
+        timeline = PlanTimeline(time.time())
+        end_time = timeline.start_time + timeout_mins * 60
+        while True:
+            plan_state, tasks = self.poll()
+            timeline.update(plan_state, tasks, time.time())
+            if plan_state in FINAL_PLAN_STATES or time.time() > end_time:
+                break
+            time.sleep(self.poll_interval_secs)
+        timeline.end_time = time.time()
+        return timeline
+
+    def run_and_check(self, expected_state, timeout_mins, history_key=None,
+                      durations_file=None):
+        """
+        Description:
+            Like run_and_check_plan, runs a plan and asserts it ends in the
+            expected state, logging the duration of its phases, tasks and
+            nodes. Durations of successful plans are kept between runs
+            when a history key and a store are given, and phases or tasks
+            slower than usual are logged.
+        Args:
+            expected_state (int): Expected plan state, e.g.
+                                  const.PLAN_COMPLETE.
+            timeout_mins (int): Minutes allowed for the plan.
+        Kwargs:
+            history_key (str): Prefix of the durations in the store, e.g.
+                               the tms_id of the test. Default is None,
+                               durations are not kept.
+            durations_file (str): Path of the store. Default is None,
+                                  the path in LITP_PLAN_DURATIONS_FILE if
+                                  set, else durations are not kept.
+        Returns:
+            PlanTimeline. The state transitions of every task.
+        """
+        timeline = self.run(timeout_mins)
+        self.test.log("info", timeline.get_report())
+        durations_file = durations_file or os.environ.get(PLAN_DURATIONS_ENV)
+        if history_key and durations_file:
+            store = DurationStore(durations_file)
+            keys = set(timeline.record(store, history_key))
+            store.save()
+            for key, last, usual in store.get_regressions():
+                if key in keys:
+                    self.test.log("info", "Slower than usual: {0}: {1:.0f}s,"
+                                  " usually {2:.0f}s".format(key, last,
+                                                             usual))
+        failed = ["{0} ({1})".format(task.description, task.item_path)
+                  for task in timeline.get_failed_tasks()]
+        self.test.assertTrue(
+            self.test.wait_for_plan_state(self.ms_node, expected_state, 1),
+            "Plan ended {0}, failed tasks: {1}".format(timeline.plan_state,
+                                                       failed))
+        return timeline
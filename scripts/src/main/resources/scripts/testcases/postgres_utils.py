@@ -0,0 +1,188 @@
+"""
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     October 2026
+@author:    LITP Misc Testware
+@summary:   Helpers for checking access to the PostgreSQL databases on
+            the MS.
+"""
+
+from batch_utils import BatchUtils
+import test_constants as const
+
+NO_HBA_ENTRY_ERROR = "psql: FATAL:  no pg_hba.conf entry for host"
+HBA_REJECT_ERROR = "psql: FATAL:  pg_hba.conf rejects connection for host"
+
+
+class PgAccessCell(object):
+    """
+    One entry of a PostgreSQL access matrix: a login attempt and its
+    expected outcome.
+    """
+
+    def __init__(self, user, db_name, table, root_user=True,
+                 expect_access=True, tcp_ip_address=False,
+                 expected_error=None):
+        """
+        Args:
+            user (str): PostgreSQL user.
+            db_name (str): Database to attempt to login to. Extra psql
+                           options such as "-h ms1" may be appended.
+            table (str): Table in database to query. None to only list
+                         the databases, for databases with no tables.
+        Kwargs:
+            root_user (bool): Whether to run psql as root. Default is True.
+            expect_access (bool): Whether the login attempt is expected
+                                  to be successful. Default is True.
+            tcp_ip_address (bool): True if the login attempt connects from
+                                   a tcp ip address. Default is False.
+            expected_error (str): Error expected when access is refused.
+                                  Default is derived from tcp_ip_address.
+        """
+        self.user = user
+        self.db_name = db_name
+        self.table = table
+        self.root_user = root_user
+        self.expect_access = expect_access
+        if expected_error is None and not expect_access:
+            expected_error = HBA_REJECT_ERROR if tcp_ip_address \
+                else NO_HBA_ENTRY_ERROR
+        self.expected_error = expected_error
+
+    def __repr__(self):
+        return "PgAccessCell({0}, {1}, {2}, root_user={3}, " \
+               "expect_access={4})".format(self.user, self.db_name,
+                                           self.table, self.root_user,
+                                           self.expect_access)
+
+
+class PgAccessResult(object):
+    """
+    Outcome of evaluating a PgAccessCell.
+    """
+
+    def __init__(self, cell, stdout, stderr, rc):
+        self.cell = cell
+        self.stdout = stdout
+        self.stderr = stderr
+        self.rc = rc
+        self.reason = self._evaluate()
+        self.passed = self.reason is None
+
+    def _evaluate(self):
+        """
+        Description:
+            Compares the login attempt against the expected outcome.
+        Returns:
+            str. Why the cell failed, or None if it passed.
+        """
+        if self.cell.expect_access:
+            if self.rc != 0:
+                return "expected access but psql returned {0}: {1}".format(
+                    self.rc, self.stderr)
+            if self.stdout == []:
+                return "expected access but psql returned no output"
+            return None
+
+        if self.rc == 0:
+            return "expected no access but psql returned 0"
+        # su may merge stderr into stdout so look for the error in both
+        if not any(self.cell.expected_error in line
+                   for line in self.stdout + self.stderr):
+            return "expected error message not returned: {0}".format(
+                self.cell.expected_error)
+        return None
+
+    def __repr__(self):
+        return "{0}: {1}".format(self.cell,
+                                 "PASS" if self.passed else self.reason)
+
+
+def get_pg_login_cmd(user, db_name, table):
+    """
+    Description:
+        Returns the command that logs into a database and queries a table.
+        The postgres user has to su to postgres before it can log in.
+    Args:
+        user (str): PostgreSQL user.
+        db_name (str): Database to attempt to login to.
+        table (str): Table to query, None to list the databases.
+    Returns:
+        str. The psql command.
+    """
+    postgres_cmd = "{0} -U {1} -d {2} -c".format(const.PSQL_PATH, user,
+                                                 db_name)
+    if user == "postgres":
+        cmd = "{0} - postgres -c \"{1} ".format(const.SU_PATH, postgres_cmd)
+        if table is not None:
+            cmd += "'SELECT * FROM {0}'\"".format(table)
+        else:
+            # Used when databases have no tables. Simply test access
+            cmd += r"'\l'" + '"'
+    else:
+        cmd = "{0} 'SELECT * FROM {1}'".format(postgres_cmd, table)
+    return cmd
+
+
+class PgAccessMatrix(object):
+    """
+    Evaluates a whole table of PostgreSQL login attempts with one remote
+    session per privilege level instead of one per attempt.
+    """
+
+    def __init__(self, test, node):
+        """
+        Args:
+            test (GenericTest): The test instance used to reach the node.
+            node (str): Filename of the node hosting PostgreSQL.
+        """
+        self.test = test
+        self.node = node
+        self.batch = BatchUtils(test)
+
+    def check(self, cells):
+        """
+        Description:
+            Runs every login attempt in the matrix.
+        Args:
+            cells (list): PgAccessCell objects.
+        Returns:
+            list. A PgAccessResult per cell, in the order given.
+        """
+        results = [None] * len(cells)
+        for root_user in (True, False):
+            indexes = [i for i, cell in enumerate(cells)
+                       if cell.root_user == root_user]
+            cmds = [get_pg_login_cmd(cells[i].user, cells[i].db_name,
+                                     cells[i].table) for i in indexes]
+            outputs = self.batch.run_commands(self.node, cmds,
+                                              su_root=root_user)
+            for i, (stdout, stderr, rc) in zip(indexes, outputs):
+                results[i] = PgAccessResult(cells[i], stdout, stderr, rc)
+        return results
+
+    def assert_access(self, cells):
+        """
+        Description:
+            Runs every login attempt in the matrix and asserts that all
+            of them behave as expected, reporting every mismatch at once.
+        Args:
+            cells (list): PgAccessCell objects.
+        Returns:
+            list. A PgAccessResult per cell, in the order given.
+        """
+        results = self.check(cells)
+        for result in results:
+            self.test.log("info", repr(result))
+        failed = [result for result in results if not result.passed]
+        self.test.assertFalse(failed,
+                              "{0} of {1} database access checks failed:\n"
+                              "{2}".format(len(failed), len(results),
+                                           "\n".join(repr(result)
+                                                     for result in failed)))
+        return results
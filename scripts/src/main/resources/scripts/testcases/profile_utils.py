@@ -0,0 +1,362 @@
+"""
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     October 2026
+@author:    LITP Misc Testware
+@summary:   Opt-in profiling of the remote calls a test makes, with an
+            estimate of their time spent on the ssh round trip, su and
+            the command.
+
+            Enabled for every test with the nose plugin:
+                python xunit_stream.py --with-command-profile
+                    [--command-profile-dir DIR] [nose args]
+            or for the tests of a testset calling profile_test(self) in
+            setUp, when LITP_PROFILE=1 is set in the environment.
+"""
+
+from collections import namedtuple
+import os
+import re
+import threading
+import time
+
+from nose.plugins import Plugin
+
+# GenericTest methods that reach a node, with the name of the argument
+# holding the command or path they act on
+PROFILED_METHODS = {"run_command": "cmd",
+                    "get_file_contents": "filepath",
+                    "create_file_on_node": "filepath",
+                    "remote_path_exists": "path",
+                    "remove_item": "path",
+                    "create_dir_on_node": "path",
+                    "copy_file_to": "remote_filepath"}
+
+# Environment variable turning on profile_test
+PROFILE_ENV = "LITP_PROFILE"
+CALIBRATION_CMD = "/bin/true"
+MAX_LABEL_LENGTH = 60
+
+CallRecord = namedtuple("CallRecord", "stack method node target su_root "
+                                      "wall_secs nested_secs bytes")
+
+# Round trip of a command doing nothing, keyed by (node, su_root), which
+# does not change during a test run. None if it could not be measured.
+_OVERHEADS = {}
+_OVERHEADS_LOCK = threading.Lock()
+
+
+def _get_size(value):
+    """
+    Description:
+        Returns the number of characters in a value returned by or passed
+        to a remote call.
+    """
+    if isinstance(value, basestring):
+        return len(value)
+    if isinstance(value, (list, tuple)):
+        return sum(_get_size(item) for item in value)
+    return 0
+
+
+def _get_label(target):
+    """
+    Description:
+        Returns a short single line label for a command or path.
+    """
+    label = re.sub(r"\s+", " ", str(target or "")).strip()
+    if len(label) > MAX_LABEL_LENGTH:
+        label = label[:MAX_LABEL_LENGTH - 3] + "..."
+    return label.replace(";", ",")
+
+
+class CommandProfiler(object):
+    """
+    Wraps the remote calls of a test instance and records, for each call,
+    the node, command, su flag, wall time and characters transferred.
+
+    The fixed cost of a call is measured once per node and su flag for
+    the whole test run, by running a command that does nothing before the
+    first call made to the node, while the test still has its connections.
+    The report uses it to estimate how the wall time of each call splits
+    into ssh round trip, su escalation and the command itself.
+    Calls made by other profiled calls, e.g. a run_command made by
+    get_file_contents, are nested under them.
+    """
+
+    def __init__(self, test):
+        """
+        Args:
+            test (GenericTest): The test instance to profile.
+        """
+        self.test = test
+        self.records = []
+        self.originals = {}
+        self.overridden = set()
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def start(self):
+        """
+        Description:
+            Starts recording the remote calls of the test.
+        """
+        for method, target_arg in PROFILED_METHODS.items():
+            original = getattr(self.test, method, None)
+            if original is not None and method not in self.originals:
+                if method in vars(self.test):
+                    # Already replaced on the instance, e.g. by the ssh
+                    # pool, and restored as is on stop
+                    self.overridden.add(method)
+                self.originals[method] = original
+                setattr(self.test, method,
+                        self._wrap(method, original, target_arg))
+        self.test.command_profiler = self
+
+    def stop(self):
+        """
+        Description:
+            Stops recording and restores the methods of the test.
+        """
+        for method, original in self.originals.items():
+            if method in self.overridden:
+                setattr(self.test, method, original)
+            else:
+                delattr(self.test, method)
+        self.originals = {}
+        if getattr(self.test, "command_profiler", None) is self:
+            del self.test.command_profiler
+
+    def _wrap(self, method, original, target_arg):
+        """
+        Description:
+            Returns a version of a method recording every call.
+        """
+        def profiled(*args, **kwargs):
+            """ Calls the method and records the call """
+            node = args[0] if args else kwargs.get("node")
+            target = args[1] if len(args) > 1 else kwargs.get(target_arg)
+            su_root = kwargs.get("su_root", False)
+            if isinstance(node, basestring):
+                self._calibrate(node)
+            stack = getattr(self.local, "stack", ())
+            outer_nested_secs = getattr(self.local, "nested_secs", 0)
+            self.local.stack = stack + ("{0}({1})".format(method, node),)
+            self.local.nested_secs = 0
+            start_time = time.time()
+            try:
+                result = original(*args, **kwargs)
+            finally:
+                wall_secs = time.time() - start_time
+                nested_secs = self.local.nested_secs
+                self.local.stack = stack
+                self.local.nested_secs = outer_nested_secs + wall_secs
+            with self.lock:
+                self.records.append(CallRecord(
+                    stack + ("{0}({1})".format(method, node),), method, node,
+                    target, su_root, wall_secs, nested_secs,
+                    _get_size(args) + _get_size(kwargs.values()) +
+                    _get_size(result)))
+            return result
+        return profiled
+
+    def _calibrate(self, node):
+        """
+        Description:
+            Measures the wall time of a command doing nothing on a node,
+            with and without su, unless it was measured already during the
+            test run.
+        """
+        with _OVERHEADS_LOCK:
+            for su_root in (False, True):
+                key = (node, su_root)
+                if key in _OVERHEADS:
+                    continue
+                run_command = self.originals.get("run_command",
+                                                 self.test.run_command)
+                start_time = time.time()
+                try:
+                    _, _, rc = run_command(node, CALIBRATION_CMD,
+                                           su_root=su_root)
+                except Exception:  # pylint: disable=broad-except
+                    rc = None
+                _OVERHEADS[key] = time.time() - start_time \
+                    if rc == 0 else None
+
+    def _split(self, record):
+        """
+        Description:
+            Returns the (frame, seconds) parts of the time of a call not
+            spent in the profiled calls nested in it. A run_command to a
+            calibrated node is split into the estimated ssh round trip
+            and su escalation, and the rest for the command.
+        """
+        ssh = _OVERHEADS.get((record.node, False))
+        su_total = _OVERHEADS.get((record.node, True))
+        if record.method != "run_command" or ssh is None or \
+                (record.su_root and su_total is None):
+            return [(_get_label(record.target),
+                     max(record.wall_secs - record.nested_secs, 0))]
+        su_cost = 0
+        if record.su_root:
+            su_cost = max(su_total - ssh, 0)
+        command = max(record.wall_secs - ssh - su_cost, 0)
+        return [("ssh (estimate)", min(ssh, record.wall_secs)),
+                ("su (estimate)", su_cost),
+                ("cmd " + _get_label(record.target), command)]
+
+    def get_folded_stacks(self):
+        """
+        Description:
+            Returns the recorded time in the folded stack format read by
+            flame graph tools, one "frame;frame;... microseconds" line per
+            distinct stack.
+        """
+        totals = {}
+        for record in self.records:
+            for name, secs in self._split(record):
+                if secs:
+                    key = ";".join(list(record.stack) + [name])
+                    totals[key] = totals.get(key, 0) + secs
+        return ["{0} {1}".format(key, int(secs * 1e6))
+                for key, secs in sorted(totals.items())]
+
+    def get_summary(self, top=10):
+        """
+        Description:
+            Returns a summary of the time spent per method and node and
+            the slowest calls.
+        """
+        outer = [record for record in self.records
+                 if len(record.stack) == 1]
+        by_method = {}
+        for record in outer:
+            key = (record.method, record.node)
+            calls, secs, size = by_method.get(key, (0, 0.0, 0))
+            by_method[key] = (calls + 1, secs + record.wall_secs,
+                              size + record.bytes)
+
+        lines = ["{0:22s} {1:12s} {2:>6s} {3:>9s} {4:>10s}".format(
+            "call", "node", "calls", "time(s)", "chars")]
+        for (method, node), (calls, secs, size) in sorted(
+                by_method.items(), key=lambda item: -item[1][1]):
+            lines.append("{0:22s} {1:12s} {2:6d} {3:9.2f} {4:10d}".format(
+                method, str(node), calls, secs, size))
+        split = {"ssh": 0.0, "su": 0.0, "cmd": 0.0}
+        for record in self.records:
+            parts = self._split(record)
+            if record.method == "run_command" and len(parts) == 3:
+                for name, secs in parts:
+                    split[name.split(" ")[0]] += secs
+        lines.append("run_command time, estimated from {0} on each node: "
+                     "ssh ~{1:.2f}s, su ~{2:.2f}s, commands ~{3:.2f}s"
+                     .format(CALIBRATION_CMD, split["ssh"], split["su"],
+                             split["cmd"]))
+        lines.append("Slowest calls:")
+        for record in sorted(outer, key=lambda item: -item.wall_secs)[:top]:
+            lines.append("    {0:6.2f}s {1}({2}){3} {4}".format(
+                record.wall_secs, record.method, record.node,
+                " su" if record.su_root else "",
+                _get_label(record.target)))
+        return "\n".join(lines)
+
+
+def profile_test(test):
+    """
+    Description:
+        Profiles the remote calls of a test until it ends and logs the
+        summary after its tearDown. Does nothing unless LITP_PROFILE is
+        set in the environment or if the test is already profiled, e.g.
+        by the nose plugin.
+    Args:
+        test (GenericTest): The test instance to profile.
+    Returns:
+        CommandProfiler. The profiler of the test, or None.
+    """
+    if not os.environ.get(PROFILE_ENV):
+        return None
+    if getattr(test, "command_profiler", None):
+        return test.command_profiler
+    profiler = CommandProfiler(test)
+    profiler.start()
+
+    def report():
+        """ Logs the summary of the test """
+        profiler.stop()
+        test.log("info", "Remote call profile:\n{0}".format(
+            profiler.get_summary()))
+
+    test.addCleanup(report)
+    return profiler
+
+
+class CommandProfile(Plugin):
+    """
+    Profiles the remote calls of every test. The summary of each test is
+    logged after its tearDown and its folded stacks are optionally written
+    to a directory for flame graph tools.
+    """
+
+    name = "command-profile"
+
+    def __init__(self):
+        super(CommandProfile, self).__init__()
+        self.profile_dir = None
+        self.profiler = None
+
+    def options(self, parser, env):
+        """
+        Description:
+            Adds the directory of the folded stacks to the nose options.
+        """
+        super(CommandProfile, self).options(parser, env)
+        parser.add_option("--command-profile-dir", action="store",
+                          dest="command_profile_dir", metavar="DIR",
+                          default=env.get("NOSE_COMMAND_PROFILE_DIR"),
+                          help="Directory to write the folded stacks of "
+                               "each test to [NOSE_COMMAND_PROFILE_DIR]")
+
+    def configure(self, options, conf):
+        """
+        Description:
+            Reads the directory of the folded stacks.
+        """
+        super(CommandProfile, self).configure(options, conf)
+        if self.enabled:
+            self.profile_dir = options.command_profile_dir
+
+    def startTest(self, test):
+        """
+        Description:
+            Starts profiling the test.
+        """
+        case = getattr(test, "test", None)
+        if case is not None and hasattr(case, "run_command"):
+            self.profiler = CommandProfiler(case)
+            self.profiler.start()
+
+    def stopTest(self, test):
+        """
+        Description:
+            Logs the summary of the test and writes its folded stacks.
+        """
+        if self.profiler is None:
+            return
+        profiler, self.profiler = self.profiler, None
+        profiler.stop()
+        summary = profiler.get_summary()
+        if hasattr(profiler.test, "log"):
+            profiler.test.log("info", "Remote call profile:\n{0}"
+                              .format(summary))
+        if self.profile_dir:
+            if not os.path.isdir(self.profile_dir):
+                os.makedirs(self.profile_dir)
+            path = os.path.join(self.profile_dir,
+                                "{0}.folded".format(test.id()))
+            with open(path, "w") as folded:
+                folded.write("\n".join(profiler.get_folded_stacks()) + "\n")
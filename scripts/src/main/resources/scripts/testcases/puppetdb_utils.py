@@ -0,0 +1,194 @@
+"""
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     October 2026
+@author:    LITP Misc Testware
+@summary:   Targeted PuppetDB queries through its HTTP query API on the MS,
+            filtered by PuppetDB instead of dumping its tables.
+"""
+
+import json
+
+from curl_utils import CurlBatch
+
+# Plain HTTP listener of PuppetDB, on localhost on the MS. v3 is the
+# stable query API of PuppetDB 2.3, installed on the MS since TORF-330511.
+PUPPETDB_URL = "http://localhost:8080/v3"
+
+
+def get_any_of(field, values):
+    """
+    Description:
+        Returns the query matching a field equal to any of the values.
+    Args:
+        field (str or list): Field of the query language, e.g. "certname"
+                             or ["parameter", "uniqueid"].
+        values (list): Accepted values.
+    """
+    terms = [["=", field, value] for value in values]
+    return terms[0] if len(terms) == 1 else ["or"] + terms
+
+
+def get_all_of(*queries):
+    """
+    Description:
+        Returns the query matching all the given queries, skipping those
+        that are None.
+    """
+    terms = [query for query in queries if query is not None]
+    if not terms:
+        return None
+    return terms[0] if len(terms) == 1 else ["and"] + terms
+
+
+class PuppetDbClient(object):
+    """
+    Runs queries against the PuppetDB query API on the MS and returns the
+    parsed results. Several queries are sent with a single curl, see
+    CurlBatch.
+    """
+
+    def __init__(self, test, ms_node, url=PUPPETDB_URL):
+        """
+        Args:
+            test (GenericTest): The test instance used to reach the MS.
+            ms_node (str): Filename of the MS.
+        Kwargs:
+            url (str): Base url of the query API, as seen from the MS.
+                       Default is http://localhost:8080/v3.
+        """
+        self.test = test
+        self.ms_node = ms_node
+        self.url = url
+
+    def get_request_options(self, endpoint, query):
+        """
+        Description:
+            Returns the curl options of a query.
+        Args:
+            endpoint (str): Endpoint of the query API, e.g. "resources".
+            query (list): Query in the PuppetDB query language, None for
+                          the whole endpoint.
+        """
+        options = [("get", None)]
+        if query is not None:
+            options.append(("data-urlencode",
+                            "query={0}".format(json.dumps(query))))
+        options.append(("url", "{0}/{1}".format(self.url, endpoint)))
+        return options
+
+    def query_many(self, requests):
+        """
+        Description:
+            Runs several queries with as few commands as their length
+            allows and asserts that each one succeeded.
+        Args:
+            requests (list): (endpoint, query) per query, query being None
+                             for the whole endpoint.
+        Returns:
+            list. The parsed json result of each query, in order.
+        """
+        outcomes = CurlBatch(self.test, self.ms_node).run(
+            [self.get_request_options(endpoint, query)
+             for endpoint, query in requests])
+        results = []
+        for (endpoint, query), (status, body) in zip(requests, outcomes):
+            self.test.assertEqual(200, status,
+                                  "PuppetDB query {0} {1} returned {2}: {3}"
+                                  .format(endpoint, json.dumps(query),
+                                          status, body))
+            results.append(json.loads(body))
+        return results
+
+    def query(self, endpoint, query=None):
+        """
+        Description:
+            Runs a single query.
+        Args:
+            endpoint (str): Endpoint of the query API, e.g. "resources".
+        Kwargs:
+            query (list): Query in the PuppetDB query language.
+                          Default is None, the whole endpoint.
+        Returns:
+            list. The parsed json result.
+        """
+        return self.query_many([(endpoint, query)])[0]
+
+    @staticmethod
+    def get_facts_query(certname, names=None):
+        """
+        Description:
+            Returns the query of the facts of a node, or of some of them.
+        """
+        return get_all_of(["=", "certname", certname],
+                          get_any_of("name", names) if names else None)
+
+    def get_facts(self, certname, names=None):
+        """
+        Description:
+            Returns the facts PuppetDB holds for a node.
+        Args:
+            certname (str): Certificate name of the node.
+        Kwargs:
+            names (list): Names of the facts. Default is None, every fact.
+        Returns:
+            dict. The value of each fact, keyed by name.
+        """
+        facts = self.query("facts", self.get_facts_query(certname, names))
+        return dict((fact["name"], fact["value"]) for fact in facts)
+
+    @staticmethod
+    def get_resources_query(resource_type=None, title=None, params=None,
+                            certname=None):
+        """
+        Description:
+            Returns the query of the resources matching every criterion
+            given. A parameter matches any value of a list.
+        """
+        params = params or {}
+        return get_all_of(
+            ["=", "type", resource_type] if resource_type else None,
+            ["=", "title", title] if title else None,
+            ["=", "certname", certname] if certname else None,
+            *[get_any_of(["parameter", name],
+                         value if isinstance(value, (list, tuple, set))
+                         else [value])
+              for name, value in sorted(params.items())])
+
+    def get_resources(self, resource_type=None, title=None, params=None,
+                      certname=None):
+        """
+        Description:
+            Returns the resources of the catalogs matching every criterion
+            given, filtered by PuppetDB.
+        Kwargs:
+            resource_type (str): Resource type, e.g. "File".
+            title (str): Resource title.
+            params (dict): Value, or list of accepted values, of resource
+                           parameters.
+            certname (str): Certificate name of the node of the catalog.
+        Returns:
+            list. The resources, as returned by PuppetDB.
+        """
+        return self.query("resources", self.get_resources_query(
+            resource_type, title, params, certname))
+
+    def get_catalog_timestamps(self, certnames=None):
+        """
+        Description:
+            Returns when PuppetDB last received the catalog of each node.
+        Kwargs:
+            certnames (list): Certificate names of the nodes.
+                              Default is None, every node.
+        Returns:
+            dict. The catalog timestamp of each node, keyed by certname.
+        """
+        nodes = self.query("nodes", get_any_of("name", certnames)
+                           if certnames else None)
+        return dict((node["name"], node.get("catalog_timestamp"))
+                    for node in nodes)
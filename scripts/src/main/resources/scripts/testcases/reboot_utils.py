@@ -0,0 +1,279 @@
+"""
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     October 2026
+@author:    LITP Misc Testware
+@summary:   Reboots a node and measures how long each phase of the
+            reboot takes.
+"""
+
+import json
+import os
+import socket
+import subprocess
+import time
+
+import test_constants as const
+
+PING_PATH = "/bin/ping"
+SYSTEMCTL_PATH = "/usr/bin/systemctl"
+SSH_PORT = 22
+BOOT_ID_PATH = "/proc/sys/kernel/random/boot_id"
+# Consecutive pings lost before a node is considered down, so that a
+# single ping lost before the shutdown starts is not taken for it
+DOWN_PING_FAILURES = 4
+
+
+def wait_until(probe, timeout_secs, initial_interval=0.1, factor=1.5,
+               max_interval=1.0):
+    """
+    Description:
+        Calls probe until it returns True, starting with short intervals
+        that grow up to max_interval so that a state change is noticed
+        within max_interval seconds without hammering the node.
+    Args:
+        probe (callable): Function returning True once the wait is over.
+        timeout_secs (int): Maximum time to wait.
+    Kwargs:
+        initial_interval (float): First interval between probes.
+        factor (float): Growth of the interval after every probe.
+        max_interval (float): Longest interval between probes.
+    Returns:
+        float. Time of the successful probe since the epoch, or None if
+        the timeout expired.
+    """
+    end_time = time.time() + timeout_secs
+    interval = initial_interval
+    while True:
+        if probe():
+            return time.time()
+        if time.time() >= end_time:
+            return None
+        time.sleep(interval)
+        interval = min(interval * factor, max_interval)
+
+
+def ping(ip_address):
+    """
+    Description:
+        Sends a single ping with a one second deadline.
+    Returns:
+        bool. True if the node answered.
+    """
+    with open(os.devnull, "w") as devnull:
+        return subprocess.call([PING_PATH, "-c", "1", "-W", "1", ip_address],
+                               stdout=devnull, stderr=devnull) == 0
+
+
+def sshd_up(ip_address):
+    """
+    Description:
+        Checks that sshd accepts connections and sends its banner.
+    Returns:
+        bool. True if sshd is answering.
+    """
+    try:
+        sock = socket.create_connection((ip_address, SSH_PORT), 1)
+    except (socket.error, socket.timeout):
+        return False
+    try:
+        sock.settimeout(1)
+        return sock.recv(4).startswith(b"SSH-")
+    except (socket.error, socket.timeout):
+        return False
+    finally:
+        sock.close()
+
+
+def wait_until_down(ip_address, timeout_secs,
+                    failures=DOWN_PING_FAILURES):
+    """
+    Description:
+        Waits for a node to stop answering ping a number of consecutive
+        times.
+    Args:
+        ip_address (str): IP address of the node.
+        timeout_secs (int): Maximum time to wait.
+    Kwargs:
+        failures (int): Consecutive pings that must be lost.
+                        Default is 4.
+    Returns:
+        float. Time of the first of the lost pings since the epoch, or None
+        if the timeout expired.
+    """
+    lost = []
+
+    def down():
+        """ Records the lost pings, forgetting them when one answers """
+        probe_time = time.time()
+        if ping(ip_address):
+            del lost[:]
+        else:
+            lost.append(probe_time)
+        return len(lost) >= failures
+
+    if wait_until(down, timeout_secs) is None:
+        return None
+    return lost[0]
+
+
+class RebootTiming(object):
+    """
+    How long each phase of a reboot took, in seconds from the moment the
+    reboot command returned.
+    """
+
+    def __init__(self, node):
+        self.node = node
+        self.down_secs = None
+        self.ping_up_secs = None
+        self.sshd_up_secs = None
+        self.node_up_secs = None
+        self.services_ready_secs = {}
+
+    def to_dict(self):
+        """
+        Description:
+            Returns the timings as a dict, suitable for logging as json.
+        """
+        return {"node": self.node,
+                "down_secs": self.down_secs,
+                "ping_up_secs": self.ping_up_secs,
+                "sshd_up_secs": self.sshd_up_secs,
+                "node_up_secs": self.node_up_secs,
+                "services_ready_secs": self.services_ready_secs}
+
+    def __repr__(self):
+        return json.dumps(self.to_dict(), sort_keys=True)
+
+
+class RebootTimer(object):
+    """
+    Reboots a node and records when it went down, answered ping, accepted
+    ssh connections and had each of its services running again. The boot
+    id of the node is compared before and after to check that it did
+    reboot.
+    """
+
+    def __init__(self, test, node, services=None, timeout_secs=1800):
+        """
+        Args:
+            test (GenericTest): The test instance used to reach the node.
+            node (str): Filename of the node to reboot.
+        Kwargs:
+            services (list): Services that must be active for the node to
+                             be considered ready. Default is None.
+            timeout_secs (int): Maximum time allowed for each phase.
+                                Default is 1800.
+        """
+        self.test = test
+        self.node = node
+        self.services = services or []
+        self.timeout_secs = timeout_secs
+        self.ip_address = test.get_node_att(node, const.NODE_ATT_IPV4)
+
+    def _get_inactive_services(self, services):
+        """
+        Description:
+            Returns the services that are not active yet, checking all of
+            them with a single systemctl call.
+        """
+        cmd = "{0} is-active {1}".format(SYSTEMCTL_PATH,
+                                         " ".join(services))
+        try:
+            stdout, _, _ = self.test.run_command(self.node, cmd,
+                                                 su_root=True)
+        except Exception:  # pylint: disable=broad-except
+            # sshd may accept connections before logins work
+            return services
+        if len(stdout) != len(services):
+            return services
+        return [service for service, state in zip(services, stdout)
+                if state.strip() != "active"]
+
+    def _get_boot_id(self):
+        """
+        Description:
+            Returns the boot id of the node, which changes on every boot.
+        """
+        stdout, _, _ = self.test.run_command(self.node,
+                                             "/bin/cat {0}".format(
+                                                 BOOT_ID_PATH),
+                                             default_asserts=True)
+        return stdout[0].strip()
+
+    def _assert_phase(self, end_time, start_time, description):
+        """
+        Description:
+            Asserts that a phase finished and returns its duration.
+        """
+        self.test.assertTrue(end_time is not None,
+                             "{0} did not {1} within {2}s".format(
+                                 self.node, description, self.timeout_secs))
+        return round(end_time - start_time, 2)
+
+    def reboot(self, wait_for_litp=False):
+        """
+        Description:
+            Reboots the node and waits for it to be ready again, recording
+            the duration of each phase.
+        Kwargs:
+            wait_for_litp (bool): Passed on to wait_for_node_up.
+                                  Default is False.
+        Returns:
+            RebootTiming. The duration of each phase.
+        """
+        timing = RebootTiming(self.node)
+        boot_id = self._get_boot_id()
+        reboot_cmd = "(sleep 1; {0} -r now) &".format(const.SHUTDOWN_PATH)
+        self.test.run_command(self.node, reboot_cmd, su_root=True,
+                              default_asserts=True)
+        start_time = time.time()
+
+        self.test.log("info", "Waiting for {0} to become unreachable"
+                      .format(self.node))
+        timing.down_secs = self._assert_phase(
+            wait_until_down(self.ip_address, self.timeout_secs),
+            start_time, "go down")
+
+        self.test.log("info", "Waiting for {0} to come back online"
+                      .format(self.node))
+        timing.ping_up_secs = self._assert_phase(
+            wait_until(lambda: ping(self.ip_address), self.timeout_secs),
+            start_time, "answer ping")
+        timing.sshd_up_secs = self._assert_phase(
+            wait_until(lambda: sshd_up(self.ip_address), self.timeout_secs),
+            start_time, "accept ssh connections")
+
+        self.test.assertTrue(self.test.wait_for_node_up(
+                                 self.node, wait_for_litp=wait_for_litp),
+                             "'{0}' did not come up in expected timeframe"
+                             .format(self.node))
+        timing.node_up_secs = round(time.time() - start_time, 2)
+        self.test.assertNotEqual(boot_id, self._get_boot_id(),
+                                 "{0} is up but did not reboot".format(
+                                     self.node))
+
+        pending = list(self.services)
+
+        def services_ready():
+            """ Records the services that have become active """
+            inactive = self._get_inactive_services(pending)
+            for service in pending[:]:
+                if service not in inactive:
+                    timing.services_ready_secs[service] = \
+                        round(time.time() - start_time, 2)
+                    pending.remove(service)
+            return not pending
+
+        if pending:
+            self._assert_phase(wait_until(services_ready, self.timeout_secs),
+                               start_time, "start {0}".format(pending))
+
+        self.test.log("info", "Reboot timing: {0}".format(timing))
+        return timing
@@ -0,0 +1,316 @@
+"""
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     October 2026
+@author:    LITP Misc Testware
+@summary:   Package availability checks answered from the yum repository
+            metadata on the MS instead of running yum on every node.
+"""
+
+import re
+
+from cache_utils import register_node_cache
+from inventory_utils import get_inventory
+from parallel_utils import for_each_node
+
+ZCAT_PATH = "/usr/bin/zcat"
+YUM_REPOS_DIR = "/etc/yum.repos.d"
+# Directory the MS serves its yum repositories from over http
+MS_REPOS_ROOT = "/var/www/html"
+
+REPO_MARKER = "@@LITP_REPO@@ "
+REPO_ERROR_MARKER = "@@LITP_REPO_ERROR@@"
+
+_NAME_RE = re.compile(r"<name>([^<]*)</name>")
+_VERSION_RE = re.compile(r'<version epoch="([^"]*)" ver="([^"]*)" '
+                         r'rel="([^"]*)"/>')
+
+# Indexes of the test run, keyed by (MS filename, repository directory)
+_INDEXES = {}
+
+
+def parse_repo_files(contents):
+    """
+    Description:
+        Returns the base urls of the enabled repositories in the contents
+        of yum .repo files.
+    Args:
+        contents (list): Lines of the .repo files.
+    Returns:
+        list. The base urls, in the order they are defined.
+    """
+    repos = []
+    for line in contents:
+        line = line.strip()
+        if line.startswith("["):
+            repos.append({"enabled": "1", "baseurl": None})
+        elif repos and "=" in line and not line.startswith("#"):
+            key, value = [field.strip() for field in line.split("=", 1)]
+            if key in repos[-1]:
+                repos[-1][key] = value
+    return [repo["baseurl"] for repo in repos
+            if repo["baseurl"] and repo["enabled"] == "1"]
+
+
+def get_repo_dir(baseurl, ms_hosts, on_ms=False):
+    """
+    Description:
+        Returns the directory on the MS holding the repository at a base
+        url, or None if the repository is not served from there.
+    Args:
+        baseurl (str): Base url of the repository.
+        ms_hosts (list): Host names and addresses of the MS.
+    Kwargs:
+        on_ms (bool): Whether the url is used on the MS itself, where
+                      file urls are local too. Default is False.
+    """
+    match = re.match(r"^(?:(https?)://([^/:]+)(?::\d+)?|file://)(/.*)$",
+                     baseurl)
+    if not match:
+        return None
+    scheme, host, path = match.groups()
+    if scheme is None and not on_ms:
+        return None
+    if scheme is not None and host.lower() not in \
+            set(ms_host.lower() for ms_host in ms_hosts):
+        return None
+    path = path.rstrip("/")
+    if scheme is not None and not path.startswith(MS_REPOS_ROOT + "/"):
+        path = MS_REPOS_ROOT + path
+    return path
+
+
+class RepoIndex(object):
+    """
+    Name to version index of the packages in a yum repository.
+    """
+
+    def __init__(self, repo_dir, packages):
+        """
+        Args:
+            repo_dir (str): Directory of the repository on the MS.
+            packages (dict): The version-release of every package, keyed
+                             by package name.
+        """
+        self.repo_dir = repo_dir
+        self.packages = packages
+
+    def get_versions(self, name):
+        """
+        Description:
+            Returns the version-release of every package with a name.
+        """
+        return list(self.packages.get(name, []))
+
+
+class RepoMetadata(object):
+    """
+    Answers whether packages are available to nodes from the primary
+    metadata of the repositories the MS serves.
+
+    The metadata of each repository is read once per test run, with a
+    single command for all the repositories not read yet, so any number of
+    nodes sharing a repository cost one index each.
+    """
+
+    def __init__(self, test, ms_node):
+        """
+        Args:
+            test (GenericTest): The test instance used to reach the nodes.
+            ms_node (str): Filename of the MS serving the repositories.
+        """
+        self.test = test
+        self.ms_node = ms_node
+
+    @staticmethod
+    def get_metadata_cmd(repo_dirs):
+        """
+        Description:
+            Returns the command printing the name and version lines of the
+            primary metadata of each repository, each preceded by a line
+            holding the repository directory.
+        """
+        return ('for __r in {0}; do echo "{1}$__r"; '
+                '__p=$(/bin/grep -o \'href="[^"]*primary.xml.gz"\' '
+                '"$__r/repodata/repomd.xml" 2>/dev/null | '
+                '/usr/bin/head -n1 | /bin/sed \'s/^href="//; s/"$//\'); '
+                '[ -n "$__p" ] || {{ echo "{2}"; continue; }}; '
+                '{3} "$__r/$__p" | /bin/grep -Eo '
+                '\'<name>[^<]*</name>|<version [^>]*/>\'; '
+                'done'.format(" ".join(repo_dirs), REPO_MARKER,
+                              REPO_ERROR_MARKER, ZCAT_PATH))
+
+    @staticmethod
+    def parse_metadata_output(stdout):
+        """
+        Description:
+            Parses the output of the metadata command.
+        Returns:
+            dict. A RepoIndex per repository directory, None for
+            repositories without metadata.
+        """
+        indexes = {}
+        repo_dir = None
+        name = None
+        for line in stdout:
+            if line.startswith(REPO_MARKER):
+                repo_dir = line[len(REPO_MARKER):]
+                indexes[repo_dir] = RepoIndex(repo_dir, {})
+            elif line == REPO_ERROR_MARKER and repo_dir:
+                indexes[repo_dir] = None
+            elif indexes.get(repo_dir):
+                name_match = _NAME_RE.match(line)
+                version_match = _VERSION_RE.match(line)
+                if name_match:
+                    name = name_match.group(1)
+                elif version_match and name:
+                    indexes[repo_dir].packages.setdefault(name, []).append(
+                        "{0}-{1}".format(*version_match.groups()[1:]))
+                    name = None
+        return indexes
+
+    def get_indexes(self, repo_dirs):
+        """
+        Description:
+            Returns the index of each repository, reading the metadata of
+            those not read yet during the test run in one command.
+        Args:
+            repo_dirs (list): Directories of the repositories on the MS.
+        Returns:
+            dict. A RepoIndex per repository directory, None for
+            directories without repository metadata.
+        """
+        pending = sorted(set(repo_dir for repo_dir in repo_dirs
+                             if (self.ms_node, repo_dir) not in _INDEXES))
+        if pending:
+            stdout, _, _ = self.test.run_command(
+                self.ms_node, self.get_metadata_cmd(pending), su_root=True)
+            indexes = self.parse_metadata_output(stdout)
+            for repo_dir in pending:
+                _INDEXES[(self.ms_node, repo_dir)] = indexes.get(repo_dir)
+        return dict((repo_dir, _INDEXES[(self.ms_node, repo_dir)])
+                    for repo_dir in repo_dirs)
+
+    def get_ms_hosts(self):
+        """
+        Description:
+            Returns the names and address the nodes may reach the MS by.
+        """
+        inventory = get_inventory(self.test)
+        hostname = inventory.get_props("/ms", "hostname")
+        hosts = [inventory.get_node_att(self.ms_node, "ipv4")]
+        if hostname:
+            hosts.append(hostname)
+            hosts.append(hostname.split(".")[0])
+        return [host for host in hosts if host]
+
+    def get_node_repo_dirs(self, node, ms_hosts):
+        """
+        Description:
+            Returns the directories on the MS of the repositories enabled
+            on a node, and the base urls of those not served by the MS.
+        Args:
+            node (str): Filename of the node.
+            ms_hosts (list): Names and address of the MS, as returned by
+                             get_ms_hosts.
+        """
+        stdout, _, _ = self.test.run_command(
+            node, "/bin/cat {0}/*.repo".format(YUM_REPOS_DIR), su_root=True,
+            default_asserts=True)
+        repo_dirs = []
+        other_urls = []
+        for baseurl in parse_repo_files(stdout):
+            repo_dir = get_repo_dir(baseurl, ms_hosts,
+                                    on_ms=node == self.ms_node)
+            if repo_dir is None:
+                other_urls.append(baseurl)
+            elif repo_dir not in repo_dirs:
+                repo_dirs.append(repo_dir)
+        return repo_dirs, other_urls
+
+    def get_available(self, nodes, names):
+        """
+        Description:
+            Finds the versions of packages available to each node from
+            its enabled repositories served by the MS. The repository
+            configuration of the nodes is read concurrently and the
+            metadata of each repository only once. Repositories served
+            from elsewhere are not checked.
+        Args:
+            nodes (list): Filenames of the nodes.
+            names (list): Names of the packages.
+        Returns:
+            tuple. (available, other_urls) where available holds, for
+            each node, the versions available of each package, an empty
+            list for packages not available, and other_urls the base
+            urls of each node not served by the MS.
+        """
+        ms_hosts = self.get_ms_hosts()
+        node_repos = for_each_node(
+            nodes, lambda node: self.get_node_repo_dirs(node, ms_hosts))
+        indexes = self.get_indexes(
+            [repo_dir for repo_dirs, _ in node_repos.values()
+             for repo_dir in repo_dirs])
+
+        available = {}
+        other_urls = {}
+        for node in nodes:
+            repo_dirs, other_urls[node] = node_repos[node]
+            if other_urls[node]:
+                self.test.log("info", "Repositories of {0} not served by "
+                              "the MS, not checked: {1}".format(
+                                  node, other_urls[node]))
+            available[node] = dict((name, []) for name in names)
+            for repo_dir in repo_dirs:
+                if indexes[repo_dir] is None:
+                    continue
+                for name in names:
+                    available[node][name].extend(
+                        indexes[repo_dir].get_versions(name))
+        return available, other_urls
+
+    def assert_available(self, nodes, names):
+        """
+        Description:
+            Asserts that every package is available to every node.
+        Args:
+            nodes (list): Filenames of the nodes.
+            names (list): Names of the packages.
+        """
+        available, other_urls = self.get_available(nodes, names)
+        missing = dict((node, [name for name in names
+                               if not available[node][name]])
+                       for node in nodes)
+        missing = dict((node, names) for node, names in missing.items()
+                       if names)
+        self.test.assertFalse(missing, "Packages not available in the "
+                              "repositories of the nodes served by the MS: "
+                              "{0}, repositories not checked: {1}".format(
+                                  missing, dict(
+                                      (node, other_urls[node])
+                                      for node in missing
+                                      if other_urls[node])))
+
+
+@register_node_cache
+def invalidate_repo_indexes(node=None, paths=None):
+    """
+    Description:
+        Drops the cached indexes of the repositories of an MS, or of every
+        MS, or only those of the repositories holding some paths.
+    Kwargs:
+        node (str): Filename of the MS. Default is None, every MS.
+        paths (list): Paths changed. Default is None, every repository.
+    """
+    for ms_node, repo_dir in list(_INDEXES):
+        if node is not None and ms_node != node:
+            continue
+        if paths is None or any(
+                path == repo_dir or path.startswith(repo_dir.rstrip("/") + "/")
+                for path in paths):
+            del _INDEXES[(ms_node, repo_dir)]
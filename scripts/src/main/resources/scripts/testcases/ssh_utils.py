@@ -0,0 +1,417 @@
+"""
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     October 2026
+@author:    LITP Misc Testware
+@summary:   Opt-in pool of ssh connections kept open for the whole test
+            run, with a shell per node already switched to root, so that
+            commands run with su_root do not go through su every time.
+
+            Meant for performance runs: the pooled commands skip the
+            bookkeeping of GenericTest.run_command. Enabled from the setUp
+            of a testset with:
+                use_ssh_pool(self)
+            when LITP_SSH_POOL=1 is set in the environment. Host keys are
+            checked against the known_hosts files of the user.
+"""
+
+import atexit
+import base64
+import os
+import socket
+import threading
+import time
+
+import paramiko
+
+from batch_utils import BatchUtils
+
+SU_PATH = "/bin/su"
+BASH_PATH = "/bin/bash"
+BASE64_PATH = "/usr/bin/base64"
+
+SSH_PORT = 22
+CONNECT_TIMEOUT_SECS = 10
+CONNECT_ATTEMPTS = 3
+KEEPALIVE_SECS = 30
+DEFAULT_SU_TIMEOUT_SECS = 60
+COMMAND_TIMEOUT_SECS = 600
+HEALTH_CHECK_TIMEOUT_SECS = 10
+# Environment variable turning on use_ssh_pool
+SSH_POOL_ENV = "LITP_SSH_POOL"
+# Characters of the encoded script sent per line, well within the 4096
+# characters a terminal line may hold
+CHUNK_LENGTH = 1000
+
+# The markers are printed from two quoted halves so the echo of the
+# command sending them never matches
+READY_MARKER = "@@LITP_SHELL_READY@@"
+DONE_MARKER = "@@LITP_SHELL_DONE@@"
+_PRINT_MARKER_CMD = "printf '%s%s\\n' '{0}' '{1}'"
+
+# Connections of the test run, keyed by node filename
+_CONNECTIONS = {}
+_CONNECTIONS_LOCK = threading.Lock()
+
+
+class UnknownHostKeyError(paramiko.SSHException):
+    """
+    Raised when a node presents a host key not in the known_hosts files.
+    """
+
+
+class _RejectUnknownHostKey(paramiko.MissingHostKeyPolicy):
+    """
+    Rejects the connections to nodes whose host key is not known.
+    """
+
+    def missing_host_key(self, client, hostname, key):
+        """
+        Description:
+            Raises UnknownHostKeyError.
+        """
+        raise UnknownHostKeyError("No known host key for {0}".format(
+            hostname))
+
+
+def _get_print_marker_cmd(marker):
+    """
+    Description:
+        Returns the command printing a marker without the command itself
+        containing it.
+    """
+    middle = len(marker) // 2
+    return _PRINT_MARKER_CMD.format(marker[:middle], marker[middle:])
+
+
+class NodeShell(object):
+    """
+    A long-lived bash on a terminal of an ssh connection, optionally
+    started through su so that it runs as root. Commands are sent to it
+    one at a time and their output is read up to a marker.
+    """
+
+    def __init__(self, transport, root_password=None,
+                 su_timeout_secs=DEFAULT_SU_TIMEOUT_SECS):
+        """
+        Args:
+            transport (paramiko.Transport): The connection to the node.
+        Kwargs:
+            root_password (str): Password given to su. Default is None,
+                                 a shell of the connecting user.
+            su_timeout_secs (int): Time allowed for su and the shell to
+                                   start. Default is 60.
+        """
+        self.channel = transport.open_session()
+        self.channel.get_pty(width=1000)
+        self.buffer = ""
+        self.lock = threading.Lock()
+        if root_password is None:
+            self.channel.exec_command(
+                "{0} --noprofile --norc".format(BASH_PATH))
+        else:
+            self.channel.exec_command("{0} - root -c '{1} --noprofile "
+                                      "--norc'".format(SU_PATH, BASH_PATH))
+            self._read_until("assword:", su_timeout_secs, partial=True)
+            self.channel.sendall(root_password + "\n")
+        self.channel.sendall("stty -echo; PS1=; PS2=; unset HISTFILE; "
+                             "{0}\n".format(
+                                 _get_print_marker_cmd(READY_MARKER)))
+        self._read_until(READY_MARKER, su_timeout_secs)
+
+    def _read_until(self, marker, timeout_secs, partial=False):
+        """
+        Description:
+            Reads the output of the shell up to a line holding only the
+            marker, or up to the marker anywhere if partial is True.
+        Returns:
+            list. The lines read before the marker.
+        Raises:
+            socket.timeout if the marker is not read in time, EOFError if
+            the shell exits first.
+        """
+        end_time = time.time() + timeout_secs
+        while True:
+            if partial and marker in self.buffer:
+                before, self.buffer = self.buffer.split(marker, 1)
+                return before.splitlines()
+            lines = self.buffer.replace("\r", "").split("\n")
+            if marker in lines[:-1]:
+                index = lines.index(marker)
+                self.buffer = "\n".join(lines[index + 1:])
+                return lines[:index]
+            remaining = end_time - time.time()
+            if remaining <= 0:
+                raise socket.timeout("No {0} from the shell within {1}s"
+                                     .format(marker, timeout_secs))
+            self.channel.settimeout(remaining)
+            data = self.channel.recv(65536)
+            if not data:
+                raise EOFError("The shell exited")
+            self.buffer += data
+
+    def is_alive(self):
+        """
+        Description:
+            Checks that the shell is still running and answers an empty
+            command, as the node may have rebooted without the connection
+            noticing yet.
+        """
+        if self.channel.closed or self.channel.exit_status_ready():
+            return False
+        try:
+            self.run_script(":", HEALTH_CHECK_TIMEOUT_SECS)
+        except (socket.error, EOFError, paramiko.SSHException):
+            return False
+        return True
+
+    def run_script(self, script, timeout_secs=COMMAND_TIMEOUT_SECS):
+        """
+        Description:
+            Runs a bash script in a child of the shell, so that it cannot
+            change the state of the shell, and returns its output.
+        Args:
+            script (str): The script to run.
+        Kwargs:
+            timeout_secs (int): Time allowed for the script. Default is
+                                600.
+        Returns:
+            list. The lines printed by the script.
+        """
+        encoded = base64.b64encode(script.encode("utf-8")).decode("ascii")
+        lines = ["__b="] + ["__b+={0}".format(encoded[start:start +
+                                                       CHUNK_LENGTH])
+                            for start in range(0, len(encoded),
+                                               CHUNK_LENGTH)]
+        lines.append('echo "$__b" | {0} -d | {1}; {2}'.format(
+            BASE64_PATH, BASH_PATH, _get_print_marker_cmd(DONE_MARKER)))
+        with self.lock:
+            try:
+                self.channel.sendall("\n".join(lines) + "\n")
+                stdout = self._read_until(DONE_MARKER, timeout_secs)
+            except Exception:
+                # The shell may still be running the script
+                self.close()
+                raise
+        return stdout
+
+    def close(self):
+        """
+        Description:
+            Closes the shell.
+        """
+        self.channel.close()
+
+
+class NodeConnection(object):
+    """
+    An ssh connection to a node multiplexing a shell of the connecting
+    user and a root shell, each opened on first use and reopened, with
+    the connection if needed, once found dead, e.g. after a reboot.
+    """
+
+    def __init__(self, ip_address, username, password, root_password):
+        """
+        Args:
+            ip_address (str): Address of the node.
+            username (str): User to connect as.
+            password (str): Password of the user.
+            root_password (str): Password of root, for su.
+        """
+        self.ip_address = ip_address
+        self.username = username
+        self.password = password
+        self.root_password = root_password
+        self.client = None
+        self.shells = {}
+        self.lock = threading.Lock()
+
+    def _connect(self):
+        """
+        Description:
+            Opens the ssh connection, retrying a few times as sshd may
+            accept connections shortly before logins work.
+        """
+        self.close()
+        for attempt in range(1, CONNECT_ATTEMPTS + 1):
+            client = paramiko.SSHClient()
+            client.load_system_host_keys()
+            client.set_missing_host_key_policy(_RejectUnknownHostKey())
+            try:
+                client.connect(self.ip_address, port=SSH_PORT,
+                               username=self.username,
+                               password=self.password,
+                               timeout=CONNECT_TIMEOUT_SECS,
+                               allow_agent=False, look_for_keys=False)
+            except (paramiko.BadHostKeyException, UnknownHostKeyError):
+                client.close()
+                raise
+            except (socket.error, paramiko.SSHException):
+                client.close()
+                if attempt == CONNECT_ATTEMPTS:
+                    raise
+                time.sleep(CONNECT_TIMEOUT_SECS)
+                continue
+            client.get_transport().set_keepalive(KEEPALIVE_SECS)
+            self.client = client
+            return
+
+    def get_shell(self, su_root, su_timeout_secs=DEFAULT_SU_TIMEOUT_SECS):
+        """
+        Description:
+            Returns a working shell, as root if su_root is True, opening
+            it and the connection again if they are gone.
+        """
+        with self.lock:
+            shell = self.shells.get(su_root)
+            if shell is not None and shell.is_alive():
+                return shell
+            if shell is not None:
+                shell.close()
+            root_password = self.root_password \
+                if su_root and self.username != "root" else None
+            transport = self.client.get_transport() if self.client else None
+            if transport is not None and transport.is_active():
+                try:
+                    shell = NodeShell(transport, root_password,
+                                      su_timeout_secs)
+                except (socket.error, EOFError, paramiko.SSHException):
+                    # The connection has not noticed the node went away
+                    shell = None
+            else:
+                shell = None
+            if shell is None:
+                self._connect()
+                shell = NodeShell(self.client.get_transport(),
+                                  root_password, su_timeout_secs)
+            self.shells[su_root] = shell
+            return shell
+
+    def close(self):
+        """
+        Description:
+            Closes the shells and the connection.
+        """
+        for shell in self.shells.values():
+            shell.close()
+        self.shells = {}
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+
+
+def get_connection(test, node):
+    """
+    Description:
+        Returns the pooled connection to a node, creating it on first use
+        from the connection data of the node.
+    Args:
+        test (GenericTest): The test instance to read the connection data
+                            with.
+        node (str): Filename of the node.
+    Returns:
+        NodeConnection. The connection, or None if the connection data
+        has no password for the node.
+    """
+    with _CONNECTIONS_LOCK:
+        if node not in _CONNECTIONS:
+            atts = dict((att, test.get_node_att(node, att))
+                        for att in ("ipv4", "username", "password",
+                                    "rootpw"))
+            _CONNECTIONS[node] = NodeConnection(
+                atts["ipv4"], atts["username"], atts["password"],
+                atts["rootpw"]) if atts["password"] and atts["rootpw"] \
+                else None
+        return _CONNECTIONS[node]
+
+
+def close_connections(node=None):
+    """
+    Description:
+        Closes the pooled connections to a node, or to every node. Every
+        connection is closed when the test run ends.
+    """
+    with _CONNECTIONS_LOCK:
+        for key in [node] if node else list(_CONNECTIONS):
+            connection = _CONNECTIONS.pop(key, None)
+            if connection is not None:
+                connection.close()
+
+
+atexit.register(close_connections)
+
+
+def use_ssh_pool(test):
+    """
+    Description:
+        Makes the test run its commands over the pooled connections,
+        replacing its run_command. Does nothing unless LITP_SSH_POOL is
+        set in the environment.
+
+        Calls with options the pool does not handle, and calls to nodes
+        the pool cannot reach, go through the original run_command. As
+        with run_command, the stderr of commands run with su_root is
+        returned in their stdout. A profiler already started on the test
+        profiles the pooled calls.
+    Args:
+        test (GenericTest): The test instance.
+    """
+    if not os.environ.get(SSH_POOL_ENV):
+        return
+    profiler = getattr(test, "command_profiler", None)
+    if profiler is not None:
+        profiler.stop()
+    original = test.run_command
+    batch = BatchUtils(test)
+
+    def run_command(node, cmd, su_root=False, default_asserts=False,
+                    **kwargs):
+        """ Runs a command in the pooled shell of the node """
+        su_timeout_secs = kwargs.pop("su_timeout_secs",
+                                     DEFAULT_SU_TIMEOUT_SECS)
+        connection = None if kwargs else get_connection(test, node)
+        shell = None
+        if connection is not None:
+            try:
+                shell = connection.get_shell(su_root, su_timeout_secs)
+            except (paramiko.BadHostKeyException,
+                    UnknownHostKeyError) as err:
+                test.log("info", "Not pooling the connection to {0}: {1}"
+                         .format(node, err))
+                close_connections(node)
+                with _CONNECTIONS_LOCK:
+                    _CONNECTIONS[node] = None
+            except (socket.error, EOFError, paramiko.SSHException) as err:
+                test.log("info", "No pooled shell on {0}, using "
+                         "run_command: {1}".format(node, err))
+        if shell is None:
+            if su_timeout_secs != DEFAULT_SU_TIMEOUT_SECS:
+                kwargs["su_timeout_secs"] = su_timeout_secs
+            return original(node, cmd, su_root=su_root,
+                            default_asserts=default_asserts, **kwargs)
+        test.log("info", "Running on {0}{1} over the ssh pool: {2}".format(
+            node, " as root" if su_root else "", cmd))
+        # The terminal of su merges stderr into stdout
+        script = batch.get_batch_script(
+            ["exec 2>&1\n" + cmd if su_root else cmd])
+        results = batch.parse_batch_output(shell.run_script(script))
+        test.assertEqual(1, len(results), '"{0}" on {1} did not complete'
+                         .format(cmd, node))
+        stdout, stderr, rc = results[0]
+        test.log("info", "rc {0}, stdout {1}, stderr {2}".format(
+            rc, stdout, stderr))
+        if default_asserts:
+            test.assertEqual(0, rc, '"{0}" on {1} returned {2}: {3}'
+                             .format(cmd, node, rc, stdout + stderr))
+            test.assertEqual([], stderr, '"{0}" on {1} wrote to stderr: {2}'
+                             .format(cmd, node, stderr))
+        return stdout, stderr, rc
+
+    test.run_command = run_command
+    if profiler is not None:
+        profiler.start()
@@ -14,6 +14,7 @@ program(s) have been supplied.
 """
 
 from litp_generic_test import GenericTest, attr
+from package_utils import get_package_inventory
 from redhat_cmd_utils import RHCmdUtils
 import test_constants
 
@@ -33,7 +34,7 @@ class Story11106(GenericTest):
         """Runs after every test"""
         super(Story11106, self).tearDown()
 
-    @attr('all', 'revert', 'story11106', 'story11106_tc01')
+    @attr('all', 'revert', 'story11106', 'story11106_tc01', reads='ms')
     def test_01_p_firefox_and_xauth_are_installed(self):
         """
         @tms_id: litpcds_11106_tc01
@@ -52,10 +53,9 @@ class Story11106(GenericTest):
 
         self.log("info", "1. Verify that packages are installed")
 
-        self.assertTrue(self.check_pkgs_installed(self.ms_node, pkgs),
-                        "Expected packages not installed")
+        get_package_inventory(self, self.ms_node).assert_manifest(self, pkgs)
 
-    @attr('all', 'revert', 'story11106', 'story11106_tc02')
+    @attr('all', 'revert', 'story11106', 'story11106_tc02', reads='ms')
     def test_02_p_x11_forwarding_enabled(self):
         """
         @tms_id: litpcds_11106_tc02
@@ -30,6 +30,9 @@ program(s) have been supplied.
 """
 from litp_generic_test import GenericTest, attr
 from redhat_cmd_utils import RHCmdUtils
+from inventory_utils import get_inventory
+from package_utils import get_package_inventories
+from repo_utils import RepoMetadata
 import test_constants
 
 
@@ -44,9 +47,10 @@ class Story1934(GenericTest):
         """
         super(Story1934, self).setUp()
         self.rhcmd = RHCmdUtils()
-        self.ms_node = self.get_management_node_filename()
-        self.mn_nodes = self.get_managed_node_filenames()
-        self.all_nodes = [self.ms_node] + self.mn_nodes
+        self.inventory = get_inventory(self)
+        self.ms_node = self.inventory.ms_node
+        self.mn_nodes = self.inventory.managed_nodes
+        self.all_nodes = self.inventory.all_nodes
         self.rsyslog8_pkg_name = 'EXTRlitprsyslog_CXP9032140'
         self.rhcmd = RHCmdUtils()
 
@@ -56,7 +60,7 @@ class Story1934(GenericTest):
         """
         super(Story1934, self).tearDown()
 
-    @attr('all', 'revert', 'story1934', 'story1934_tc01')
+    @attr('all', 'revert', 'story1934', 'story1934_tc01', reads='ms')
     def test_01_p_verify_cobbler_version(self):
         """
         @tms_id: litpcds_1934_tc01
@@ -81,7 +85,7 @@ class Story1934(GenericTest):
         self.assertTrue(self.is_text_in_list(expect_ver, stdout),
                 "Cobbler is not the expected version {0}".format(expect_ver))
 
-    @attr('all', 'revert', 'story2892', 'story2892_tc04')
+    @attr('all', 'revert', 'story2892', 'story2892_tc04', reads='peers')
     def test_02_n_verify_no_rabbitmq_on_nodes(self):
         """
         @tms_id: litpcds_2892_tc04
@@ -99,10 +103,9 @@ class Story1934(GenericTest):
         """
         self.log("info",
                  "1. Check that RabbitMQ is not installed on peer nodes")
+        inventories = get_package_inventories(self, self.mn_nodes)
         for node in self.mn_nodes:
-            rabbitmq_on_nodes = self.check_pkgs_installed(node,
-                                                          ["rabbitmq-server"])
-            self.assertFalse(rabbitmq_on_nodes,
+            self.assertFalse(inventories[node].is_installed("rabbitmq-server"),
                              "rabbitmq-server installed on {0}".format(node))
 
     #attr('all', 'revert', 'story8281', 'story8281_tc01')
@@ -122,7 +125,8 @@ class Story1934(GenericTest):
         """
         pass
 
-    @attr('all', 'revert', 'story9630', 'story9630_tc01')
+    @attr('all', 'revert', 'story9630', 'story9630_tc01',
+          reads=('ms', 'peers'))
     def test_04_p_extrlitprsyslog8_is_available(self):
         """
         @tms_id: litpcds_9630_tc01
@@ -139,19 +143,11 @@ class Story1934(GenericTest):
         @tms_execution_type: Automated
         """
         self.log("info", "1. Search for rsyslog8")
-        yum_search_cmd = self.rhcmd.get_yum_cmd("search {0}".format
-                                            (self.rsyslog8_pkg_name))
-        for node in self.all_nodes:
-            stdout, _, _ = self.run_command(node, yum_search_cmd,
-                                            su_root=True,
-                                            default_asserts=True)
-
-            self.assertFalse(self.is_text_in_list(
-                                              "Warning: No matches found for:",
-                                              stdout),
-                             "rsyslog8 not found on {0}".format(node))
-
-    @attr('all', 'revert', 'story9961', 'story9961_tc03', 'story9961_tc04')
+        RepoMetadata(self, self.ms_node).assert_available(
+            self.all_nodes, [self.rsyslog8_pkg_name])
+
+    @attr('all', 'revert', 'story9961', 'story9961_tc03', 'story9961_tc04',
+          reads='ms')
     def test_05_p_verify_rabbitmq_version_description(self):
         """
         @tms_id: litpcds_9961_tc03, litpcds_9961_tc04
@@ -187,7 +183,7 @@ class Story1934(GenericTest):
         self.assertTrue(self.is_text_in_list(expected_outputs[1], out),
                     "{0} not the version found".format(expected_outputs[1]))
 
-    @attr('all', 'revert', 'story11050', 'story11050_tc03')
+    @attr('all', 'revert', 'story11050', 'story11050_tc03', reads='ms')
     def test_06_p_verify_erlang_version(self):
         """
         @tms_id: litpcds_11050_tc03
@@ -19,6 +19,14 @@ program(s) have been supplied.
 
 from litp_generic_test import GenericTest, attr
 from redhat_cmd_utils import RHCmdUtils
+from batch_utils import BatchUtils
+from postgres_utils import PgAccessCell, PgAccessMatrix
+from pgconf_utils import ConfigSnapshot, HbaRule
+from inventory_utils import get_inventory
+from package_utils import get_package_inventory, \
+    invalidate_package_inventory
+from profile_utils import profile_test
+from journal_utils import ChangeJournal
 import test_constants as const
 
 
@@ -35,11 +43,18 @@ class Story220015(GenericTest):
     def setUp(self):
         """ Runs before every single test """
         super(Story220015, self).setUp()
+        self.journal = ChangeJournal(self)
+        self.journal.start()
+        profile_test(self)
 
         self.rhel = RHCmdUtils()
-        self.ms_node = self.get_management_node_filename()
-        self.ms_ip = self.get_node_att(self.ms_node, 'ipv4')
-        self.node1 = self.get_managed_node_filenames()[0]
+        self.batch = BatchUtils(self)
+        self.inventory = get_inventory(self)
+        self.ms_node = self.inventory.ms_node
+        self.pg_access = PgAccessMatrix(self, self.ms_node)
+        self.pg_conf = ConfigSnapshot(self, self.ms_node)
+        self.ms_ip = self.inventory.get_node_att(self.ms_node, 'ipv4')
+        self.node1 = self.inventory.managed_nodes[0]
         self.pgsql_data_dir = const.PSQL_9_6_DATA_DIR
         self.pg_hba_conf = '{0}pg_hba.conf'.format(self.pgsql_data_dir)
         self.pg_ident_conf = '{0}pg_ident.conf'.format(self.pgsql_data_dir)
@@ -48,69 +63,9 @@ class Story220015(GenericTest):
 
     def tearDown(self):
         """ Runs after every single test """
+        self.journal.revert()
         super(Story220015, self).tearDown()
 
-    def _check_pg_db_login(self, user, db_name, table,
-                           root_user=True, expect_access=True,
-                           tcp_ip_address=False):
-        """
-        Description:
-            Checks if the stated Postgres user can log into the specified
-            Postgres database from the MS as user root and show the given table
-        Args:
-            user (str): PostgreSQL user.
-            db_name (str): Database to attempt to login to.
-            table (str): Table in database to assert user can access.
-        Kwargs:
-            root_user (bool): Whether to run command
-                as root user. Default is True.
-            expect_access (bool): Whether the login attempt is
-                expected to be successful. Default is True.
-            tcp_ip_address (bool): True if login attempt includes connection
-                                   from tcp ip address. Default is false.
-        """
-        postgres_cmd = "{0} -U {1} -d {2} -c".format(const.PSQL_PATH, user,
-                                                     db_name)
-
-        # If user is postgres, need to su to
-        # postgres user before checking access
-        if user == "postgres":
-            cmd = "{0} - postgres -c \"{1} ".format(const.SU_PATH,
-                                                    postgres_cmd)
-            if table is not None:
-                cmd += "'SELECT * FROM {0}'\"".format(table)
-            else:
-                # Used when databases have no tables. Simply test access
-                cmd += r"'\l'" + '"'
-        else:
-            cmd = "{0} 'SELECT * FROM {1}'".format(postgres_cmd, table)
-
-        std_out, std_err, rc = self.run_command(
-            self.ms_node, cmd, su_root=root_user)
-
-        if expect_access:
-            self.assertEqual(0, rc)
-            self.assertNotEqual([], std_out)
-        else:
-            self.assertNotEqual(0, rc)
-            if root_user:
-                if tcp_ip_address:
-                    fatal_error = "psql: FATAL:  pg_hba.conf rejects " \
-                                  "connection for host"
-                else:
-                    fatal_error = "psql: FATAL:  no pg_hba.conf entry for host"
-
-                self.assertTrue(fatal_error in std_out[0],
-                                "Expected error message not "
-                                "returned: {0}".format(fatal_error))
-            else:
-                fatal_error = "psql: FATAL:  no pg_hba.conf entry for host"
-                # fatal_error = \
-                #     "psql: FATAL:  Peer authentication failed for user"
-                self.assertTrue(fatal_error in std_err[0],
-                                "Expected error message not "
-                                "returned: {0}".format(fatal_error))
-
     @attr('all', 'revert', 'story220015', 'story220015_tc10')
     def test_10_p_postgresql_security_checks(self):
         """
@@ -134,27 +89,35 @@ class Story220015(GenericTest):
             @tms_test_precondition: None
             @tms_execution_type: Automated
         """
+        # The three config files are fetched together, and the netstat and
+        # ps probes below in one session
+        self.pg_conf.fetch([self.pg_hba_conf, const.PSQL_9_6_CONF_FILE,
+                            self.pg_ident_conf])
+        netstat_cmd = '{0} -ntlp | {1} postgres'.format(const.NETSTAT_PATH,
+                                                        const.GREP_PATH)
+        ps_cmd = "{0} -elf | {1} /opt/rh/rh-postgresql96/root/usr/bin/"\
+            .format(const.PS_PATH, const.GREP_PATH)
+        netstat_res, ps_res = self.batch.run_commands(
+            self.ms_node, [netstat_cmd, ps_cmd], su_root=True)
+
         # TEST CASE 1
         self.log("info", "1. Check that {0} has expected "
                          "contents.".format(self.pg_hba_conf))
-        # Expected contents of pg_hba.conf file with whitespace (tabs) removed
-        pga_hba_contents = [
-            'hostssllitplitp{0}/32certclientcert=1'.format(self.listen_address),
-            'hostssllitpcelerylitp{0}/32certclientcert=1'.format(self.listen_address),
-            'hostsslpostgreslitp{0}/32certclientcert=1'.format(self.listen_address),
-            'hostsslallpostgres{0}/32certclientcert=1'.format(self.listen_address),
-            'hostpuppetdbpuppetdb{0}/32md5'.format(self.listen_address),
-            'localpostgrespostgresident',
-            'hostallall0.0.0.0/0reject',
-            'hostallall::/0reject']
-
-        # Extract all uncommented lines from file
-        cmd = "{1} -v '^#' {0} | {1} -v '^$'".format(self.pg_hba_conf,
-                                                     const.GREP_PATH)
-        std_out, _, _ = self.run_command(self.ms_node, cmd, su_root=True)
-        # Remove all tabs for easy comparison with expected content
-        actual_hba = [x.replace("\t", "") for x in std_out]
-        self.assertEqual(pga_hba_contents, actual_hba)
+        local_address = '{0}/32'.format(self.listen_address)
+        self.pg_conf.assert_hba_rules(self.pg_hba_conf, [
+            HbaRule('hostssl', 'litp', 'litp', local_address, 'cert',
+                    ('clientcert=1',)),
+            HbaRule('hostssl', 'litpcelery', 'litp', local_address, 'cert',
+                    ('clientcert=1',)),
+            HbaRule('hostssl', 'postgres', 'litp', local_address, 'cert',
+                    ('clientcert=1',)),
+            HbaRule('hostssl', 'all', 'postgres', local_address, 'cert',
+                    ('clientcert=1',)),
+            HbaRule('host', 'puppetdb', 'puppetdb', local_address, 'md5',
+                    ()),
+            HbaRule('local', 'postgres', 'postgres', None, 'ident', ()),
+            HbaRule('host', 'all', 'all', '0.0.0.0/0', 'reject', ()),
+            HbaRule('host', 'all', 'all', '::/0', 'reject', ())])
 
         # TEST CASE 2
         self.log("info", "2.1 Assert that {0} has the expected values for "
@@ -162,34 +125,18 @@ class Story220015(GenericTest):
                          "'log_connections', 'log_hostname', 'listen_address'"
                          " & 'port'.".format(const.PSQL_9_6_CONF_FILE))
         # STEP 1
-        pg_conf = ["listen_addresses = '{0}'".format(self.listen_address),
-                   "port = {0}".format(self.port),
-                   "log_disconnections = off",
-                   "log_destination = syslog",
-                   "log_connections = off",
-                   "log_hostname = on"]
-        # Grep lines from
-        # '/var/opt/rh/rh-postgresql96/lib/pgsql/data/postgresql.conf'
-        # excluding blank and lines beginning with hash.
-        cmd = "{0} -vxE '[[:blank:]]*([#;].*)?' {1} ".format(
-            const.GREP_PATH, const.PSQL_9_6_CONF_FILE)
-        std_out, _, _ = self.run_command(self.ms_node, cmd, su_root=True,
-                                         default_asserts=True)
-        # Remove hashed comments from any partially hashed lines.
-        postgres_conf_list = []
-        for line in std_out:
-            new_line = line.split("#")[0]
-            postgres_conf_list.extend([new_line])
-        # Assert that the desired settings are in the conf file.
-        for setting in pg_conf:
-            self.assertTrue(setting in postgres_conf_list)
+        self.pg_conf.assert_gucs(const.PSQL_9_6_CONF_FILE, {
+            "listen_addresses": self.listen_address,
+            "port": self.port,
+            "log_disconnections": "off",
+            "log_destination": "syslog",
+            "log_connections": "off",
+            "log_hostname": "on"})
 
         # STEP 2
         self.log("info", "2.2 Assert that the MS uses the expected values for"
                          " 'listen_address' and 'port'.")
-        cmd = '{0} -ntlp | {1} postgres'.format(const.NETSTAT_PATH,
-                                                const.GREP_PATH)
-        std_out, _, rc = self.run_command(self.ms_node, cmd, su_root=True)
+        std_out, _, rc = netstat_res
         self.assertEqual(0, rc)
         # Only 1 line should be returned
         self.assertEqual(1, len(std_out))
@@ -199,9 +146,7 @@ class Story220015(GenericTest):
                         "{0} not returned.".format(address_port))
 
         # STEP 3
-        cmd = "{0} -elf | {1} /opt/rh/rh-postgresql96/root/usr/bin/".format(
-            const.PS_PATH, const.GREP_PATH)
-        std_out, _, rc = self.run_command(self.ms_node, cmd, su_root=True)
+        std_out, _, rc = ps_res
         self.assertEqual(0, rc)
 
         postgres_pid = [x for x in std_out if "grep" not in \
@@ -219,11 +164,7 @@ class Story220015(GenericTest):
         # TEST 3
         self.log("info", "3. Assert that databases can be "
                          "accessed by verified users on the MS.")
-        cmd = "{0} -v '^#' {1} | {0} -v '^$'".format(const.GREP_PATH,
-                                                     self.pg_ident_conf)
-        std_out, _, rc = self.run_command(self.ms_node, cmd, su_root=True)
-        #self.assertEqual(0, rc)
-        self.assertEqual(0, len(std_out))
+        self.assertEqual([], self.pg_conf.get_ident_maps(self.pg_ident_conf))
 
         """
         # Create lists for expected output & actual output
@@ -240,45 +181,45 @@ class Story220015(GenericTest):
                         """
 
         # Test databases can be accessed by verified users on MS
-        self._check_pg_db_login("litp", "litp -h ms1", "plan_tasks")
-        self._check_pg_db_login("litp", "litpcelery -h ms1", "celery_tasksetmeta")
-        self._check_pg_db_login("postgres", "litp -h ms1", "plan_tasks")
-        self._check_pg_db_login("postgres", "litpcelery -h ms1", "celery_tasksetmeta")
-        self._check_pg_db_login("postgres", "postgres -h ms1", None)
-        self._check_pg_db_login("postgres", "puppetdb -h ms1", "catalogs")
-        self._check_pg_db_login("postgres", "template1 -h ms1", None)
-
-        # Specify port: -p 5432
-        cmd = "{0} -U litp -p 5432 litp -h ms1 -c ".format(const.PSQL_PATH)
-        cmd += "'SELECT * FROM plan_tasks'"
-        std_out, _, rc = self.run_command(self.ms_node, cmd, su_root=True)
-        self.assertEqual(0, rc)
-        self.assertNotEqual([], std_out)
+        verified_access = [
+            PgAccessCell("litp", "litp -h ms1", "plan_tasks"),
+            PgAccessCell("litp", "litpcelery -h ms1", "celery_tasksetmeta"),
+            PgAccessCell("postgres", "litp -h ms1", "plan_tasks"),
+            PgAccessCell("postgres", "litpcelery -h ms1",
+                         "celery_tasksetmeta"),
+            PgAccessCell("postgres", "postgres -h ms1", None),
+            PgAccessCell("postgres", "puppetdb -h ms1", "catalogs"),
+            PgAccessCell("postgres", "template1 -h ms1", None),
+            # Specify port: -p 5432
+            PgAccessCell("litp", "litp -p 5432 -h ms1", "plan_tasks")]
 
         # TEST 4
         self.log("info", "4. Assert that databases cannot be "
                          "accessed by non-verified users on MS.")
-        self._check_pg_db_login(
-            "litp", "puppetdb", "whatever", expect_access=False)
-        self._check_pg_db_login(
-            "litp", "template1", "whatever", expect_access=False)
-        # self._check_pg_db_login(
-        #     "litp", "litp -h 127.0.0.1", "whatever", expect_access=False,
-        #     tcp_ip_address=True)
-        self._check_pg_db_login(
-            "puppetdb", "litp", "whatever", expect_access=False)
-        self._check_pg_db_login(
-            "puppetdb", "litpcelery", "whatever", expect_access=False)
-        self._check_pg_db_login(
-            "puppetdb", "postgres", "whatever", expect_access=False)
-        self._check_pg_db_login(
-            "puppetdb", "template1", "whatever", expect_access=False)
-
-        # Ensure that attempts to access the databases as litp-admin user fails
-        self._check_pg_db_login(
-            "litp", "litp", "whatever", root_user=False, expect_access=False)
-        self._check_pg_db_login("litp", "litpcelery", "whatever",
-                                root_user=False, expect_access=False)
+        non_verified_access = [
+            PgAccessCell("litp", "puppetdb", "whatever",
+                         expect_access=False),
+            PgAccessCell("litp", "template1", "whatever",
+                         expect_access=False),
+            # PgAccessCell("litp", "litp -h 127.0.0.1", "whatever",
+            #              expect_access=False, tcp_ip_address=True),
+            PgAccessCell("puppetdb", "litp", "whatever",
+                         expect_access=False),
+            PgAccessCell("puppetdb", "litpcelery", "whatever",
+                         expect_access=False),
+            PgAccessCell("puppetdb", "postgres", "whatever",
+                         expect_access=False),
+            PgAccessCell("puppetdb", "template1", "whatever",
+                         expect_access=False),
+            # Ensure that attempts to access the databases as litp-admin
+            # user fails
+            PgAccessCell("litp", "litp", "whatever", root_user=False,
+                         expect_access=False),
+            PgAccessCell("litp", "litpcelery", "whatever", root_user=False,
+                         expect_access=False)]
+
+        # Tests 3 and 4 are evaluated together as a single access matrix
+        self.pg_access.assert_access(verified_access + non_verified_access)
 
         # TEST 5
         self.log("info", "5. Assert that LITP databases cannot be "
@@ -292,13 +233,16 @@ class Story220015(GenericTest):
                        "el7.x86_64"]
 
         # Install postgresql package on node1
-        if not self.check_pkgs_installed(self.node1, pg_packages):
-            for pg_package in pg_packages:
-                self.log("info", "Installing package '{0}' on {1} "
-                                 "for test.".format(pg_package, self.node1))
-
-                self.assertTrue(self.install_rpm_on_node(self.node1,
-                                                         pg_package))
+        missing_packages = get_package_inventory(
+            self, self.node1).get_missing(pg_packages)
+        for pg_package in missing_packages:
+            self.log("info", "Installing package '{0}' on {1} "
+                             "for test.".format(pg_package, self.node1))
+
+            self.assertTrue(self.install_rpm_on_node(self.node1,
+                                                     pg_package))
+        if missing_packages:
+            invalidate_package_inventory(self.node1)
 
         databases = ['litp', 'litpcelery']
         for db_name in databases:
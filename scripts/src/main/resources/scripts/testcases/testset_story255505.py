@@ -15,6 +15,15 @@ program(s) have been supplied.
 
 from litp_generic_test import GenericTest, attr
 from redhat_cmd_utils import RHCmdUtils
+from batch_utils import BatchUtils
+from log_utils import LogCursor, PuppetRunWaiter
+from reboot_utils import RebootTimer
+from inventory_utils import get_inventory
+from package_utils import get_package_inventory
+from journal_utils import ChangeJournal
+from plan_utils import PlanMonitor
+from model_utils import ModelBuilder
+from puppetdb_utils import PuppetDbClient
 import test_constants as const
 
 
@@ -27,21 +36,25 @@ class Story255505(GenericTest):
     def setUp(self):
         """ Runs before every single test. """
         super(Story255505, self).setUp()
+        self.journal = ChangeJournal(self)
+        self.journal.start()
         self.rh_utils = RHCmdUtils()
+        self.batch = BatchUtils(self)
 
-        self.ms_node = self.get_management_node_filename()
-        self.ms_ip = self.get_node_att(self.ms_node, 'ipv4')
-        self.peer_nodes = self.get_managed_node_filenames()
-        self.all_nodes = [self.ms_node] + self.peer_nodes
-        self.node_urls = self.find(self.ms_node, '/deployments', 'node')
+        self.inventory = get_inventory(self)
+        self.ms_node = self.inventory.ms_node
+        self.ms_ip = self.inventory.get_node_att(self.ms_node, 'ipv4')
+        self.peer_nodes = self.inventory.managed_nodes
+        self.all_nodes = self.inventory.all_nodes
+        self.node_urls = self.inventory.find('/deployments', 'node')
 
-        self.fw_rules_n1_path = self.find(self.ms_node, self.node_urls[0],
+        self.fw_rules_n1_path = self.inventory.find(self.node_urls[0],
                                 'collection-of-firewall-rule')[0]
 
-        self.fw_rules_n2_path = self.find(self.ms_node, self.node_urls[1],
+        self.fw_rules_n2_path = self.inventory.find(self.node_urls[1],
                                 'collection-of-firewall-rule')[0]
 
-        self.ms_rules_parent_path = self.find(self.ms_node, '/ms',
+        self.ms_rules_parent_path = self.inventory.find('/ms',
                                     'collection-of-firewall-rule')[0]
 
         self.fw_rules = {self.ms_node: self.ms_rules_parent_path,
@@ -61,72 +74,56 @@ class Story255505(GenericTest):
         self.old_postgres_data_dir = "/var/lib/pgsql/data"
         self.puppetdb_log_path = "/var/log/puppetdb/puppetdb.log"
 
-        self.pos_1_syslog = self.get_file_len(
-            self.ms_node, const.GEN_SYSTEM_LOG_PATH)
-
-        self.pos_1_puppetdb_log = self.get_file_len(
-            self.ms_node, self.puppetdb_log_path)
+        self.syslog_cursor, self.puppetdb_log_cursor = LogCursor.open_many(
+            self, self.ms_node, [const.GEN_SYSTEM_LOG_PATH,
+                                 self.puppetdb_log_path])
 
     def tearDown(self):
         """ Runs after every single test """
+        self.journal.revert()
         super(Story255505, self).tearDown()
 
-    def verify_psql_version(self):
+    def verify_psql_version(self, stdout=None):
         """
         Description: Logs in as a postgres user, starts a psql terminal,
                      runs 'select version();' and verifies that the
                      PostgreSQL version is 9.6.
+        Kwargs:
+            stdout (list): Output of the version query if it has already
+                           been run, e.g. as part of a batch. Default is
+                           None, which runs the query.
         """
-        stdout, _, _ = self.run_command(self.ms_node,
-                         self.get_psql_version_cmd, su_root=True,
-                         default_asserts=True)
+        if stdout is None:
+            stdout, _, _ = self.run_command(self.ms_node,
+                             self.get_psql_version_cmd, su_root=True,
+                             default_asserts=True)
 
         self.assertTrue(self.is_text_in_list("PostgreSQL {0}".format(
                         self.postgres_version_num), stdout),
                         "postgreSQL 9.6 service does not appear to be the"
                         " current PostgreSQL version: '{0}'".format(stdout))
 
-    def check_for_log_msg(self, message, log_len,
-                          file_check=const.GEN_SYSTEM_LOG_PATH,
-                          wait_for_log=False):
+    @staticmethod
+    def check_for_log_msg(message, log_cursor, wait_for_log=False,
+                          regex=False):
         """
-        Description: Checks passed in log file for messages
-                     expected to be present.
+        Description: Checks a log file for messages expected to be
+                     present since the cursor was created. All messages
+                     are matched in a single pass over the new log lines.
 
         Args:
             message (list/str): List of messages to check. If a str is
                                 passed instead of a list, the system assumes
                                 there is just one message.
-            log_len (int): Will look for logs starting at log length
-                           stated in this variable.
+            log_cursor (LogCursor): Cursor on the log file to check.
         Kwargs:
-            file_check (str): path to file to check for the messages.
             wait_for_log (bool): if true will wait for the message to
                                  appear in the log, if false will check
                                  if its currently there. Default is false.
-
+            regex (bool): if true the messages are regular expressions.
+                          Default is false.
         """
-        if isinstance(message, str):
-            logs_to_check = [message]
-        else:
-            logs_to_check = message
-
-        for log_msg in logs_to_check:
-
-            if not wait_for_log:
-                self.assertTrue(self.check_for_log(self.ms_node, log_msg,
-                                               file_check, log_len),
-                                               '"{0}" not found in {1} '
-                                               'as expected.'.format(log_msg,
-                                               file_check))
-            else:
-                self.assertTrue(self.wait_for_log_msg(self.ms_node, log_msg,
-                                               log_file=file_check,
-                                               log_len=log_len),
-                                               '"{0}" not found in {1} '
-                                               'as expected.'.format(log_msg,
-                                               file_check))
-
+        log_cursor.assert_found(message, regex=regex, wait=wait_for_log)
 
     @attr('all', 'revert', 'story255505', 'story255505_tc01')
     def test_01_p_verify_postgresql96_is_running_ms(self):
@@ -156,15 +153,23 @@ class Story255505(GenericTest):
 
         self.get_service_status(self.ms_node, self.postgres_service_name)
 
+        # Steps 2 to 5 only read from the MS so run them in one session
+        psql_version, psql_cli_version, data_dir, pg_version = \
+            self.batch.run_commands(self.ms_node,
+                [self.get_psql_version_cmd,
+                 "{0} --version".format(const.PSQL_PATH),
+                 "/bin/ls -A {0}".format(self.postgres_data_dir),
+                 "/bin/cat {0}".format(self.pg_version_file)],
+                su_root=True, default_asserts=True)
+
         self.log("info", "# 2. Login as a Postgres user, start a psql terminal"
                  " and check the postgres version.")
 
-        self.verify_psql_version()
+        self.verify_psql_version(psql_version[0])
 
         self.log("info", "# 3. Check the postgres version on the MS.")
 
-        stdout, _, _ = self.run_command(self.ms_node, "{0} --version".format(
-                       const.PSQL_PATH), default_asserts=True, su_root=True)
+        stdout = psql_cli_version[0]
 
         self.assertTrue(self.is_text_in_list("psql (PostgreSQL) {0}".format(
                         self.postgres_version_num), stdout),
@@ -174,17 +179,17 @@ class Story255505(GenericTest):
         self.log("info", "# 4. Check the postgreSQL 9.6 data directory "
                  "'{0}' is not empty.".format(self.postgres_data_dir))
 
-        stdout = self.list_dir_contents(self.ms_node, self.postgres_data_dir,
-                                        su_root=True)
+        stdout = data_dir[0]
 
         self.assertTrue(stdout != [], "Postgresql 9.6 data directory is"
                                       "empty!")
 
         self.log("info", "# 5. Check the PG_VERSION file in the postgreSQL "
                  "data directory contains the correct postgreSQL version.")
-        pg_version_file_contents = self.get_file_contents(self.ms_node,
-                                   self.pg_version_file,
-                                   assert_not_empty=True, su_root=True)
+        pg_version_file_contents = pg_version[0]
+
+        self.assertNotEqual([], pg_version_file_contents,
+                            "{0} is empty".format(self.pg_version_file))
 
         self.assertTrue(self.postgres_version_num ==
                          pg_version_file_contents[0],
@@ -226,13 +231,12 @@ class Story255505(GenericTest):
                                  "postgresql-server-8.4.20-1.el6_5.x86_64",
                                  "postgresql-8.4.20-1.el6_5.x86_64"]
 
-        stdout, _, _ = self.run_command(self.ms_node,
-                            self.rh_utils.check_pkg_installed(
-                            postgres_8_4_packages),
-                            su_root=True)
+        installed = get_package_inventory(self, self.ms_node).get_installed(
+            postgres_8_4_packages)
 
-        self.assertTrue(stdout == [], "Unexpected postgresql 8.4 package(s) "
-                                      "found: {0}".format(stdout))
+        self.assertTrue(installed == [], "Unexpected postgresql 8.4 "
+                                         "package(s) found: {0}"
+                                         .format(installed))
 
     @attr('all', 'revert', 'story255505', 'story255505_tc03')
     def test_03_p_verify_psycopg2_using_correct_libpq(self):
@@ -286,15 +290,8 @@ class Story255505(GenericTest):
 
         self.log("info", "# 1. Verify that the syspath rpms are on the MS.")
 
-        stdout, _, _ = self.run_command(self.ms_node,
-                            self.rh_utils.check_pkg_installed(
-                            postgres_syspath_pkgs),
-                            su_root=True, default_asserts=True)
-
-        for pkg in postgres_syspath_pkgs:
-            self.assertTrue(self.is_text_in_list(pkg, stdout),
-                            "syspath package '{0}' is not "
-                            "installed".format(pkg))
+        get_package_inventory(self, self.ms_node).assert_manifest(
+            self, postgres_syspath_pkgs)
 
         self.log("info", "# 2. Login as a Postgres user, start a psql "
                  "terminal")
@@ -325,46 +322,54 @@ class Story255505(GenericTest):
             @step: Login as a postgres posix user and connect to the puppetdb
                    database
             @result: Login was successful
-            @step: Check the certname_facts table in puppetDB contains the
-                   'unique_id' facts about the MS and peer nodes
-            @result: Table contains  the 'unique_id' facts about MS and the
-                     peer nodes
+            @step: Query PuppetDB for the resources with the 'uniqueid'
+                   parameters of the MS and peer nodes
+            @result: PuppetDB holds the 'uniqueid' parameters of the MS and
+                     the peer nodes
         @tms_execution_type: Automated
         """
 
         self.log("info", "# 1.  Create/update items to generate config tasks "
                  "on the ms and peer nodes, create and run a plan.")
 
+        builder = ModelBuilder(self, self.ms_node, journal=self.journal)
         for node in self.all_nodes:
-            self.execute_cli_create_cmd(self.ms_node,
-                                        "{0}/story_255505".format(
-                                        self.fw_rules[node]),
-                                       'firewall-rule',
-                                        props="name='133 test'")
+            builder.create("{0}/story_255505".format(self.fw_rules[node]),
+                           'firewall-rule', props={'name': '133 test'})
+        builder.apply()
 
-        self.run_and_check_plan(self.ms_node, const.PLAN_COMPLETE, 10)
+        PlanMonitor(self, self.ms_node).run_and_check(
+            const.PLAN_COMPLETE, 10, history_key="torf_255505_tc05")
+        self.inventory.invalidate_model()
 
         self.log("info", "# 4. Login as a postgres posix user and connect to "
                  "the puppetdb database.")
 
-        db_table = "resource_params"
-
-        cmd = "{0} postgres -c \"{1} -U postgres -h ms1 -d puppetdb -c "\
-            "'SELECT * from {2};' -P pager=off\""\
-            "| grep uniqueid".format(const.SU_PATH,
-            const.PSQL_PATH, db_table)
+        cmd = "{0} postgres -c \"{1} -U postgres -h ms1 -d puppetdb -t -A " \
+            "-c 'SELECT 1;'\"".format(const.SU_PATH, const.PSQL_PATH)
 
         stdout = self.run_command(self.ms_node, cmd, su_root=True,
                     default_asserts=True)[0]
+        self.assertEqual(["1"], stdout,
+                         "Failed to connect to the puppetdb database: {0}"
+                         .format(stdout))
+
+        self.log("info", "# 5. Query PuppetDB for the 'uniqueid' resource "
+                 "parameters of the MS and peer nodes.")
 
         uniqueids = {self.ms_node: "007f0100",
                     self.peer_nodes[0]: "a8c02b00",
                     self.peer_nodes[1]: "a8c02c00"}
 
+        resources = PuppetDbClient(self, self.ms_node).get_resources(
+            params={"uniqueid": uniqueids.values()})
+        found = set(resource["parameters"]["uniqueid"]
+                    for resource in resources)
+
         for node, uniqueid in uniqueids.iteritems():
-            self.assertTrue(self.is_text_in_list(uniqueid, stdout),
-            "{0} table does not contain uniqueid for {1}: {2}"
-            .format(db_table, node, uniqueid))
+            self.assertTrue(uniqueid in found,
+            "PuppetDB does not contain uniqueid for {0}: {1}"
+            .format(node, uniqueid))
 
     @attr('all', 'revert', 'story255505', 'story255505_tc06')
     def test_06_p_verify_postgresql96_running_after_ms_reboot(self):
@@ -390,24 +395,9 @@ class Story255505(GenericTest):
 
         self.log("info", "# 2. Reboot the MS")
 
-        reboot_cmd = "(sleep 1; {0} -r now) &".format(
-                                        const.SHUTDOWN_PATH)
-
-
-        self.run_command(self.ms_node, reboot_cmd, su_root=True,
-                         default_asserts=True)
-
-        self.log("info", "Waiting for node to become unreachable")
-
-        self.assertTrue(self.wait_for_ping(self.ms_ip, False, retry_count=4),
-                        "Node '{0} has not gone down".format(self.ms_node))
-
-        self.log("info", "Waiting for node to come back online")
-
-        self.assertTrue(self.wait_for_node_up(self.ms_node,
-                       wait_for_litp=True),
-                        "'{0} did not come up in expected timeframe"
-                                                .format(self.ms_node))
+        RebootTimer(self, self.ms_node,
+                    services=[self.postgres_service_name, "litpd"]).reboot(
+                        wait_for_litp=True)
 
         self.log("info", "# 3. Check the PostgreSQL 9.6 service is running.")
 
@@ -450,10 +440,11 @@ class Story255505(GenericTest):
 
         self.log("info", "# 2. Start a new puppet run")
 
-        self.start_new_puppet_run(self.ms_node)
-
         msg = "enable changed 'false' to 'true'"
-        self.check_for_log_msg(msg, self.pos_1_syslog, wait_for_log=True)
+        result = PuppetRunWaiter(self, self.ms_node,
+                                 self.syslog_cursor).start_and_wait(msg)
+        self.assertTrue(result.line, '"{0}" not found in {1} as expected.'
+                        .format(msg, self.syslog_cursor.log_path))
 
         self.log("info", "# 3. Check the PostgreSQL 9.6 service is re-enabled "
                  "using the systemctl command")
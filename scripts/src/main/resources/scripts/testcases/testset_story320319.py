@@ -16,8 +16,9 @@ program(s) have been supplied.
 
 from litp_generic_test import GenericTest, attr
 from dateutil.relativedelta import relativedelta
+from cert_utils import CertInventory, PUPPET_SIGNED_CERTS
 import datetime
-import re
+import fnmatch
 import test_constants
 
 
@@ -34,35 +35,25 @@ class Story320319(GenericTest):
         super(Story320319, self).setUp()
         self.ms1 = self.get_management_node_filename()
 
-        self.log("info", "Get current date and date 50 years in the future.")
-        self.install_date = datetime.datetime.now()
-        self.log("info", "Current date: {0}".format(self.install_date))
-        self.fifty_years_after_install_date = self.install_date \
-                                              + relativedelta(years=50)
-        self.fifty_years_after_install_year = \
-            self.fifty_years_after_install_date.year
-
-        self.openssl_command = '/usr/bin/openssl x509 -enddate -noout -in'
-
-        self.cert_expiry_commands_dict = {
-            "puppet": "{0} cert print {1} | {2} After".format(
-                test_constants.PUPPET_PATH, self.ms1,
-                test_constants.GREP_PATH),
-            "puppetdb": "{0} /etc/puppetdb/ssl/ca.pem".format(
-                self.openssl_command),
-            "rabbitmq": "{0} /etc/rabbitmq/ssl/ca.pem".format(
-                self.openssl_command),
-            "mcollective": "{0} /etc/mcollective/ca.pem".format(
-                self.openssl_command),
-            "ericsson": "{0} /opt/ericsson/nms/litp/etc/ssl/litp_server"
-                        ".cert".format(self.openssl_command)
+        self.cert_validity = relativedelta(years=50)
+        # Puppet backdates the start of its certificates by a day
+        self.cert_validity_tolerance = datetime.timedelta(days=2)
+
+        self.cert_paths_dict = {
+            "puppet": PUPPET_SIGNED_CERTS,
+            "puppet_ca": test_constants.PUPPET_CERT_PATH,
+            "puppetdb": "/etc/puppetdb/ssl/ca.pem",
+            "rabbitmq": "/etc/rabbitmq/ssl/ca.pem",
+            "mcollective": "/etc/mcollective/ca.pem",
+            "ericsson": "/opt/ericsson/nms/litp/etc/ssl/litp_server.cert"
         }
+        self.cert_inventory = CertInventory(self, self.ms1)
 
     def tearDown(self):
         """Runs for every test"""
         super(Story320319, self).tearDown()
 
-    @attr('all', 'revert', 'story320319', 'story320319_tc01')
+    @attr('all', 'revert', 'story320319', 'story320319_tc01', reads='ms')
     def test_p_01_verify_50_year_cert_expiration(self):
         """
         @tms_id: torf_320319_tc01
@@ -84,33 +75,34 @@ class Story320319(GenericTest):
         @tms_test_precondition: LITP ISO is installed on LITP vApp
         @tms_execution_type: Automated
         """
-        for service, command in self.cert_expiry_commands_dict.items():
-            self.log("info", "#1 Execute cmd on MS: {0}".format(command))
-
-            return_from_ms_command, _, _ = self.run_command(
-                self.ms1, command, su_root=True, default_asserts=True)
-
-            self.assertTrue(return_from_ms_command,
-                            "Running command {0} on node {1} did not "
-                            "return anything".format(command, self.ms1))
-
-            year_match = re.match(r'.*([1-3][0-9]{3})',
-                                  return_from_ms_command[0])
-
-            self.assertTrue(year_match,
-                            "no year found in return after running"
-                            " command {0} on node {1}"
-                            .format(command, self.ms1))
-
-            date_returned_from_cmd = int(year_match.group(1))
-
-            self.log("info","#2 Confirming that service {0} on node {1} has "
-                            "expiry date set to 50 years from LITP install "
-                            "date: {2}.".format(
-                service, self.ms1, self.fifty_years_after_install_year))
-
-            self.assertEqual(self.fifty_years_after_install_year,
-                             date_returned_from_cmd,
-                             "{2} is reporting expiry of {1}. Expected {0}.".format(
-                                 self.fifty_years_after_install_year,
-                                 date_returned_from_cmd, service))
+        self.log("info", "#1 Collect the certificates on the MS: {0}"
+                 .format(sorted(self.cert_paths_dict.values())))
+        records = self.cert_inventory.collect(self.cert_paths_dict.values())
+
+        for service, path in self.cert_paths_dict.items():
+            service_records = [record for record in records
+                               if fnmatch.fnmatch(record.path, path)]
+            self.assertTrue(service_records,
+                            "No certificate found for {0} at {1} on node {2}"
+                            .format(service, path, self.ms1))
+
+            for record in service_records:
+                self.assertEqual(None, record.error,
+                                 "Failed to read certificate {0} on node "
+                                 "{1}: {2}".format(record.path, self.ms1,
+                                                   record.error))
+                expected_expiry = record.not_before + self.cert_validity
+
+                self.log("info", "#2 Confirming that {0} certificate {1} "
+                                 "({2}) on node {3} expires 50 years after "
+                                 "it was issued on {4}: {5}.".format(
+                    service, record.path, record.subject, self.ms1,
+                    record.not_before, record.not_after))
+
+                self.assertTrue(
+                    abs(record.not_after - expected_expiry) <=
+                    self.cert_validity_tolerance,
+                    "{0} certificate {1} is reporting expiry of {2}. "
+                    "Expected {3}.".format(service, record.path,
+                                           record.not_after,
+                                           expected_expiry))
@@ -12,6 +12,7 @@ program(s) have been supplied.
 """
 
 from litp_generic_test import GenericTest, attr
+from file_utils import assert_files_match
 import test_constants as const
 
 
@@ -29,7 +30,7 @@ class Story330511(GenericTest):
         """Runs after every test"""
         super(Story330511, self).tearDown()
 
-    @attr('pre-reg', 'revert', 'story330511', 'story330511_tc01')
+    @attr('pre-reg', 'revert', 'story330511', 'story330511_tc01', reads='ms')
     def test_01_p_verify_puppet_running_on_ms(self):
         """
         @tms_id:
@@ -50,7 +51,7 @@ class Story330511(GenericTest):
         self.log('info', '1. Assert that puppetserver is running on the MS')
         self.get_service_status(self.ms_node, service)
 
-    @attr('pre-reg', 'revert', 'story330511', 'story330511_tc02')
+    @attr('pre-reg', 'revert', 'story330511', 'story330511_tc02', reads='ms')
     def test_02_p_verify_puppet_certificates_synched(self):
         """
         @tms_id:
@@ -80,14 +81,7 @@ class Story330511(GenericTest):
                         '/etc/puppetdb/ssl/ca.pem']
         self.log('info', '1. Check the value in {0}'
                 .format(const.PUPPET_CERT_PATH))
-        puppet_contents = self.get_file_contents(self.ms_node,
-                            const.PUPPET_CERT_PATH, su_root=True)
-
         self.log('info', '2. Check the value in the ca.pem files for each '
                 'service')
-        for cert in service_certs:
-            cert_contents = self.get_file_contents(self.ms_node, cert,
-                                su_root=True)
-            self.assertEqual(cert_contents, puppet_contents,
-                'Contents of {0} does not match puppet cert contents'
-                .format(cert))
+        assert_files_match(self, self.ms_node, const.PUPPET_CERT_PATH,
+                           service_certs)
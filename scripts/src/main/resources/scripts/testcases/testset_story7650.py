@@ -17,8 +17,14 @@ program(s) have been supplied.
 
 from litp_generic_test import GenericTest, attr
 from rest_utils import RestUtils
-import test_constants
-import time
+from parallel_utils import for_each_node
+from reboot_utils import RebootTimer
+from ocf_utils import VmmonitorProbe, get_executable_script_content
+from file_utils import FileTree
+from inventory_utils import get_inventory
+from package_utils import invalidate_package_inventory
+from profile_utils import profile_test
+from journal_utils import ChangeJournal
 
 
 class Story7650(GenericTest):
@@ -35,26 +41,36 @@ class Story7650(GenericTest):
 
     def setUp(self):
         super(Story7650, self).setUp()
+        self.journal = ChangeJournal(self)
+        self.journal.start()
+        profile_test(self)
         self.service_name = "vmmonitord"
-        self.ms1 = self.get_management_node_filename()
-        self.test_nodes = self.get_managed_node_filenames()
+        self.inventory = get_inventory(self)
+        self.ms1 = self.inventory.ms_node
+        self.test_nodes = self.inventory.managed_nodes
         self.mn1 = self.test_nodes[0]
         self.mn2 = self.test_nodes[1]
         self.all_nodes = [self.ms1, self.mn1, self.mn2]
-        self.ms_ip_address = self.get_node_att(self.ms1, 'ipv4')
-        self.n1_ip_address = self.get_node_att(self.mn1, 'ipv4')
+        self.ms_ip_address = self.inventory.get_node_att(self.ms1, 'ipv4')
+        self.n1_ip_address = self.inventory.get_node_att(self.mn1, 'ipv4')
         self.restutils = RestUtils(self.ms_ip_address)
         self.ocf = "/usr/lib/ocf"
         self.ocf_resources_dir = "/usr/lib/ocf/resource.d"
         self.port = '12987'
         self.netstat_cmd = '/bin/netstat -tln | grep {0}'.format(self.port)
         self.exec_seq_file = "/tmp/ocf_log/exec_sequence.txt"
+        self.probe = VmmonitorProbe(self, self.ms1, self.mn1, port=self.port,
+                                    exec_seq_file=self.exec_seq_file)
+        self.ocf_tree = FileTree()
+        self.vmmonitor_rpm_path = None
 
     def tearDown(self):
         """
         Description:
             Runs after every single test
         """
+        self.ocf_tree.remove_new_paths(self, self.mn1)
+        self.journal.revert()
         super(Story7650, self).tearDown()
 
     def _send_request(self,
@@ -73,62 +89,80 @@ class Story7650(GenericTest):
             rc  (int)           : The code returned by the HTTP request
             exec_sequence (list): The list of scripts run
         """
-        if port == None:
-            port = self.port
+        results, exec_sequence = self._send_requests(
+            hostname, [req_type], proto=proto, port=port, resource=resource)
+        return results[0].cmd, results[0].status, exec_sequence
 
-        self.log('info', 'Remove "execution sequence" file if present')
-        self.assertTrue(
-            self.remove_item(self.mn1, self.exec_seq_file, su_root=True),
-            'Failed to remove file "{0}"'.format(self.exec_seq_file))
-
-        self.log('info', 'Logging content of OCF "resource.d" folder')
-
-        cmd = (
-            "/usr/bin/curl -X {0} -s -S -k -w \'%{{http_code}}\\n' "
-            "{1}://{2}:{3}{4}"
-            .format(req_type, proto, hostname, port, resource))
-
-        self.log('info', 'Send OCF request')
-        start_time = int(time.time())
-
-        out, _, rc = self.run_command(self.ms1, cmd, su_root=True)
-        elapsed_time = int(time.time()) - start_time
-        self.log('info',
-            'HTTP request completed in {0}s'.format(elapsed_time))
-        if len(out) > 0:
-            rc = out[0]
-        else:
-            self.log('info', 'The HTTP request timed out')
-            rc = None
-
-        self.log('info', 'Determine scripts execution sequence')
-        if self.remote_path_exists(self.mn1, self.exec_seq_file):
-            exec_sequence = self.get_file_contents(
-                                self.mn1, self.exec_seq_file, su_root=True)
-            # Removing forward slashes added (by ssh?) while transferring
-            # data from MS to gateway server
-            exec_sequence = [x.replace('///', '/') for x in exec_sequence]
-        else:
-            exec_sequence = []
-        return cmd, rc, exec_sequence
-
-    def _install_vmmonitor_package(self, node):
+    def _send_requests(self, hostname, req_types, proto='http', port=None,
+                       resource=''):
+        """
+        Description
+            Send several OCF requests concurrently from the MS
+        Args:
+            hostname  (str): The target server
+            req_types (list): The types of HTTP request
+            proto     (str): Specify the protocol to use (ex. HTTP/ HTTPS)
+            port      (str): Port
+            resource  (str): Specifies the OCF resource folder path
+        Returns:
+            results (list)      : A ProbeResult per request type holding
+                                  the return code and latency
+            exec_sequence (list): The list of scripts run by all requests
+        """
+        self.log('info', 'Send OCF requests: {0}'.format(req_types))
+        results, exec_sequence = self.probe.send_requests(
+            hostname, req_types, proto=proto, port=port, resource=resource)
+        for result in results:
+            if result.status is None:
+                self.log('info', 'The HTTP {0} request timed out'
+                         .format(result.req_type))
+        return results, exec_sequence
+
+    def _get_vmmonitor_rpm(self):
+        """
+        Description
+            Download the vmmonitor rpm from Nexus. The rpm is downloaded
+            once per test, before the concurrent installs on the nodes,
+            as concurrent downloads would overwrite each other.
+        Returns:
+            The local path of the rpm
+        """
+        if self.vmmonitor_rpm_path is None:
+            self.vmmonitor_rpm_path = \
+                self.g_util.get_item_from_nexus('com.ericsson.nms.litp',
+                    'ERIClitpvmmonitord_CXP9031644')
+            self.assertNotEqual(None, self.vmmonitor_rpm_path,
+                                "Nexus path not found")
+        return self.vmmonitor_rpm_path
+
+    def _install_vmmonitor_package(self, node, local_vmmonitor_rpm_path):
         """
         Description
             Install vmmonitor rpm onto specified node
         Args
             node (str): Node on which to install the package
+            local_vmmonitor_rpm_path (str): Local path of the rpm, as
+                returned by _get_vmmonitor_rpm
         """
-        local_vmmonitor_rpm_path = \
-            self.g_util.get_item_from_nexus('com.ericsson.nms.litp',
-                'ERIClitpvmmonitord_CXP9031644')
-        self.assertNotEqual(None, local_vmmonitor_rpm_path,
-                            "Nexus path not found")
         self.log('info', 'Install "vmmonitor" package')
         self.assertTrue(
                 self.copy_and_install_rpms(node, [local_vmmonitor_rpm_path],
                     rpm_repo_path='/tmp/'),
                 "Installation of vmmonitord was unsuccessful")
+        invalidate_package_inventory(node)
+
+    def _get_nodes_without_vmmonitord(self):
+        """
+        Description
+            Find the nodes where "vmmonitord" is not running, querying
+            the nodes concurrently
+        Returns:
+            The nodes where "vmmonitord" is not running, and the local
+            path of the rpm to install on them if there are any
+        """
+        running = for_each_node(self.all_nodes, self._is_vmmonitord_running)
+        nodes = [node for node in self.all_nodes if not running[node]]
+        return nodes, self._get_vmmonitor_rpm() if nodes else None
 
     def _get_vmmonitord_status(self, node):
         """
@@ -196,17 +230,17 @@ class Story7650(GenericTest):
             Send PUT, POST and DELETE requests and assert return codes
             and sequence
         """
-        n1_path = self.get_node_url_from_filename(self.ms1, self.mn1)
-        n1_hostname = self.get_props_from_url(self.ms1, n1_path, "hostname")
+        n1_path = self.inventory.get_node_url(self.mn1)
+        n1_hostname = self.inventory.get_props(n1_path, "hostname")
         self.log('info',
         'Create a directory structure under the "resource.d" '
               'directory')
         folder1 = '{0}/folder1'.format(self.ocf_resources_dir)
         folder2 = '{0}/folder2'.format(self.ocf_resources_dir)
 
-        self.create_dir_on_node(self.mn1, folder1, su_root=True)
-        self.create_dir_on_node(self.mn1, folder2, su_root=True)
-        self.create_dir_on_node(self.mn1, '/tmp/ocf_log', su_root=True)
+        self.ocf_tree.add_dir(folder1)
+        self.ocf_tree.add_dir(folder2)
+        self.ocf_tree.add_dir('/tmp/ocf_log')
         self.create_dir_on_node(self.mn2, '/tmp/ocf_log', su_root=True)
 
         self.log('info',
@@ -222,7 +256,10 @@ class Story7650(GenericTest):
 
         for script in expected_seq:
             path = script.split()[0]
-            self._create_ocf_file_on_node(self.mn1, path)
+            self.ocf_tree.add_file(path, self._get_executable_script_content())
+
+        # Directories and agents are created in a single transfer
+        self.ocf_tree.provision(self, self.mn1)
 
         self.log('info',
         'Send GET request and check return code and execution sequence')
@@ -238,46 +275,16 @@ class Story7650(GenericTest):
             '"501" and that no scripts are executed')
         expected_rc = '501'
         expected_seq = []
-        for req_type in ['PUT', 'POST', 'DELETE']:
+        results, seq = self._send_requests(n1_hostname,
+                                           ['PUT', 'POST', 'DELETE'])
+        for result in results:
             self.log('info',
-                     'Verify "{0}" request'.format(req_type, expected_rc))
-            _, rc, seq = self._send_request(n1_hostname, req_type=req_type)
-            self.assertEqual(expected_rc, rc,
+                     'Verify "{0}" request'.format(result.req_type))
+            self.assertEqual(expected_rc, result.status,
                              "Return code was {0} and not the expected {1}"\
-                                 .format(rc, expected_rc))
-
-            self.assertEqual(expected_seq, seq, "Sequence not as expected")
+                                 .format(result.status, expected_rc))
 
-    def _create_ocf_file_on_node(self, node, path, exec_file=True, rc=0,
-            sleep_time=0):
-        """
-        Description
-            Create an OCF file given spacified data
-        Args:
-            node (str)        : Node on which file is to be created
-            script_data (dict): Data required to create the file
-            exec_file (bool): Specify if the file must be executable
-
-        Example of script_data:
-        script_data = {
-            'path': '/path_to_OCF_dir/file_name'
-            'sleep_time': 30
-            'rc': 0
-        }
-        """
-        if exec_file == True:
-            contents = self._get_executable_script_content(
-                                sleep_time, rc)
-        else:
-            contents = ['empty script']
-
-        if self.remote_path_exists(node, path):
-            self.remove_item(node, path, su_root=True)
-
-        self.create_file_on_node(self.mn1,
-                                 filepath=path,
-                                 file_contents_ls=contents,
-                                 su_root=True)
+        self.assertEqual(expected_seq, seq, "Sequence not as expected")
 
     @staticmethod
     def _get_executable_script_content(sleep_time=0, rc=0,
@@ -290,31 +297,29 @@ class Story7650(GenericTest):
             rc         (int): The code to be returned by the script
             log_to     (str): The file where stdout is redirected
         """
-        content = [
-            '#!/bin/bash',
-            'RC={0}'.format(rc),
-            'SLEEPTIME={0}'.format(sleep_time),
-            'LOGTO={0}'.format(log_to),
-            'echo "$(pwd)/$0 SLEEPTIME=$SLEEPTIME RC=$RC" 1>>$LOGTO',
-            'sleep $SLEEPTIME',
-            'exit $RC']
-        return content
+        return get_executable_script_content(sleep_time, rc, log_to)
 
     def _install_vmmonitor_if_not_yet_installed(self):
         """
         If the vmmonitor is not yet installed on the node, installs it. Also
-        verifies that vmmonitor is running
+        verifies that vmmonitor is running. The rpm is downloaded once, then
+        the nodes are processed concurrently.
         """
-        for node in self.all_nodes:
-            self.log('info',
-            'Check if "vmmonitord" service is running on node "{0}'
-            .format(node))
-            if not self._is_vmmonitord_running(node):
+        self.log('info',
+        'Check if "vmmonitord" service is running on nodes {0}'
+        .format(self.all_nodes))
+        nodes, rpm_path = self._get_nodes_without_vmmonitord()
+
+        def install_on_node(node):
+            """ Installs and checks vmmonitor on a single node """
+            if node in nodes:
                 self.log('info',
                 'Install "vmmonitor" package')
-                self._install_vmmonitor_package(node)
+                self._install_vmmonitor_package(node, rpm_path)
             self._assert_vmmonitor_is_listening_on_socket(node)
 
+        for_each_node(self.all_nodes, install_on_node)
+
     @attr('all', 'revert', 'story7650', 'story7650_tc01')
     def test_01_p_vmmonitord_service_started_after_install(self):
         """
@@ -332,17 +337,22 @@ class Story7650(GenericTest):
         @tms_test_precondition: NA
         @tms_execution_type: Automated
         """
-        for node in self.all_nodes:
-            if not self._is_vmmonitord_running(node):
+        nodes, rpm_path = self._get_nodes_without_vmmonitord()
+
+        def install_on_node(node):
+            """ Installs and checks vmmonitor on a single node """
+            if node in nodes:
                 self.log('info',
                      '1. Install "vmmonitor" on node "{0}"'.format(node))
-                self._install_vmmonitor_package(node)
+                self._install_vmmonitor_package(node, rpm_path)
 
             self.log('info',
             '2. Check that "vmmonitord" is running and listening on node "{0}"'
             .format(node))
             self._assert_vmmonitor_is_listening_on_socket(node)
 
+        for_each_node(self.all_nodes, install_on_node)
+
     @attr('all', 'revert', 'story7650', 'story7650_tc02')
     def test_02_n_vmmonitord_service_started_after_reboot(self):
         """
@@ -370,11 +380,7 @@ class Story7650(GenericTest):
         self.log('info',
                  '2. Reboot node 1 and check that vmmonitord is running ')
 
-        cmd = "(sleep 1; {0} -r now) &".format(test_constants.SHUTDOWN_PATH)
-        self.run_command(self.mn1, 'cmd', su_root=True)
-        self.wait_for_ping(self.get_node_att(self.mn1,
-            test_constants.NODE_ATT_IPV4), ping_success=False)
-        self.wait_for_node_up(self.mn1)
+        RebootTimer(self, self.mn1, services=[self.service_name]).reboot()
         self._assert_vmmonitor_is_listening_on_socket(self.mn1)
 
         self.log('info',
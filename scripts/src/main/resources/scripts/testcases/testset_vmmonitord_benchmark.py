@@ -0,0 +1,142 @@
+"""
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     October 2026
+@author:    LITP Misc Testware
+@summary:   Load and latency benchmark for vmmonitord, the OCF resource
+            agent daemon exercised functionally by testset_story7650.
+"""
+
+import json
+
+from litp_generic_test import GenericTest, attr
+from ocf_utils import VmmonitorProbe, get_executable_script_content
+from file_utils import FileTree
+from inventory_utils import get_inventory
+from ssh_utils import use_ssh_pool
+
+
+class VmmonitordBenchmark(GenericTest):
+    """
+    Measures vmmonitord latency, throughput and timeout rate as the
+    number of OCF agents and concurrent clients grows.
+    """
+
+    # Number of agents under resource.d for each step of the curve
+    agent_counts = [1, 10, 50]
+    # Number of clients sending GET requests at the same time
+    concurrency_levels = [1, 4, 16]
+    # SLEEPTIME of every generated agent, in seconds
+    agent_sleep_time = 0
+    # How long each load run lasts, in seconds
+    duration_secs = 30
+    # Time after which a request counts as timed out, in seconds
+    max_time_secs = 30
+
+    def setUp(self):
+        """ Runs before every single test """
+        super(VmmonitordBenchmark, self).setUp()
+        use_ssh_pool(self)
+        self.service_name = "vmmonitord"
+        self.inventory = get_inventory(self)
+        self.ms1 = self.inventory.ms_node
+        self.mn1 = self.inventory.managed_nodes[0]
+        self.ocf_resources_dir = "/usr/lib/ocf/resource.d"
+        self.agents_dir = "{0}/benchmark".format(self.ocf_resources_dir)
+        self.probe = VmmonitorProbe(self, self.ms1, self.mn1)
+
+    def tearDown(self):
+        """ Runs after every single test """
+        self.remove_item(self.mn1, self.agents_dir, su_root=True)
+        super(VmmonitordBenchmark, self).tearDown()
+
+    def _create_agents(self, first, last):
+        """
+        Description:
+            Creates the agents numbered first to last - 1 on node1 in a
+            single transfer. The agents do not log their execution to
+            keep the load on the node down to the agents themselves.
+        """
+        tree = FileTree()
+        tree.add_dir(self.agents_dir)
+        for index in range(first, last):
+            tree.add_file(
+                "{0}/agent_{1:04d}.sh".format(self.agents_dir, index),
+                get_executable_script_content(self.agent_sleep_time,
+                                              log_to="/dev/null"))
+        tree.provision(self, self.mn1)
+
+    @attr('benchmark', 'revert', 'vmmonitord_benchmark',
+          'vmmonitord_benchmark_tc01')
+    def test_01_p_vmmonitord_latency_scaling(self):
+        """
+        @tms_id: vmmonitord_benchmark_tc01
+        @tms_requirements_id: LITPCDS-7650
+        @tms_title: vmmonitord latency and throughput scaling
+        @tms_description:
+            Drive sustained concurrent GET requests at vmmonitord on node1
+            for an increasing number of OCF agents and report p50/p95/p99
+            latency, throughput and timeout rate for each combination
+            of agent count and concurrency.
+        @tms_test_steps:
+            @step: Check vmmonitord is running on node1
+            @result: vmmonitord is running
+            @step: Create the OCF agents for the next agent count
+            @result: Agents are created
+            @step: Send GET requests from the MS for each concurrency level
+            @result: Every request is answered or times out, statistics
+                     are reported
+        @tms_test_precondition: vmmonitord is installed on node1
+        @tms_execution_type: Automated
+        """
+        n1_path = self.inventory.get_node_url(self.mn1)
+        n1_hostname = self.inventory.get_props(n1_path, "hostname")
+
+        self.log("info", "# 1. Check vmmonitord is running on node1")
+        self.get_service_status(self.mn1, self.service_name)
+
+        report = []
+        created = 0
+        for agent_count in self.agent_counts:
+            self.log("info", "# 2. Create OCF agents up to {0}"
+                     .format(agent_count))
+            self._create_agents(created, agent_count)
+            created = max(created, agent_count)
+
+            for concurrency in self.concurrency_levels:
+                self.log("info", "# 3. Send GET requests with {0} agents "
+                         "and {1} clients".format(agent_count, concurrency))
+                result = self.probe.run_load(
+                    n1_hostname, concurrency, self.duration_secs,
+                    max_time_secs=self.max_time_secs)
+                row = result.to_dict()
+                row["agents"] = agent_count
+                self.log("info", "Benchmark: {0}".format(
+                    json.dumps(row, sort_keys=True)))
+                report.append(row)
+
+                self.assertTrue(result.requests > 0,
+                                "No requests completed with {0} agents and "
+                                "{1} clients".format(agent_count,
+                                                     concurrency))
+                unexpected = [status for status in result.statuses
+                              if status not in ('200', None)]
+                self.assertEqual([], unexpected,
+                                 "Unexpected return codes {0} with {1} "
+                                 "agents and {2} clients".format(
+                                     unexpected, agent_count, concurrency))
+
+        self.log("info", "agents clients  p50(s)  p95(s)  p99(s)   req/s "
+                 "timeouts")
+        for row in report:
+            self.log("info", "{0:6d} {1:7d} {2:7.3f} {3:7.3f} {4:7.3f} "
+                     "{5:7.1f} {6:8.1%}".format(
+                         row["agents"], row["concurrency"],
+                         row["p50_secs"] or 0, row["p95_secs"] or 0,
+                         row["p99_secs"] or 0, row["throughput_rps"],
+                         row["timeout_rate"]))
@@ -0,0 +1,198 @@
+"""
+COPYRIGHT Ericsson 2026
+The copyright to the computer program(s) herein is the property of
+Ericsson Inc. The programs may be used and/or copied only with written
+permission from Ericsson Inc. or in accordance with the terms and
+conditions stipulated in the agreement/contract under which the
+program(s) have been supplied.
+
+@since:     October 2026
+@author:    LITP Misc Testware
+@summary:   nose plugin writing the xunit report as each test completes,
+            with the duration of every numbered step of the test.
+
+            Steps are the messages the tests log at the start of each
+            @step of their docstring, e.g.
+                self.log("info", "# 2. Reboot the MS")
+                self.log("info", "2.1 Assert that ...")
+            Each step lasts until the next one starts or the test ends.
+            Steps are named by their order and number, e.g. "03 step 2.1",
+            so that a number logged twice keeps both timings.
+
+            Usage:
+                python xunit_stream.py --with-stream-xunit
+                    --stream-xunit-file=nosetests.xml [nose args]
+            The command-profile plugin of profile_utils is also available.
+"""
+
+import os
+import re
+import time
+import traceback
+import xml.etree.ElementTree as ET
+
+from nose.plugins import Plugin
+from nose.plugins.skip import SkipTest
+
+# Step numbers may have sub-steps, e.g. "2.1 Assert ..."
+STEP_RE = re.compile(r"^\s*#?\s*(\d+(?:\.\d+)*)\.?\s")
+
+
+def _split_id(test_id):
+    """
+    Description:
+        Returns (classname, name) of a nose test id.
+    """
+    if "." not in test_id:
+        return "", test_id
+    return tuple(test_id.rsplit(".", 1))
+
+
+class StreamingXunit(Plugin):
+    """
+    Writes the xunit report again after every test, so that the report
+    always holds every test completed so far and is a valid document.
+    """
+
+    name = "stream-xunit"
+    score = 1500
+
+    def __init__(self):
+        super(StreamingXunit, self).__init__()
+        self.report_path = None
+        self.suite = None
+        self.stats = None
+        self.start_time = None
+        self.steps = None
+        self.original_log = None
+
+    def options(self, parser, env):
+        """
+        Description:
+            Adds the path of the report to the nose options.
+        """
+        super(StreamingXunit, self).options(parser, env)
+        parser.add_option("--stream-xunit-file", action="store",
+                          dest="stream_xunit_file", metavar="FILE",
+                          default=env.get("NOSE_STREAM_XUNIT_FILE",
+                                          "nosetests.xml"),
+                          help="Path of the xunit report "
+                               "[NOSE_STREAM_XUNIT_FILE]")
+
+    def configure(self, options, conf):
+        """
+        Description:
+            Reads the path of the report.
+        """
+        super(StreamingXunit, self).configure(options, conf)
+        if self.enabled:
+            self.report_path = os.path.abspath(options.stream_xunit_file)
+
+    def begin(self):
+        """
+        Description:
+            Writes an empty report.
+        """
+        self.suite = ET.Element("testsuite", name="nosetests")
+        self.stats = {"tests": 0, "errors": 0, "failures": 0, "skip": 0}
+        self._write()
+
+    def _write(self):
+        """
+        Description:
+            Replaces the report with the results so far, atomically so
+            that readers never see a partial document.
+        """
+        for key, value in self.stats.items():
+            self.suite.set(key, str(value))
+        tmp_path = self.report_path + ".tmp"
+        ET.ElementTree(self.suite).write(tmp_path, encoding="UTF-8",
+                                         xml_declaration=True)
+        os.rename(tmp_path, self.report_path)
+
+    def startTest(self, test):
+        """
+        Description:
+            Starts the clock of the test and records the steps it logs.
+        """
+        self.start_time = time.time()
+        self.steps = []
+        case = getattr(test, "test", None)
+        log = getattr(case, "log", None)
+        if log is None:
+            return
+
+        def log_step(level, message, *args, **kwargs):
+            """ Records numbered step messages before logging them """
+            match = STEP_RE.match(message) \
+                if isinstance(message, basestring) else None
+            if match:
+                self.steps.append((match.group(1), message.strip(),
+                                   time.time()))
+            return log(level, message, *args, **kwargs)
+
+        case.log = log_step
+        self.original_log = (case, log)
+
+    def stopTest(self, test):
+        """
+        Description:
+            Stops recording the steps of the test.
+        """
+        if self.original_log:
+            case, _ = self.original_log
+            del case.log
+            self.original_log = None
+
+    def _add_case(self, test, kind=None, err=None):
+        """
+        Description:
+            Adds the outcome of a test to the report and writes it.
+        """
+        end_time = time.time()
+        # Errors raised outside a test, e.g. on import, have no start
+        start_time = self.start_time or end_time
+        classname, name = _split_id(test.id())
+        case = ET.SubElement(self.suite, "testcase", classname=classname,
+                             name=name,
+                             time="{0:.3f}".format(end_time - start_time))
+        if self.steps:
+            properties = ET.SubElement(case, "properties")
+            ends = [start for _, _, start in self.steps[1:]] + [end_time]
+            for order, ((number, message, start), end) in enumerate(
+                    zip(self.steps, ends), 1):
+                ET.SubElement(properties, "property",
+                              name="{0:02d} step {1}".format(order, number),
+                              value="{0:.3f}".format(end - start),
+                              description=message)
+        self.start_time = None
+        if kind:
+            text = "".join(traceback.format_exception(*err))
+            ET.SubElement(case, kind, type=err[0].__name__,
+                          message=str(err[1])).text = text
+        self.stats["tests"] += 1
+        self._write()
+
+    def addSuccess(self, test):
+        """ Adds a test that passed """
+        self._add_case(test)
+
+    def addFailure(self, test, err):
+        """ Adds a test that failed an assertion """
+        self.stats["failures"] += 1
+        self._add_case(test, "failure", err)
+
+    def addError(self, test, err):
+        """ Adds a test that raised an error or was skipped """
+        if issubclass(err[0], SkipTest):
+            self.stats["skip"] += 1
+            self._add_case(test, "skipped", err)
+        else:
+            self.stats["errors"] += 1
+            self._add_case(test, "error", err)
+
+
+if __name__ == "__main__":
+    import nose
+    from profile_utils import CommandProfile
+    nose.main(addplugins=[StreamingXunit(), CommandProfile()])